@@ -2,83 +2,307 @@
 
 from __future__ import annotations
 
-from itertools import count
-from typing import Dict
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 
+from ..celery_app import celery_app, run_inspec_task
+from ..config import get_settings
+from ..database import get_session
 from ..dependencies import UserContext, get_current_user
 from ..enums import AssessmentStatus
-from ..runners.inspec_runner import run_inspec_profile
-from ..schemas import AssessmentRead, AssessmentRunRequest, DeltaReport
-from ..services.delta_service import compute_delta
+from ..models import Assessment, Asset, Profile
+from ..schemas import (
+    AssessmentRunRequest,
+    AssessmentRunStatus,
+    DeltaReport,
+    FleetDeltaReport,
+    FleetDeltaRequest,
+    FleetRunRequest,
+    FleetRunStatus,
+)
+from ..services.assessment_run_service import expected_run_seconds, run_error, run_progress, runner_target
+from ..services.assessment_store import AssessmentRecord, get_assessment_store, report_key
+from ..services.cache_service import get_report_cache
+from ..services.delta_service import compute_delta, stream_delta
+from ..services.fleet_delta_service import FleetPair, compute_fleet_delta
+from ..services.fleet_run_service import (
+    NoMatchingAssets,
+    create_fleet_run,
+    fleet_run_signature,
+    fleet_run_status,
+    mark_fleet_run_failed,
+    select_assets,
+)
+from ..services.sql_delta_service import compute_delta_sql
 
 router = APIRouter()
 
-_ASSESSMENT_SEQUENCE = count(1)
-_ASSESSMENT_STORE: Dict[int, Dict[str, dict]] = {}
-
-_SAMPLE_BASELINE = {
-    "profiles": [
-        {
-            "name": "sample",
-            "controls": [
-                {"id": "V-12345", "impact": 0.9, "results": [{"status": "failed"}]},
-                {"id": "V-67890", "impact": 0.5, "results": [{"status": "passed"}]},
-            ],
-        }
-    ]
-}
-
-_SAMPLE_POST = {
-    "profiles": [
-        {
-            "name": "sample",
-            "controls": [
-                {"id": "V-12345", "impact": 0.9, "results": [{"status": "passed"}]},
-                {"id": "V-67890", "impact": 0.5, "results": [{"status": "passed"}]},
-                {"id": "V-54321", "impact": 0.3, "results": [{"status": "skipped"}]},
-            ],
-        }
-    ]
-}
-
-
-@router.post("/run", response_model=AssessmentRead)
-async def run_assessment(
+
+def _to_status(record: AssessmentRecord, expected_seconds: float | None = None) -> AssessmentRunStatus:
+    return AssessmentRunStatus(
+        id=record.id,
+        asset_id=record.asset_id,
+        profile_id=record.profile_id,
+        status=record.status,
+        started_at=record.started_at,
+        completed_at=record.completed_at,
+        progress=run_progress(record.status, record.started_at, expected_seconds),
+        error=run_error(record.reports),
+    )
+
+
+@router.post("/run", response_model=AssessmentRunStatus, status_code=status.HTTP_202_ACCEPTED)
+def run_assessment(
     request: AssessmentRunRequest,
+    response: Response,
     current_user: UserContext = Depends(get_current_user),
-) -> AssessmentRead:
-    """Trigger an InSpec assessment run."""
+    session: Session = Depends(get_session),
+) -> AssessmentRunStatus:
+    """Queue an InSpec assessment run on the workers.
 
-    result = run_inspec_profile(
-        str(request.profile_id),
-        host=request.connection.get("host", "localhost"),
-        user=request.connection.get("user", "root"),
-    )
+    Returns as soon as the run is queued; poll ``GET /assessments/{id}`` (the
+    ``Location`` header) as it moves through running to completed or failed.
+    """
 
-    assessment_id = next(_ASSESSMENT_SEQUENCE)
-    _ASSESSMENT_STORE[assessment_id] = {"baseline": _SAMPLE_BASELINE, "post": _SAMPLE_POST, "result": result}
+    if session.get(Asset, request.asset_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+    if session.get(Profile, request.profile_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
 
-    return AssessmentRead(
-        id=assessment_id,
-        asset_id=request.asset_id,
-        profile_id=request.profile_id,
-        status=AssessmentStatus.COMPLETED,
-        started_at=None,
-        completed_at=None,
-    )
+    store = get_assessment_store()
+    record = store.create(session, asset_id=request.asset_id, profile_id=request.profile_id)
+    # The worker loads the assessment, so it must be committed before the task is queued.
+    session.commit()
+    try:
+        run_inspec_task.apply_async(args=(record.id, runner_target(request.connection)))
+    except Exception as exc:
+        store.update(
+            session,
+            record.id,
+            status=AssessmentStatus.FAILED,
+            reports={"result": {"status": "failed", "error": "Run could not be queued"}},
+        )
+        session.commit()
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Run could not be queued") from exc
+
+    response.headers["Location"] = f"/assessments/{record.id}"
+    return _to_status(record)
+
+
+def _reports_of(record: AssessmentRecord | None, *kinds: str) -> tuple:
+    if record is None or any(kind not in record.reports for kind in kinds):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assessment not found")
+    return tuple(record.reports[kind] for kind in kinds)
 
 
 @router.get("/{assessment_id}/delta", response_model=DeltaReport)
-async def get_delta(
+def get_delta(
     assessment_id: int,
+    format: str = "json",
+    changed_only: bool = False,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> DeltaReport | StreamingResponse:
+    """Return the before-after delta for an assessment.
+
+    ``format=ndjson`` streams one delta row per line as rows are computed and
+    ends with a ``{"summary": ...}`` line. ``changed_only`` drops unchanged
+    rules from the rows; the summary always covers every rule.
+    """
+
+    baseline, post = _reports_of(get_assessment_store().get(session, assessment_id), "baseline", "post")
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Delta format must be json or ndjson")
+
+    options = {
+        "engine": get_settings().delta_engine,
+        "cache": get_report_cache(),
+        "baseline_key": report_key(assessment_id, "baseline"),
+        "post_key": report_key(assessment_id, "post"),
+    }
+    if format == "ndjson":
+        rows = stream_delta(baseline, post, changed_only=changed_only, **options)
+        return StreamingResponse(rows, media_type="application/x-ndjson")
+
+    report = compute_delta(baseline, post, **options)
+    if changed_only:
+        report.findings = [finding for finding in report.findings if finding.changed]
+    return report
+
+
+@router.get("/delta/persisted", response_model=DeltaReport)
+def get_persisted_delta(
+    baseline_id: int,
+    post_id: int,
+    changed_only: bool = False,
+    session: Session = Depends(get_session),
     current_user: UserContext = Depends(get_current_user),
 ) -> DeltaReport:
-    """Return the before-after delta for an assessment."""
+    """Return the delta between two assessments' persisted findings, computed in SQL."""
 
-    record = _ASSESSMENT_STORE.get(assessment_id)
-    if not record:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assessment not found")
+    missing = [assessment_id for assessment_id in (baseline_id, post_id) if session.get(Assessment, assessment_id) is None]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Assessments not found: {', '.join(map(str, missing))}",
+        )
+    return compute_delta_sql(session, baseline_id, post_id, changed_only=changed_only)
+
+
+@router.get("/delta/cache")
+async def get_report_cache_stats(current_user: UserContext = Depends(get_current_user)) -> dict:
+    """Report normalized-report cache hit/miss counters and occupancy."""
+
+    return get_report_cache().stats()
+
+
+@router.get("/cache")
+async def get_assessment_cache_stats(current_user: UserContext = Depends(get_current_user)) -> dict:
+    """Report assessment cache hit/miss counters, occupancy and invalidation state."""
+
+    return get_assessment_store().stats()
 
-    return compute_delta(record["baseline"], record["post"])
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.post("/delta/fleet", response_model=FleetDeltaReport)
+def get_fleet_delta(
+    request: FleetDeltaRequest,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> FleetDeltaReport:
+    """Aggregate regressions per rule across many assessments in one call.
+
+    Either compare each of ``assessment_ids`` baseline-to-post, or compare every
+    asset's state at ``window_start`` with its latest assessment up to
+    ``window_end``.
+    """
+
+    store = get_assessment_store()
+    if request.assessment_ids is not None:
+        records = store.get_many(session, request.assessment_ids)
+        missing = [
+            assessment_id
+            for assessment_id in request.assessment_ids
+            if assessment_id not in records or not {"baseline", "post"} <= records[assessment_id].reports.keys()
+        ]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Assessments not found: {', '.join(map(str, missing))}",
+            )
+        pairs = [
+            FleetPair(
+                asset_id=records[assessment_id].asset_id,
+                baseline=records[assessment_id].reports["baseline"],
+                post=records[assessment_id].reports["post"],
+                baseline_key=report_key(assessment_id, "baseline"),
+                post_key=report_key(assessment_id, "post"),
+            )
+            for assessment_id in request.assessment_ids
+        ]
+    elif request.window_start is not None and request.window_end is not None:
+        window = store.window_pairs(session, _as_utc(request.window_start), _as_utc(request.window_end))
+        records = store.get_many(session, [assessment_id for _asset, *ids in window for assessment_id in ids])
+        pairs = [
+            FleetPair(
+                asset_id=asset_id,
+                baseline=records[baseline_id].reports["post"],
+                post=records[post_id].reports["post"],
+                baseline_key=report_key(baseline_id, "post"),
+                post_key=report_key(post_id, "post"),
+            )
+            for asset_id, baseline_id, post_id in window
+        ]
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide assessment_ids or both window_start and window_end",
+        )
+
+    return compute_fleet_delta(pairs, cache=get_report_cache(), max_assets_per_rule=request.max_assets_per_rule)
+
+
+@router.post("/fleet", response_model=FleetRunStatus, status_code=status.HTTP_202_ACCEPTED)
+def run_fleet(
+    request: FleetRunRequest,
+    response: Response,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> FleetRunStatus:
+    """Queue one profile run per asset matching the selector, tracked as a single fleet run.
+
+    Assets must match every given criterion of ``asset_ids``, ``platform`` and
+    ``owner``. At most ``max_concurrency`` of the run's assets are assessed at
+    once, and each subnet starts at most ``subnet_rate_per_minute`` runs a
+    minute. Poll ``GET /assessments/fleet/{id}`` (the ``Location`` header)
+    for progress.
+    """
+
+    if request.asset_ids is None and request.platform is None and request.owner is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Select assets by asset_ids, platform or owner"
+        )
+    if session.get(Profile, request.profile_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+
+    settings = get_settings()
+    assets = select_assets(session, asset_ids=request.asset_ids, platform=request.platform, owner=request.owner)
+    try:
+        fleet_run, members = create_fleet_run(
+            session,
+            profile_id=request.profile_id,
+            assets=assets,
+            connection=request.connection or {},
+            max_concurrency=min(request.max_concurrency or settings.fleet_max_concurrency, settings.fleet_max_concurrency),
+            subnet_rate_per_minute=request.subnet_rate_per_minute or settings.fleet_subnet_rate_per_minute,
+            selector={"asset_ids": request.asset_ids, "platform": request.platform, "owner": request.owner},
+            subnet_prefix=settings.fleet_subnet_prefix,
+        )
+    except NoMatchingAssets as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    # Workers load the assessments, so they must be committed before the run is queued.
+    session.commit()
+    try:
+        fleet_run_signature(fleet_run, members, app=celery_app).apply_async()
+    except Exception as exc:
+        mark_fleet_run_failed(session, fleet_run, members)
+        session.commit()
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Run could not be queued") from exc
+
+    response.headers["Location"] = f"/assessments/fleet/{fleet_run.id}"
+    return fleet_run_status(session, fleet_run.id)
+
+
+@router.get("/fleet/{fleet_run_id}", response_model=FleetRunStatus)
+def get_fleet_run(
+    fleet_run_id: int,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> FleetRunStatus:
+    """Report a fleet run's status and how many of its assessments have completed or failed."""
+
+    run = fleet_run_status(session, fleet_run_id)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Fleet run not found")
+    return run
+
+
+@router.get("/{assessment_id}", response_model=AssessmentRunStatus)
+def get_assessment_status(
+    assessment_id: int,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> AssessmentRunStatus:
+    """Report an assessment's run status, estimated progress, timestamps and failure, if any."""
+
+    record = get_assessment_store().get(session, assessment_id)
+    if record is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assessment not found")
+    expected = expected_run_seconds(session, record.profile_id) if record.status is AssessmentStatus.RUNNING else None
+    return _to_status(record, expected)
@@ -2,12 +2,30 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from typing import List, Optional
 
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..database import get_session
 from ..dependencies import UserContext, get_current_user
 from ..enums import FindingSeverity, FindingStatus
-from ..schemas import FindingBase
-from ..services.export_service import generate_ckl
+from ..schemas import BulkExportRequest, FindingBase, FindingPage, FindingSummary, WaiverCreate, WaiverRead
+from ..services.bulk_export_service import stream_bulk_export
+from ..services.cache_service import get_export_cache
+from ..services.export_service import (
+    ExportVersion,
+    export_etag,
+    findings_version,
+    generate_cklb,
+    iter_export_rows,
+    stream_assessment_ckl,
+    stream_ckl,
+)
+from ..services.finding_query_service import MAX_PAGE_SIZE, CursorError, FindingFilters, list_findings
+from ..services.rollup_service import posture_summary
+from ..services.waiver_service import grant_waiver, revoke_waiver
 
 router = APIRouter()
 
@@ -29,15 +47,180 @@ _SAMPLE_FINDINGS = [
 ]
 
 
+@router.get("", response_model=FindingPage)
+def get_findings(
+    asset_id: Optional[int] = None,
+    assessment_id: Optional[int] = None,
+    severity: List[FindingSeverity] = Query([]),
+    status_: List[FindingStatus] = Query([], alias="status"),
+    rule_prefix: Optional[str] = None,
+    waived: Optional[bool] = None,
+    order: str = Query("id", pattern="^(id|updated_at)$"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> FindingPage:
+    """List persisted findings with filters, paginated by keyset.
+
+    Follow ``next_cursor`` with the same filters and ``order`` to fetch the
+    next page; it is null on the last page.
+    """
+
+    filters = FindingFilters(
+        asset_id=asset_id,
+        assessment_id=assessment_id,
+        severities=severity,
+        statuses=status_,
+        rule_prefix=rule_prefix,
+        waived=waived,
+    )
+    try:
+        return list_findings(session, filters, order=order, limit=limit, cursor=cursor)
+    except CursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/summary", response_model=FindingSummary)
+def get_findings_summary(
+    group_by: str = Query("asset", pattern="^(asset|profile|framework)$"),
+    latest_only: bool = True,
+    asset_id: Optional[int] = None,
+    profile_id: Optional[int] = None,
+    framework: Optional[str] = None,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> FindingSummary:
+    """Summarize finding counts by severity, status and waiver per asset, profile or framework.
+
+    Served from the finding rollups, so latency follows the number of
+    assessments summarized rather than the number of findings.
+    """
+
+    return posture_summary(
+        session,
+        group_by=group_by,
+        latest_only=latest_only,
+        asset_id=asset_id,
+        profile_id=profile_id,
+        framework=framework,
+    )
+
+
+@router.put("/{finding_id}/waiver", response_model=WaiverRead)
+def put_finding_waiver(
+    finding_id: int,
+    request: WaiverCreate,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> WaiverRead:
+    """Waive a finding, or update the approval details of its existing waiver."""
+
+    waiver = grant_waiver(
+        session,
+        finding_id,
+        approved_by=request.approved_by,
+        justification=request.justification,
+        expires_at=request.expires_at,
+    )
+    if waiver is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Finding not found")
+    return waiver
+
+
+@router.delete("/{finding_id}/waiver", status_code=status.HTTP_204_NO_CONTENT)
+def delete_finding_waiver(
+    finding_id: int,
+    current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Revoke a finding's waiver."""
+
+    if not revoke_waiver(session, finding_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Waiver not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+_SAMPLE_VERSION = ExportVersion(asset_id=1, asset_name="Sample Asset", assessment_id=0, findings_version=0)
+
+_MEDIA_TYPES = {"ckl": "application/xml", "cklb": "application/json"}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/export")
-async def export_findings(
+def export_findings(
     format: str = "ckl",
+    assessment_id: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: UserContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
 ) -> Response:
-    """Export findings in the requested format."""
+    """Export an assessment's findings, or sample findings without ``assessment_id``.
+
+    Responses carry an ETag fingerprinting the asset, assessment and findings
+    version; a matching ``If-None-Match`` gets ``304 Not Modified`` without
+    rendering, and repeat downloads of an unchanged export are served from
+    the export cache.
+    """
+
+    if format not in _MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Only CKL and CKLB exports are supported in this build"
+        )
+
+    version = _SAMPLE_VERSION if assessment_id is None else findings_version(session, assessment_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assessment not found")
+
+    etag = export_etag(format, version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache = get_export_cache()
+    payload = cache.get(etag)
+    if payload is not None:
+        return Response(content=payload, media_type=_MEDIA_TYPES[format], headers=headers)
+
+    if format == "ckl":
+        # The CKL streams from a session of its own: the request's closes before the body is sent.
+        if assessment_id is None:
+            chunks = stream_ckl(_SAMPLE_FINDINGS, asset_name=version.asset_name)
+        else:
+            chunks = stream_assessment_ckl(assessment_id, version.asset_name)
+        return StreamingResponse(cache.tee(etag, chunks), media_type=_MEDIA_TYPES[format], headers=headers)
+    findings = _SAMPLE_FINDINGS if assessment_id is None else iter_export_rows(session, assessment_id)
+    payload = generate_cklb(findings, asset_name=version.asset_name).encode("utf-8")
+    cache.put(etag, payload)
+    return Response(content=payload, media_type=_MEDIA_TYPES[format], headers=headers)
+
+
+@router.get("/export/cache")
+async def get_export_cache_stats(current_user: UserContext = Depends(get_current_user)) -> dict:
+    """Report export cache hit/miss counters and occupancy."""
+
+    return get_export_cache().stats()
+
+
+@router.post("/export/bulk")
+async def export_findings_bulk(
+    request: BulkExportRequest,
+    current_user: UserContext = Depends(get_current_user),
+) -> StreamingResponse:
+    """Export one CKL per asset as a zip archive streamed while checklists render."""
 
-    if format != "ckl":
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only CKL export is supported in this build")
+    if not request.asset_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Provide at least one asset id")
 
-    payload = generate_ckl(_SAMPLE_FINDINGS, asset_name="Sample Asset")
-    return Response(content=payload, media_type="application/xml")
+    return StreamingResponse(
+        stream_bulk_export(sorted(set(request.asset_ids))),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="checklists.zip"'},
+    )
@@ -2,38 +2,229 @@
 
 from __future__ import annotations
 
+from typing import IO, List, Tuple
+from uuid import uuid4
+
+from celery.result import AsyncResult
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 
+from ..celery_app import celery_app, ingest_ckl_task
+from ..config import get_settings
 from ..dependencies import UserContext, get_current_user
-from ..parsers.ckl_parser import CKLParserError, parse_ckl
-from ..schemas import CKLUploadResponse, FindingBase
+from ..parsers import ParsedFinding, ParserError, UnsupportedFormatError, detect_format, get_parser
+from ..parsers.registry import SNIFF_BYTES
+from ..parsers.streaming import peek
+from ..schemas import (
+    ArchiveAssetFindings,
+    ArchiveFileError,
+    ArchiveUploadResponse,
+    CKLUploadResponse,
+    FindingBase,
+    UploadJobAccepted,
+    UploadJobStatus,
+    UploadResponse,
+)
+from ..services.archive_service import ArchiveError, ingest_archive
+from ..services.cache_service import digest_stream, get_parse_cache
+from ..services.upload_job_service import ACCEPTED_STATE, is_job_id, read_results, spool_upload
 
 router = APIRouter()
 
 
+def _to_finding_base(item: ParsedFinding, asset_id: int | None) -> FindingBase:
+    return FindingBase(
+        rule_id=item.rule_id,
+        severity=item.severity,
+        status=item.status,
+        comments=item.comments,
+        asset_id=asset_id or 0,
+    )
+
+
+def _collect_findings(
+    stream: IO[bytes],
+    fmt: str | None,
+    filename: str | None,
+    asset_id: int | None,
+    chunk_size: int,
+) -> Tuple[str, List[FindingBase]]:
+    if fmt is None:
+        head, stream = peek(stream, SNIFF_BYTES)
+        fmt = detect_format(head, filename)
+    parser = get_parser(fmt)
+
+    cache = get_parse_cache()
+    digest = digest_stream(stream, chunk_size=chunk_size)
+    parsed = cache.get(fmt, digest, asset_id=asset_id)
+    if parsed is None:
+        parsed = list(parser(stream, asset_id=asset_id, chunk_size=chunk_size))
+        cache.put(fmt, digest, parsed)
+    return fmt, [_to_finding_base(item, asset_id) for item in parsed]
+
+
+@router.post("", response_model=UploadResponse)
+async def upload_findings(
+    file: UploadFile = File(...),
+    format: str | None = None,
+    asset_id: int | None = None,
+    current_user: UserContext = Depends(get_current_user),
+) -> UploadResponse:
+    """Ingest a scan artifact of any supported format and return normalized findings.
+
+    The format is sniffed from the first few KB of the upload unless ``format``
+    is given; only the parser module for that format is imported.
+    """
+
+    chunk_size = get_settings().upload_chunk_size
+    try:
+        fmt, findings = await run_in_threadpool(
+            _collect_findings, file.file, format, file.filename, asset_id, chunk_size
+        )
+    except UnsupportedFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc)) from exc
+    except ParserError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return UploadResponse(count=len(findings), format=fmt, findings=findings)
+
+
 @router.post("/ckl", response_model=CKLUploadResponse)
 async def upload_ckl(
     file: UploadFile = File(...),
     asset_id: int | None = None,
     current_user: UserContext = Depends(get_current_user),
 ) -> CKLUploadResponse:
-    """Ingest a CKL file and return normalized findings."""
+    """Ingest a CKL file and return normalized findings.
+
+    The upload is parsed from its spooled temporary file in
+    ``upload_chunk_size`` pieces on a worker thread, so the raw checklist is
+    never held in memory. The normalized findings are collected, cached and
+    returned inline, so peak memory grows with the number of findings; use
+    ``/ckl/jobs`` for checklists too large to answer in one response.
+    Re-uploads of an identical payload are served from the parse cache.
+    """
 
-    content = await file.read()
+    chunk_size = get_settings().upload_chunk_size
     try:
-        parsed = parse_ckl(content, asset_id=asset_id)
-    except CKLParserError as exc:
+        _, findings = await run_in_threadpool(_collect_findings, file.file, "ckl", None, asset_id, chunk_size)
+    except ParserError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    findings = [
-        FindingBase(
-            rule_id=item.rule_id,
-            severity=item.severity,
-            status=item.status,
-            comments=item.comments,
-            asset_id=asset_id or 0,
-        )
-        for item in parsed
-    ]
-
     return CKLUploadResponse(count=len(findings), findings=findings)
+
+
+@router.get("/cache")
+async def get_parse_cache_stats(current_user: UserContext = Depends(get_current_user)) -> dict:
+    """Report parse cache hit/miss counters and occupancy."""
+
+    return get_parse_cache().stats()
+
+
+@router.post("/ckl/archive", response_model=ArchiveUploadResponse)
+async def upload_ckl_archive(
+    file: UploadFile = File(...),
+    asset_id: int | None = None,
+    current_user: UserContext = Depends(get_current_user),
+) -> ArchiveUploadResponse:
+    """Ingest a zip or tar bundle of CKL files, parsing members in parallel."""
+
+    try:
+        result = await run_in_threadpool(ingest_archive, file.file, asset_id=asset_id)
+    except ArchiveError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return ArchiveUploadResponse(
+        files=result.files,
+        assets=[
+            ArchiveAssetFindings(
+                asset=asset,
+                count=len(findings),
+                findings=[_to_finding_base(item, asset_id) for item in findings],
+            )
+            for asset, findings in sorted(result.assets.items())
+        ],
+        errors=[ArchiveFileError(file=error.file, detail=error.detail) for error in result.errors],
+    )
+
+
+def _job_result(job_id: str) -> AsyncResult:
+    """Return the Celery result of an issued ingestion job, or 404 for unknown ids.
+
+    Celery reports any id it has no record of as PENDING; accepted jobs are
+    recorded in the ``ACCEPTED`` state until a worker picks them up.
+    """
+
+    if not is_job_id(job_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job not found")
+    result = AsyncResult(job_id, app=celery_app)
+    if result.state == "PENDING":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job not found")
+    return result
+
+
+# The job handlers are plain functions: publishing to the broker and reading
+# the result backend are blocking Redis round trips, so they run on the
+# threadpool instead of the event loop.
+@router.post("/ckl/jobs", response_model=UploadJobAccepted, status_code=status.HTTP_202_ACCEPTED)
+def enqueue_ckl_ingestion(
+    file: UploadFile = File(...),
+    asset_id: int | None = None,
+    current_user: UserContext = Depends(get_current_user),
+) -> UploadJobAccepted:
+    """Store a CKL upload and parse it asynchronously on the Celery workers."""
+
+    settings = get_settings()
+    job_id = uuid4().hex
+    path = spool_upload(file.file, settings.upload_spool_dir, job_id, settings.upload_chunk_size)
+    try:
+        # Recorded before publishing so a fast worker's progress is never overwritten.
+        celery_app.backend.store_result(job_id, None, ACCEPTED_STATE)
+        ingest_ckl_task.apply_async(args=(job_id, asset_id), task_id=job_id)
+    except Exception as exc:
+        path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Ingestion job could not be queued"
+        ) from exc
+    return UploadJobAccepted(job_id=job_id, state="PENDING")
+
+
+@router.get("/jobs/{job_id}", response_model=UploadJobStatus)
+def get_ingestion_job(
+    job_id: str,
+    current_user: UserContext = Depends(get_current_user),
+) -> UploadJobStatus:
+    """Report the state and parsed-finding progress of an ingestion job."""
+
+    result = _job_result(job_id)
+    state = result.state
+    job = UploadJobStatus(job_id=job_id, state="PENDING" if state == ACCEPTED_STATE else state)
+    if state == "PROGRESS":
+        job.parsed = result.info.get("parsed", 0)
+    elif state == "SUCCESS":
+        job.parsed = job.count = result.result["count"]
+    elif state == "FAILURE":
+        job.error = str(result.result)
+    return job
+
+
+@router.get("/jobs/{job_id}/result", response_model=CKLUploadResponse)
+def get_ingestion_result(
+    job_id: str,
+    current_user: UserContext = Depends(get_current_user),
+) -> CKLUploadResponse:
+    """Return the normalized findings of a completed ingestion job."""
+
+    result = _job_result(job_id)
+    state = result.state
+    if state == "FAILURE":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(result.result))
+    if state != "SUCCESS":
+        pending = "pending" if state == ACCEPTED_STATE else state.lower()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Ingestion job is {pending}")
+
+    try:
+        findings = read_results(get_settings().upload_spool_dir, job_id)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job results expired") from exc
+    return CKLUploadResponse(count=len(findings), findings=[FindingBase(**item) for item in findings])
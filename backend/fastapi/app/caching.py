@@ -0,0 +1,102 @@
+"""In-process caching primitives shared by the services."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    weight: int = 0
+    max_weight: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class BoundedLRU(Generic[K, V]):
+    """Thread-safe least-recently-used cache bounded by total entry weight.
+
+    ``weigher`` returns the cost of a value, e.g. its size in bytes; with the
+    default weigher every entry costs one and ``max_weight`` is an entry count.
+    Values heavier than ``max_weight`` are never cached.
+    """
+
+    def __init__(self, max_weight: int, weigher: Callable[[V], int] = lambda _value: 1) -> None:
+        self._max_weight = max_weight
+        self._weigher = weigher
+        self._entries: "OrderedDict[K, tuple[V, int]]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        weight = self._weigher(value)
+        with self._lock:
+            self._discard(key)
+            if weight > self._max_weight:
+                return
+            self._entries[key] = (value, weight)
+            self._weight += weight
+            while self._weight > self._max_weight:
+                _key, (_value, evicted) = self._entries.popitem(last=False)
+                self._weight -= evicted
+                self._evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                weight=self._weight,
+                max_weight=self._max_weight,
+            )
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _discard(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._weight -= entry[1]
+
+
+__all__ = ["BoundedLRU", "CacheStats"]
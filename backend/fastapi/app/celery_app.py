@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import random
+
 from celery import Celery
 
 from .config import get_settings
@@ -16,10 +18,116 @@ celery_app = Celery(
 celery_app.conf.task_default_queue = settings.celery_task_queues[0]
 celery_app.conf.worker_max_tasks_per_child = 20
 celery_app.conf.worker_prefetch_multiplier = 1
+celery_app.conf.beat_schedule = {
+    "reconcile-finding-rollups": {
+        "task": "findings.reconcile_rollups",
+        "schedule": settings.rollup_reconcile_seconds,
+    },
+    "purge-upload-results": {
+        "task": "uploads.purge_results",
+        "schedule": 60 * 60,
+    },
+}
+
+_PROGRESS_INTERVAL = 500
+
+
+# Late acknowledgement requeues runs whose worker died mid-scan instead of
+# leaving them RUNNING; a rerun simply starts the assessment over.
+@celery_app.task(
+    name="assessments.run_inspec",
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=settings.assessment_run_timeout_seconds,
+)
+def run_inspec_task(assessment_id: int, target: dict | None = None) -> dict:
+    """Run a queued InSpec assessment, recording its status as it progresses."""
+
+    from .services.assessment_run_service import execute_assessment
+
+    status = execute_assessment(assessment_id, target or {})
+    return {"assessment_id": assessment_id, "status": status.value}
+
+
+@celery_app.task(
+    bind=True,
+    name="assessments.run_fleet_member",
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=settings.assessment_run_timeout_seconds,
+    max_retries=None,
+)
+def run_fleet_member_task(
+    self,
+    fleet_run_id: int,
+    assessment_id: int,
+    target: dict,
+    subnet: str | None = None,
+    rate_per_minute: int | None = None,
+) -> str:
+    """Run one asset of a fleet run, waiting out its subnet's rate limit first."""
+
+    from .services.fleet_run_service import SubnetRateLimited, execute_fleet_member
+
+    try:
+        status = execute_fleet_member(
+            fleet_run_id, assessment_id, target, subnet=subnet, rate_per_minute=rate_per_minute
+        )
+    except SubnetRateLimited as exc:
+        # Jitter spreads the lanes waiting on one subnet across the next window.
+        raise self.retry(countdown=exc.retry_after + random.uniform(0, 5))
+    return status.value
+
+
+@celery_app.task(name="assessments.finish_fleet_run")
+def finish_fleet_run_task(fleet_run_id: int) -> int:
+    """Close a fleet run once every lane has finished; also linked as the errback of a failed lane."""
+
+    from .services.fleet_run_service import finish_fleet_run
+
+    finish_fleet_run(fleet_run_id)
+    return fleet_run_id
+
+
+# A spooled upload outlives a worker that dies mid-parse, so late acknowledgement
+# redelivers the job and it simply parses the upload again.
+@celery_app.task(bind=True, name="uploads.ingest_ckl", acks_late=True, reject_on_worker_lost=True)
+def ingest_ckl_task(self, job_id: str, asset_id: int | None = None) -> dict:
+    """Parse a spooled CKL upload, publishing the parsed count as task progress.
+
+    The findings are written to the job's results file; only their count is
+    stored in the result backend.
+    """
+
+    from .services.upload_job_service import ingest_spooled_ckl
+
+    count = ingest_spooled_ckl(
+        settings.upload_spool_dir,
+        job_id,
+        asset_id=asset_id,
+        chunk_size=settings.upload_chunk_size,
+        on_progress=lambda parsed: self.update_state(state="PROGRESS", meta={"parsed": parsed}),
+        progress_interval=_PROGRESS_INTERVAL,
+    )
+    return {"count": count}
+
+
+@celery_app.task(name="uploads.purge_results")
+def purge_upload_results_task() -> dict:
+    """Remove ingestion job uploads and results older than the configured retention."""
+
+    from .services.upload_job_service import purge_results
+
+    return {"removed": purge_results(settings.upload_spool_dir, settings.upload_result_ttl_seconds)}
+
 
+@celery_app.task(name="findings.reconcile_rollups")
+def reconcile_rollups_task(assessment_ids: list[int] | None = None) -> dict:
+    """Correct finding rollups that drifted from the findings they summarize."""
 
-@celery_app.task(name="assessments.run_inspec")
-def run_inspec_task(assessment_id: int) -> str:
-    """Placeholder Celery task for running an InSpec assessment."""
+    from .database import get_db
+    from .services.rollup_service import reconcile_rollups
 
-    return f"scheduled assessment {assessment_id}"
+    with get_db() as session:
+        corrected = reconcile_rollups(session, assessment_ids)
+    return {"corrected": corrected}
@@ -29,6 +29,38 @@ class Settings(BaseSettings):
     minio_secret_key: str = Field("minio123", env="MINIO_SECRET_KEY")
     minio_bucket: str = Field("aegis-evidence", env="MINIO_BUCKET")
 
+    upload_chunk_size: int = Field(1024 * 1024, env="AEGIS_UPLOAD_CHUNK_SIZE")
+    upload_spool_dir: str = Field("/var/lib/aegis/uploads", env="AEGIS_UPLOAD_DIR")
+    # Parsed results of ingestion jobs are purged after this long, like Celery's results.
+    upload_result_ttl_seconds: int = Field(24 * 60 * 60, env="AEGIS_UPLOAD_RESULT_TTL")
+    archive_parse_workers: Optional[int] = Field(None, env="AEGIS_ARCHIVE_WORKERS")
+
+    parse_cache_max_bytes: int = Field(64 * 1024 * 1024, env="AEGIS_PARSE_CACHE_MAX_BYTES")
+    parse_cache_redis_url: Optional[str] = Field(None, env="AEGIS_PARSE_CACHE_REDIS_URL")
+    parse_cache_ttl_seconds: int = Field(24 * 60 * 60, env="AEGIS_PARSE_CACHE_TTL")
+
+    delta_engine: str = Field("python", env="AEGIS_DELTA_ENGINE")
+    report_cache_max_bytes: int = Field(128 * 1024 * 1024, env="AEGIS_REPORT_CACHE_MAX_BYTES")
+    # Persists normalized reports to the parse cache's Redis tier when enabled.
+    report_cache_persist: bool = Field(False, env="AEGIS_REPORT_CACHE_PERSIST")
+    export_cache_max_bytes: int = Field(256 * 1024 * 1024, env="AEGIS_EXPORT_CACHE_MAX_BYTES")
+    # Larger exports are streamed without being buffered for the cache.
+    export_cache_max_entry_bytes: int = Field(8 * 1024 * 1024, env="AEGIS_EXPORT_CACHE_MAX_ENTRY_BYTES")
+    # Assessments and their raw reports; reports above the inline limit are
+    # offloaded to the storage directory shared by the API and workers.
+    assessment_cache_max_bytes: int = Field(64 * 1024 * 1024, env="AEGIS_ASSESSMENT_CACHE_MAX_BYTES")
+    assessment_cache_redis_url: Optional[str] = Field(None, env="AEGIS_ASSESSMENT_CACHE_REDIS_URL")
+    report_storage_dir: str = Field("/var/lib/aegis/reports", env="AEGIS_REPORT_STORAGE_DIR")
+    report_inline_max_bytes: int = Field(256 * 1024, env="AEGIS_REPORT_INLINE_MAX_BYTES")
+    # Runs still going after this long are failed by the worker.
+    assessment_run_timeout_seconds: int = Field(60 * 60, env="AEGIS_ASSESSMENT_RUN_TIMEOUT")
+    # Fleet runs: per-run concurrency cap and default per-subnet start rate.
+    fleet_max_concurrency: int = Field(50, env="AEGIS_FLEET_MAX_CONCURRENCY")
+    fleet_subnet_rate_per_minute: int = Field(30, env="AEGIS_FLEET_SUBNET_RATE")
+    fleet_subnet_prefix: int = Field(24, env="AEGIS_FLEET_SUBNET_PREFIX")
+    fleet_rate_limit_redis_url: Optional[str] = Field(None, env="AEGIS_FLEET_REDIS_URL")
+    rollup_reconcile_seconds: int = Field(60 * 60, env="AEGIS_ROLLUP_RECONCILE_SECONDS")
+
     vault_addr: str = Field("http://vault:8200", env="VAULT_ADDR")
     vault_token: Optional[str] = Field(None, env="VAULT_TOKEN")
 
@@ -4,7 +4,7 @@ from contextlib import contextmanager
 from typing import Iterator
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from .config import get_settings
 
@@ -27,3 +27,10 @@ def get_db() -> Iterator[SessionLocal]:
         raise
     finally:
         session.close()
+
+
+def get_session() -> Iterator[Session]:
+    """FastAPI dependency yielding a request-scoped transactional session."""
+
+    with get_db() as session:
+        yield session
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, JSON, String, Text, UniqueConstraint
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from .enums import AssessmentStatus, FindingSeverity, FindingStatus
@@ -53,6 +53,8 @@ class Assessment(Base):
     """Execution of a profile against an asset."""
 
     __tablename__ = "assessments"
+    # Serves fleet delta windows, which look up each asset's assessments by completion time.
+    __table_args__ = (Index("ix_assessments_asset_id_completed_at", "asset_id", "completed_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     asset_id: Mapped[int] = mapped_column(ForeignKey("assets.id"), nullable=False)
@@ -66,11 +68,44 @@ class Assessment(Base):
     profile: Mapped[Profile] = relationship(back_populates="assessments")
     findings: Mapped[List["Finding"]] = relationship(back_populates="assessment", cascade="all, delete-orphan")
     evidence: Mapped[List["Evidence"]] = relationship(back_populates="assessment")
+    reports: Mapped[List["AssessmentReport"]] = relationship(
+        back_populates="assessment", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class AssessmentReport(Base):
+    """Raw report captured by an assessment run, e.g. its baseline or post scan.
+
+    Small reports are stored inline in ``content``; larger ones are offloaded
+    to report storage and referenced by ``storage_uri``.
+    """
+
+    __tablename__ = "assessment_reports"
+
+    assessment_id: Mapped[int] = mapped_column(ForeignKey("assessments.id", ondelete="CASCADE"), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(32), primary_key=True)
+    digest: Mapped[str] = mapped_column(String(64), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    content: Mapped[Optional[dict]] = mapped_column(JSON(none_as_null=True))
+    storage_uri: Mapped[Optional[str]] = mapped_column(String(512))
+
+    assessment: Mapped[Assessment] = relationship(back_populates="reports")
+
+
 class Finding(Base):
     """Normalized compliance finding."""
 
     __tablename__ = "findings"
-    __table_args__ = (UniqueConstraint("assessment_id", "rule_id", name="uq_findings_assessment_rule"),)
+    # The (…, id) indexes serve keyset pagination of ``GET /findings`` under each
+    # common filter; the pattern-ops index serves rule id prefix matches.
+    __table_args__ = (
+        UniqueConstraint("assessment_id", "rule_id", name="uq_findings_assessment_rule"),
+        Index("ix_findings_asset_id_id", "asset_id", "id"),
+        Index("ix_findings_assessment_id_id", "assessment_id", "id"),
+        Index("ix_findings_status_severity_id", "status", "severity", "id"),
+        Index("ix_findings_updated_at_id", "updated_at", "id"),
+        Index("ix_findings_rule_id_pattern", "rule_id", postgresql_ops={"rule_id": "varchar_pattern_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     assessment_id: Mapped[int] = mapped_column(ForeignKey("assessments.id"), nullable=False)
@@ -87,6 +122,37 @@ class Finding(Base):
     evidence: Mapped[List["Evidence"]] = relationship(back_populates="finding")
 
 
+class FindingRollup(Base):
+    """Finding counts of one assessment by severity, status and waiver state.
+
+    Rows are adjusted by delta as findings are upserted and waivers change, so
+    posture summaries read a handful of rows per assessment instead of
+    aggregating ``findings``.
+    """
+
+    __tablename__ = "finding_rollups"
+
+    assessment_id: Mapped[int] = mapped_column(ForeignKey("assessments.id", ondelete="CASCADE"), primary_key=True)
+    severity: Mapped[FindingSeverity] = mapped_column(Enum(FindingSeverity), primary_key=True)
+    status: Mapped[FindingStatus] = mapped_column(Enum(FindingStatus), primary_key=True)
+    waived: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    finding_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class FindingVersion(Base):
+    """Change counter of one assessment's findings.
+
+    Bumped in the same statement as every findings upsert that writes a row,
+    so it only grows, whatever order overlapping transactions commit in, and
+    exports can be fingerprinted without reading ``findings``.
+    """
+
+    __tablename__ = "finding_versions"
+
+    assessment_id: Mapped[int] = mapped_column(ForeignKey("assessments.id", ondelete="CASCADE"), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
 class Waiver(Base):
     """Risk acceptance for a finding."""
 
@@ -101,6 +167,38 @@ class Waiver(Base):
     finding: Mapped[Finding] = relationship(back_populates="waiver")
 
 
+class FleetRun(Base):
+    """One profile run across a selection of assets, fanned out one assessment per asset.
+
+    ``completed`` and ``failed`` count settled member assessments as they
+    finish, so they double as the run's live progress.
+    """
+
+    __tablename__ = "fleet_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id"), nullable=False)
+    status: Mapped[AssessmentStatus] = mapped_column(Enum(AssessmentStatus), default=AssessmentStatus.DRAFT, nullable=False)
+    selector: Mapped[Optional[dict]] = mapped_column(JSON)
+    max_concurrency: Mapped[int] = mapped_column(Integer, nullable=False)
+    subnet_rate_per_minute: Mapped[Optional[int]] = mapped_column(Integer)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+
+class FleetRunMember(Base):
+    """Assessment run as part of a fleet run; ``status`` is set once it has been counted."""
+
+    __tablename__ = "fleet_run_members"
+
+    fleet_run_id: Mapped[int] = mapped_column(ForeignKey("fleet_runs.id", ondelete="CASCADE"), primary_key=True)
+    assessment_id: Mapped[int] = mapped_column(ForeignKey("assessments.id", ondelete="CASCADE"), primary_key=True)
+    status: Mapped[Optional[AssessmentStatus]] = mapped_column(Enum(AssessmentStatus))
+
+
 class Evidence(Base):
     """Artifacts captured during assessments or remediation."""
 
@@ -113,7 +211,7 @@ class Evidence(Base):
     storage_uri: Mapped[str] = mapped_column(String(512), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     content_type: Mapped[Optional[str]] = mapped_column(String(128))
-    metadata: Mapped[Optional[dict]] = mapped_column(JSON)
+    metadata_: Mapped[Optional[dict]] = mapped_column("metadata", JSON)
     quarantined: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     asset: Mapped[Asset] = relationship(back_populates="evidence")
@@ -125,10 +223,15 @@ __all__ = [
     "Asset",
     "Profile",
     "Assessment",
+    "AssessmentReport",
     "AssessmentStatus",
     "Finding",
+    "FindingRollup",
     "FindingSeverity",
     "FindingStatus",
+    "FindingVersion",
+    "FleetRun",
+    "FleetRunMember",
     "Waiver",
     "Evidence",
     "Base",
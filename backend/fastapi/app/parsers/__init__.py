@@ -0,0 +1,14 @@
+"""Parsers for scan artifacts; individual modules are imported on first use."""
+
+from .base import ParsedFinding, ParserError
+from .registry import UnsupportedFormatError, detect_format, get_parser, iter_findings, supported_formats
+
+__all__ = [
+    "ParsedFinding",
+    "ParserError",
+    "UnsupportedFormatError",
+    "detect_format",
+    "get_parser",
+    "iter_findings",
+    "supported_formats",
+]
@@ -0,0 +1,178 @@
+"""Streaming parser for AWS Security Finding Format (ASFF) documents.
+
+Accepts Prowler ``json-asff`` output (a bare array), the MCP server's
+``{"findings": [...]}`` wrapper and ``BatchImportFindings`` payloads
+(``{"Findings": [...]}``).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from ..enums import FindingSeverity, FindingStatus
+from ..schemas import AssetCreate
+from .base import ParsedFinding, ParserError, bounded_rule_id
+from .streaming import DEFAULT_CHUNK_SIZE, Source, iter_json
+
+_FINDING_PATHS = (("*",), ("findings", "*"), ("Findings", "*"))
+
+# ``Asset.hostname`` is a 255 character column; longer ARNs keep their tail,
+# which carries the resource name.
+_HOSTNAME_LIMIT = 255
+
+
+class ASFFParserError(ParserError):
+    """Raised when an ASFF payload cannot be parsed."""
+
+
+_SEVERITY_LABEL_MAP = {
+    "critical": FindingSeverity.CAT_I,
+    "high": FindingSeverity.CAT_I,
+    "medium": FindingSeverity.CAT_II,
+    "low": FindingSeverity.CAT_III,
+    "informational": FindingSeverity.INFO,
+}
+
+_COMPLIANCE_MAP = {
+    "passed": FindingStatus.NOT_A_FINDING,
+    "failed": FindingStatus.OPEN,
+    "warning": FindingStatus.REVIEW_REQUIRED,
+    "not_available": FindingStatus.NOT_APPLICABLE,
+}
+
+
+def _object(value: Any, what: str) -> Dict[str, Any]:
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ASFFParserError(f"ASFF {what} must be a JSON object")
+    return value
+
+
+def _severity_for(severity: Dict[str, Any]) -> Optional[FindingSeverity]:
+    label = str(severity.get("Label") or "").strip().lower()
+    if label:
+        return _SEVERITY_LABEL_MAP.get(label)
+    # Pre-label producers only report a 0-100 normalized score.
+    normalized = severity.get("Normalized")
+    if normalized is None:
+        return FindingSeverity.INFO
+    if isinstance(normalized, bool) or not isinstance(normalized, (int, float)):
+        raise ASFFParserError(f"ASFF Severity.Normalized must be a number, not {normalized!r}")
+    if normalized >= 70:
+        return FindingSeverity.CAT_I
+    if normalized >= 40:
+        return FindingSeverity.CAT_II
+    if normalized >= 1:
+        return FindingSeverity.CAT_III
+    return FindingSeverity.INFO
+
+
+def _status_for(severity: FindingSeverity, compliance: Dict[str, Any]) -> FindingStatus:
+    result = str(compliance.get("Status") or "").strip().lower()
+    if result:
+        return _COMPLIANCE_MAP.get(result, FindingStatus.REVIEW_REQUIRED)
+    return FindingStatus.NOT_A_FINDING if severity == FindingSeverity.INFO else FindingStatus.OPEN
+
+
+def _resource(item: Dict[str, Any]) -> Dict[str, Any]:
+    resources = item.get("Resources")
+    if not resources:
+        return {}
+    if not isinstance(resources, list):
+        raise ASFFParserError("ASFF Resources must be a list of JSON objects")
+    return _object(resources[0], "Resources")
+
+
+def _hostname(resource: Dict[str, Any]) -> Optional[str]:
+    arn = str(resource.get("Id") or "").strip()
+    return arn[-_HOSTNAME_LIMIT:] or None
+
+
+def _rule_key(item: Dict[str, Any], resource: Dict[str, Any]) -> Optional[str]:
+    """Key a finding by its control and resource, e.g. ``prowler-s3_bucket_versioning@arn:aws:s3:::logs``.
+
+    A control's findings on different resources share a ``GeneratorId``;
+    findings without a resource ARN fall back to their unique ``Id``.
+    """
+
+    generator = str(item.get("GeneratorId") or "").strip()
+    arn = str(resource.get("Id") or "").strip()
+    key = f"{generator}@{arn}" if generator and arn else str(item.get("Id") or generator).strip()
+    return bounded_rule_id(key) if key else None
+
+
+def _finding_from_item(item: Any, asset_id: int | None) -> Optional[ParsedFinding]:
+    if not isinstance(item, dict):
+        raise ASFFParserError("ASFF findings must be JSON objects")
+    resource = _resource(item)
+    rule_id = _rule_key(item, resource)
+    if not rule_id:
+        return None
+
+    severity_field = _object(item.get("Severity"), "Severity")
+    severity = _severity_for(severity_field)
+    if not severity:
+        raise ASFFParserError(f"Unsupported severity '{severity_field.get('Label')}' for finding '{rule_id}'")
+
+    comments = item.get("Title") or item.get("Description")
+    return ParsedFinding(
+        rule_id=rule_id,
+        severity=severity,
+        status=_status_for(severity, _object(item.get("Compliance"), "Compliance")),
+        comments=comments.strip() if comments else None,
+        asset_id=asset_id,
+        host=_hostname(resource),
+    )
+
+
+def _iter_items(source: Source, chunk_size: int) -> Iterator[Any]:
+    try:
+        for _path, item in iter_json(source, _FINDING_PATHS, chunk_size=chunk_size):
+            yield item
+    except json.JSONDecodeError as exc:
+        raise ASFFParserError(f"Invalid ASFF JSON payload: {exc}") from exc
+
+
+def iter_asff(
+    source: Source, *, asset_id: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[ParsedFinding]:
+    """Stream normalized findings from an ASFF document one finding at a time.
+
+    Findings carry the ARN of their first resource as ``host``, which matches
+    the hostname of the asset produced by :func:`iter_asff_assets`.
+    """
+
+    for item in _iter_items(source, chunk_size):
+        finding = _finding_from_item(item, asset_id)
+        if finding is not None:
+            yield finding
+
+
+def iter_asff_assets(source: Source, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[AssetCreate]:
+    """Stream one asset per distinct resource ARN referenced by an ASFF document."""
+
+    seen: Set[str] = set()
+    for item in _iter_items(source, chunk_size):
+        if not isinstance(item, dict):
+            raise ASFFParserError("ASFF findings must be JSON objects")
+        resource = _resource(item)
+        hostname = _hostname(resource)
+        if hostname is None or hostname in seen:
+            continue
+        seen.add(hostname)
+        yield AssetCreate(
+            hostname=hostname,
+            platform=resource.get("Type"),
+            owner=item.get("AwsAccountId"),
+        )
+
+
+def parse_asff(content: Source, *, asset_id: int | None = None) -> List[ParsedFinding]:
+    """Normalize an ASFF document into findings."""
+
+    return list(iter_asff(content, asset_id=asset_id))
+
+
+__all__ = ["ASFFParserError", "iter_asff", "parse_asff"]
@@ -0,0 +1,44 @@
+"""Shared types for the scan artifact parsers."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from ..enums import FindingSeverity, FindingStatus
+
+
+@dataclass(slots=True)
+class ParsedFinding:
+    """Normalized finding extracted from a CKL file or another scan artifact."""
+
+    rule_id: str
+    severity: FindingSeverity
+    status: FindingStatus
+    comments: Optional[str]
+    asset_id: Optional[int]
+    host: Optional[str] = None
+
+
+class ParserError(ValueError):
+    """Base class for errors raised when an uploaded artifact cannot be parsed."""
+
+
+# Width of ``findings.rule_id``.
+RULE_ID_MAX_LENGTH = 128
+
+
+def bounded_rule_id(key: str) -> str:
+    """Return ``key`` as a rule id, shortening keys too wide for the findings table.
+
+    Shortened keys end in a digest of the full key, so distinct keys stay distinct.
+    """
+
+    if len(key) <= RULE_ID_MAX_LENGTH:
+        return key
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return f"{key[: RULE_ID_MAX_LENGTH - len(digest) - 1]}~{digest}"
+
+
+__all__ = ["RULE_ID_MAX_LENGTH", "ParsedFinding", "ParserError", "bounded_rule_id"]
@@ -0,0 +1,75 @@
+"""Streaming parser for STIG Viewer 3 JSON checklists (CKLB)."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator, List, Optional
+
+from .base import ParsedFinding, ParserError
+from .stig import severity_from_label, status_from_label
+from .streaming import DEFAULT_CHUNK_SIZE, Source, iter_json
+
+_TARGET_PATH = ("target_data",)
+_RULES_PATH = ("stigs", "*", "rules", "*")
+
+
+class CKLBParserError(ParserError):
+    """Raised when the CKLB payload cannot be parsed."""
+
+
+def _finding_from_rule(rule: Any, asset_id: int | None, host: str | None) -> Optional[ParsedFinding]:
+    if not isinstance(rule, dict):
+        raise CKLBParserError("CKLB rules must be JSON objects")
+    rule_id = rule.get("rule_id") or rule.get("group_id")
+    if not rule_id:
+        return None
+
+    severity_raw = str(rule.get("severity") or "").strip().lower()
+    severity = severity_from_label(severity_raw)
+    if not severity:
+        raise CKLBParserError(f"Unsupported severity '{severity_raw}' for rule '{rule_id}'")
+
+    comments = rule.get("comments") or rule.get("finding_details")
+    return ParsedFinding(
+        rule_id=rule_id,
+        severity=severity,
+        status=status_from_label(rule.get("status")),
+        comments=comments.strip() if comments else None,
+        asset_id=asset_id,
+        host=host,
+    )
+
+
+def iter_cklb(
+    source: Source,
+    *,
+    asset_id: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[ParsedFinding]:
+    """Stream normalized findings from ``stigs[].rules[]`` of a CKLB checklist.
+
+    Only one rule object is decoded at a time. Findings carry the
+    ``target_data.host_name`` as their host; STIG Viewer writes ``target_data``
+    ahead of ``stigs``, so the host is known before the first rule.
+    """
+
+    host: str | None = None
+    try:
+        for path, value in iter_json(source, [_TARGET_PATH, _RULES_PATH], chunk_size=chunk_size):
+            if path == _TARGET_PATH:
+                host = str((value or {}).get("host_name") or "").strip() or None
+                continue
+            finding = _finding_from_rule(value, asset_id, host)
+            if finding is not None:
+                yield finding
+    except json.JSONDecodeError as exc:
+        raise CKLBParserError(f"Invalid CKLB JSON payload: {exc}") from exc
+
+
+def parse_cklb(content: Source, *, asset_id: int | None = None) -> List[ParsedFinding]:
+    """Parse a CKLB checklist into normalized findings."""
+
+    return list(iter_cklb(content, asset_id=asset_id))
+
+
+__all__ = ["CKLBParserError", "iter_cklb", "parse_cklb"]
@@ -1,9 +1,134 @@
-"""Placeholder parser for Chef InSpec JSON."""
+"""Streaming parser for Chef InSpec JSON reporter output."""
 
-from typing import Any, Dict, List
+from __future__ import annotations
 
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-def parse_inspec(report: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Normalize InSpec JSON results (stub)."""
+from ..enums import FindingSeverity, FindingStatus
+from .base import ParsedFinding, ParserError
+from .streaming import DEFAULT_CHUNK_SIZE, JSONPath, Source, iter_json
 
-    return report.get("profiles", [])
+_CONTROLS_PATH = ("profiles", "*", "controls", "*")
+_PLATFORM_PATH = ("platform",)
+
+Report = Union[Dict[str, Any], Source]
+
+
+class InSpecParserError(ParserError):
+    """Raised when an InSpec report cannot be parsed."""
+
+
+def _severity_from_impact(impact: Any) -> FindingSeverity:
+    if impact is None:
+        return FindingSeverity.CAT_III
+    if isinstance(impact, bool) or not isinstance(impact, (int, float)):
+        raise InSpecParserError(f"InSpec control impact must be a number, not {impact!r}")
+    if impact >= 0.7:
+        return FindingSeverity.CAT_I
+    if impact >= 0.5:
+        return FindingSeverity.CAT_II
+    if impact > 0:
+        return FindingSeverity.CAT_III
+    return FindingSeverity.INFO
+
+
+def _status_from_results(results: Iterable[dict]) -> FindingStatus:
+    statuses = {str(result.get("status", "")).lower() for result in results}
+    if "failed" in statuses:
+        return FindingStatus.OPEN
+    if "passed" in statuses:
+        return FindingStatus.NOT_A_FINDING
+    if "not_applicable" in statuses:
+        return FindingStatus.NOT_APPLICABLE
+    return FindingStatus.REVIEW_REQUIRED
+
+
+def _list_of_objects(value: Any, what: str) -> List[dict]:
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+        raise InSpecParserError(f"InSpec {what} must be a list of JSON objects")
+    return value
+
+
+def _finding_from_control(control: Any, asset_id: int | None, host: str | None) -> Optional[ParsedFinding]:
+    if not isinstance(control, dict):
+        raise InSpecParserError("InSpec controls must be JSON objects")
+    rule_id = control.get("id") or control.get("ref_id")
+    if not rule_id:
+        return None
+    if not isinstance(rule_id, str):
+        raise InSpecParserError(f"InSpec control id must be a string, not {rule_id!r}")
+
+    results = _list_of_objects(control.get("results"), f"results of control '{rule_id}'")
+    messages = [
+        str(result["message"]).strip()
+        for result in results
+        if str(result.get("status", "")).lower() == "failed" and result.get("message")
+    ]
+    return ParsedFinding(
+        rule_id=rule_id,
+        severity=_severity_from_impact(control.get("impact")),
+        status=_status_from_results(results),
+        comments="\n".join(messages) or None,
+        asset_id=asset_id,
+        host=host,
+    )
+
+
+def _iter_report_dict(report: Dict[str, Any]) -> Iterator[Tuple[JSONPath, Any]]:
+    yield _PLATFORM_PATH, report.get("platform")
+    for profile in _list_of_objects(report.get("profiles"), "profiles"):
+        controls = profile.get("controls")
+        if controls is not None and not isinstance(controls, list):
+            raise InSpecParserError("InSpec profile controls must be a list")
+        for control in controls or []:
+            yield _CONTROLS_PATH, control
+
+
+def _host_from_platform(platform: Any) -> Optional[str]:
+    if platform is None:
+        return None
+    if not isinstance(platform, dict):
+        raise InSpecParserError("InSpec platform must be a JSON object")
+    target_id = platform.get("target_id")
+    return str(target_id) if target_id else None
+
+
+def iter_inspec(
+    report: Report, *, asset_id: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[ParsedFinding]:
+    """Stream normalized findings from ``profiles[].controls[]`` of an InSpec report.
+
+    ``report`` may be an already decoded dict, the raw JSON payload or a file
+    handle. Raw reports are walked incrementally so only one control is decoded
+    at a time, whatever the size of the reporter output. Findings carry the
+    ``platform.target_id`` as their host when the report provides it.
+    """
+
+    if isinstance(report, dict):
+        values = _iter_report_dict(report)
+    else:
+        values = iter_json(report, [_PLATFORM_PATH, _CONTROLS_PATH], chunk_size=chunk_size)
+
+    host: str | None = None
+    try:
+        for path, value in values:
+            if path == _PLATFORM_PATH:
+                host = _host_from_platform(value)
+                continue
+            finding = _finding_from_control(value, asset_id, host)
+            if finding is not None:
+                yield finding
+    except json.JSONDecodeError as exc:
+        raise InSpecParserError(f"Invalid InSpec JSON payload: {exc}") from exc
+
+
+def parse_inspec(report: Report, *, asset_id: int | None = None) -> List[ParsedFinding]:
+    """Normalize InSpec JSON results into findings."""
+
+    return list(iter_inspec(report, asset_id=asset_id))
+
+
+__all__ = ["InSpecParserError", "iter_inspec", "parse_inspec"]
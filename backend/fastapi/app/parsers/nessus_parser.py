@@ -1,9 +1,176 @@
-"""Placeholder parser for Nessus CSV exports."""
+"""Streaming parser for Nessus CSV exports and ``.nessus`` v2 XML reports."""
 
-from typing import List
+from __future__ import annotations
 
+import csv
+from typing import Dict, Iterator, List, Optional
+from xml.etree import ElementTree as ET
 
-def parse_nessus(csv_text: str) -> List[dict]:
-    """Normalize Nessus CSV data (stub)."""
+from ..enums import FindingSeverity, FindingStatus
+from .base import ParsedFinding, ParserError, bounded_rule_id
+from .streaming import DEFAULT_CHUNK_SIZE, Source, iter_text_lines, iter_xml, peek
 
-    return []
+# Plugin output columns routinely exceed the csv module's 128 KiB default.
+_CSV_FIELD_SIZE_LIMIT = 64 * 1024 * 1024
+
+
+class NessusParserError(ParserError):
+    """Raised when a Nessus export cannot be parsed."""
+
+
+_RISK_MAP = {
+    "critical": FindingSeverity.CAT_I,
+    "high": FindingSeverity.CAT_I,
+    "medium": FindingSeverity.CAT_II,
+    "low": FindingSeverity.CAT_III,
+    "none": FindingSeverity.INFO,
+    "info": FindingSeverity.INFO,
+    "informational": FindingSeverity.INFO,
+}
+
+_SEVERITY_LEVEL_MAP = {
+    "4": FindingSeverity.CAT_I,
+    "3": FindingSeverity.CAT_I,
+    "2": FindingSeverity.CAT_II,
+    "1": FindingSeverity.CAT_III,
+    "0": FindingSeverity.INFO,
+}
+
+_COMPLIANCE_MAP = {
+    "passed": FindingStatus.NOT_A_FINDING,
+    "failed": FindingStatus.OPEN,
+    "warning": FindingStatus.REVIEW_REQUIRED,
+    "error": FindingStatus.REVIEW_REQUIRED,
+}
+
+_CM_NAMESPACE = "{http://www.nessus.org/cm}"
+
+
+def _status_for(severity: FindingSeverity, compliance_result: str | None) -> FindingStatus:
+    if compliance_result:
+        return _COMPLIANCE_MAP.get(compliance_result.strip().lower(), FindingStatus.REVIEW_REQUIRED)
+    return FindingStatus.NOT_A_FINDING if severity == FindingSeverity.INFO else FindingStatus.OPEN
+
+
+def _rule_key(check_id: str, *, protocol: str | None, port: str | None, host: str | None) -> str:
+    """Key a result by where it was reported, e.g. ``97833:tcp/445@10.0.0.5``.
+
+    Nessus reports a plugin once per port and host under the same plugin ID;
+    port 0 marks host-level results and is left out.
+    """
+
+    key = check_id
+    port = (port or "").strip()
+    if port and port != "0":
+        key += f":{(protocol or 'tcp').strip().lower()}/{port}"
+    if host:
+        key += f"@{host}"
+    return bounded_rule_id(key)
+
+
+def _finding_from_row(row: Dict[str, str], asset_id: int | None) -> Optional[ParsedFinding]:
+    plugin_id = (row.get("Plugin ID") or "").strip()
+    if not plugin_id:
+        return None
+
+    risk = (row.get("Risk") or "none").strip().lower()
+    compliance_result = risk if risk in _COMPLIANCE_MAP else None
+    severity = FindingSeverity.INFO if compliance_result else _RISK_MAP.get(risk)
+    if not severity:
+        raise NessusParserError(f"Unsupported risk '{risk}' for plugin '{plugin_id}'")
+
+    host = (row.get("Host") or "").strip() or None
+    synopsis = (row.get("Synopsis") or row.get("Name") or "").strip()
+    return ParsedFinding(
+        rule_id=_rule_key(plugin_id, protocol=row.get("Protocol"), port=row.get("Port"), host=host),
+        severity=severity,
+        status=_status_for(severity, compliance_result),
+        comments=synopsis or None,
+        asset_id=asset_id,
+        host=host,
+    )
+
+
+def iter_nessus_csv(
+    source: Source, *, asset_id: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[ParsedFinding]:
+    """Stream findings from a Nessus CSV export one row at a time."""
+
+    # The limit is process-wide, so it is only ever raised, never restored:
+    # restoring it could cut off a concurrent parse mid-row.
+    if csv.field_size_limit() < _CSV_FIELD_SIZE_LIMIT:
+        csv.field_size_limit(_CSV_FIELD_SIZE_LIMIT)
+    try:
+        for row in csv.DictReader(iter_text_lines(source, chunk_size=chunk_size)):
+            finding = _finding_from_row(row, asset_id)
+            if finding is not None:
+                yield finding
+    except csv.Error as exc:
+        raise NessusParserError(f"Invalid Nessus CSV payload: {exc}") from exc
+
+
+def _finding_from_report_item(item: ET.Element, asset_id: int | None, host: str | None) -> Optional[ParsedFinding]:
+    check_id = (item.findtext(f"{_CM_NAMESPACE}compliance-check-id") or item.get("pluginID") or "").strip()
+    if not check_id:
+        return None
+
+    level = (item.get("severity") or "0").strip()
+    severity = _SEVERITY_LEVEL_MAP.get(level)
+    if not severity:
+        raise NessusParserError(f"Unsupported severity '{level}' for plugin '{check_id}'")
+
+    synopsis = (
+        item.findtext("synopsis")
+        or item.findtext(f"{_CM_NAMESPACE}compliance-check-name")
+        or item.get("pluginName")
+    )
+    return ParsedFinding(
+        rule_id=_rule_key(check_id, protocol=item.get("protocol"), port=item.get("port"), host=host),
+        severity=severity,
+        status=_status_for(severity, item.findtext(f"{_CM_NAMESPACE}compliance-result")),
+        comments=synopsis.strip() if synopsis else None,
+        asset_id=asset_id,
+        host=host,
+    )
+
+
+def iter_nessus_xml(
+    source: Source, *, asset_id: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[ParsedFinding]:
+    """Stream findings from ``ReportItem`` elements of a ``.nessus`` v2 report."""
+
+    host: str | None = None
+    try:
+        for event, element in iter_xml(
+            source, units={"ReportItem"}, containers={"ReportHost"}, chunk_size=chunk_size
+        ):
+            if element.tag == "ReportHost":
+                host = element.get("name") if event == "start" else None
+                continue
+            finding = _finding_from_report_item(element, asset_id, host)
+            if finding is not None:
+                yield finding
+    except ET.ParseError as exc:
+        raise NessusParserError("Invalid Nessus XML payload") from exc
+
+
+def iter_nessus(
+    source: Source, *, asset_id: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[ParsedFinding]:
+    """Stream findings from either Nessus export format, sniffing the payload."""
+
+    head, source = peek(source, 512)
+    if isinstance(head, (bytes, bytearray)):
+        head = head.decode("utf-8", errors="ignore")
+    if head.lstrip("\ufeff \t\r\n").startswith("<"):
+        return iter_nessus_xml(source, asset_id=asset_id, chunk_size=chunk_size)
+    return iter_nessus_csv(source, asset_id=asset_id, chunk_size=chunk_size)
+
+
+def parse_nessus(content: Source, *, asset_id: int | None = None) -> List[ParsedFinding]:
+    """Normalize a Nessus CSV or ``.nessus`` export into findings."""
+
+    return list(iter_nessus(content, asset_id=asset_id))
+
+
+__all__ = ["NessusParserError", "iter_nessus", "iter_nessus_csv", "iter_nessus_xml", "parse_nessus"]
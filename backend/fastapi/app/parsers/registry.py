@@ -0,0 +1,138 @@
+"""Format detection and lazily imported parser dispatch."""
+
+from __future__ import annotations
+
+import threading
+from importlib import import_module
+from pathlib import PurePath
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .base import ParsedFinding, ParserError
+from .streaming import DEFAULT_CHUNK_SIZE, Source, peek
+
+SNIFF_BYTES = 8 * 1024
+
+StreamingParser = Callable[..., Iterator[ParsedFinding]]
+
+# Format name -> (module within this package, streaming entry point). Modules are
+# imported on first use so callers only pay for the parsers they exercise.
+_PARSERS: Dict[str, Tuple[str, str]] = {
+    "ckl": ("ckl_parser", "iter_ckl"),
+    "cklb": ("cklb_parser", "iter_cklb"),
+    "xccdf": ("xccdf_parser", "iter_xccdf"),
+    "nessus": ("nessus_parser", "iter_nessus_xml"),
+    "nessus_csv": ("nessus_parser", "iter_nessus_csv"),
+    "asff": ("asff_parser", "iter_asff"),
+    "inspec": ("inspec_parser", "iter_inspec"),
+}
+
+_EXTENSIONS = {
+    ".ckl": "ckl",
+    ".cklb": "cklb",
+    ".nessus": "nessus",
+    ".csv": "nessus_csv",
+}
+
+_loaded: Dict[str, StreamingParser] = {}
+_lock = threading.Lock()
+
+
+class UnsupportedFormatError(ParserError):
+    """Raised when an upload's format cannot be detected or has no parser."""
+
+
+def _sniff_xml(head: str) -> Optional[str]:
+    if "<CHECKLIST" in head:
+        return "ckl"
+    if "NessusClientData_v2" in head:
+        return "nessus"
+    if "asset-report-collection" in head or "checklists.nist.gov/xccdf" in head or "TestResult" in head:
+        return "xccdf"
+    return None
+
+
+def _sniff_json(head: str) -> Optional[str]:
+    if '"SchemaVersion"' in head or '"AwsAccountId"' in head or '"ProductArn"' in head:
+        return "asff"
+    if '"stigs"' in head or '"target_data"' in head or '"cklb_version"' in head:
+        return "cklb"
+    if '"profiles"' in head or '"controls"' in head or '"platform"' in head:
+        return "inspec"
+    return None
+
+
+def detect_format(head: bytes | str, filename: str | None = None) -> str:
+    """Identify the artifact format from the first few KB of a payload.
+
+    Content markers win over the file name; the extension is only used when the
+    sniffed prefix is inconclusive.
+    """
+
+    text = head.decode("utf-8", errors="ignore") if isinstance(head, (bytes, bytearray)) else head
+    text = text.lstrip("\ufeff \t\r\n")
+
+    detected: Optional[str] = None
+    if text.startswith("<"):
+        detected = _sniff_xml(text)
+    elif text.startswith(("{", "[")):
+        detected = _sniff_json(text)
+    elif "Plugin ID" in text.partition("\n")[0]:
+        detected = "nessus_csv"
+
+    if detected is None and filename:
+        detected = _EXTENSIONS.get(PurePath(filename).suffix.lower())
+    if detected is None:
+        raise UnsupportedFormatError("Unable to detect the format of the uploaded file")
+    return detected
+
+
+def get_parser(fmt: str) -> StreamingParser:
+    """Return the streaming parser for ``fmt``, importing its module on first use."""
+
+    parser = _loaded.get(fmt)
+    if parser is not None:
+        return parser
+
+    try:
+        module_name, function_name = _PARSERS[fmt]
+    except KeyError:
+        raise UnsupportedFormatError(f"No parser is available for format '{fmt}'") from None
+
+    with _lock:
+        if fmt not in _loaded:
+            module = import_module(f".{module_name}", __package__)
+            _loaded[fmt] = getattr(module, function_name)
+    return _loaded[fmt]
+
+
+def supported_formats() -> Tuple[str, ...]:
+    return tuple(sorted(_PARSERS))
+
+
+def iter_findings(
+    source: Source,
+    *,
+    fmt: str | None = None,
+    filename: str | None = None,
+    asset_id: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[str, Iterator[ParsedFinding]]:
+    """Detect the format of ``source`` unless given and stream its findings.
+
+    Returns the format name alongside the findings iterator.
+    """
+
+    if fmt is None:
+        head, source = peek(source, SNIFF_BYTES)
+        fmt = detect_format(head, filename)
+    return fmt, get_parser(fmt)(source, asset_id=asset_id, chunk_size=chunk_size)
+
+
+__all__ = [
+    "SNIFF_BYTES",
+    "UnsupportedFormatError",
+    "detect_format",
+    "get_parser",
+    "iter_findings",
+    "supported_formats",
+]
@@ -0,0 +1,46 @@
+"""Severity and status vocabulary shared by the STIG checklist formats.
+
+CKL (``STATUS`` elements such as ``NotAFinding``) and CKLB (``not_a_finding``)
+spell the same values differently; both are folded to one lookup key here so
+each format costs a single dict lookup per rule.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from ..enums import FindingSeverity, FindingStatus
+
+_SEVERITY_MAP = {
+    "high": FindingSeverity.CAT_I,
+    "medium": FindingSeverity.CAT_II,
+    "low": FindingSeverity.CAT_III,
+    "informational": FindingSeverity.INFO,
+}
+
+# Keys are lower-cased with spaces, underscores and hyphens removed.
+_STATUS_MAP = {
+    "open": FindingStatus.OPEN,
+    "notafinding": FindingStatus.NOT_A_FINDING,
+    "notapplicable": FindingStatus.NOT_APPLICABLE,
+    "notreviewed": FindingStatus.REVIEW_REQUIRED,
+    "review": FindingStatus.REVIEW_REQUIRED,
+}
+
+_STATUS_KEY = str.maketrans("", "", " _-")
+
+
+def severity_from_label(label: str | None) -> Optional[FindingSeverity]:
+    """Map a checklist severity label to a severity, or ``None`` if unknown."""
+
+    return _SEVERITY_MAP.get((label or "").strip().lower())
+
+
+def status_from_label(label: str | None) -> FindingStatus:
+    """Map a CKL or CKLB status label to a status; unknown labels need review."""
+
+    key = (label or "").strip().lower().translate(_STATUS_KEY)
+    return _STATUS_MAP.get(key, FindingStatus.REVIEW_REQUIRED)
+
+
+__all__ = ["severity_from_label", "status_from_label"]
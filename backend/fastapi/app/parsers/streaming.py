@@ -0,0 +1,374 @@
+"""Incremental reading helpers shared by the streaming parsers."""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import IO, AbstractSet, Any, Collection, Iterator, Tuple, Union
+from xml.etree import ElementTree as ET
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+Source = Union[bytes, str, IO[bytes], IO[str]]
+
+
+def iter_chunks(source: Source, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes | str]:
+    """Yield ``source`` in slices of at most ``chunk_size`` characters or bytes.
+
+    ``source`` may be an in-memory payload or any object exposing ``read``.
+    """
+
+    if isinstance(source, (bytes, bytearray, str)):
+        for offset in range(0, len(source), chunk_size):
+            yield source[offset : offset + chunk_size]
+        return
+
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_text(source: Source, *, encoding: str = "utf-8-sig", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield ``source`` as decoded text chunks, dropping a leading byte order mark."""
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    started = False
+    for chunk in iter_chunks(source, chunk_size=chunk_size):
+        text = decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+        if not started and text:
+            text, started = text.removeprefix("\ufeff"), True
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_text_lines(
+    source: Source, *, encoding: str = "utf-8-sig", chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Yield decoded lines of ``source``, keeping line endings, one chunk at a time."""
+
+    pending = ""
+    for text in iter_text(source, encoding=encoding, chunk_size=chunk_size):
+        *lines, pending = (pending + text).split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+class _PrefixedReader:
+    """Replays data already consumed from a non-seekable stream before the rest of it."""
+
+    def __init__(self, prefix: bytes | str, stream: IO) -> None:
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes | str:
+        if not self._prefix:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._stream.read(), self._prefix[:0]
+            return data
+        data, self._prefix = self._prefix[:size], self._prefix[size:]
+        return data
+
+
+def peek(source: Source, size: int) -> Tuple[bytes | str, Source]:
+    """Return the first ``size`` bytes of ``source`` and a source positioned at its start.
+
+    In-memory payloads and seekable streams are returned as-is (rewound);
+    other streams are wrapped so the peeked data is read again.
+    """
+
+    if isinstance(source, (bytes, bytearray, str)):
+        return source[:size], source
+
+    seekable = getattr(source, "seekable", None)
+    if seekable is not None and seekable():
+        start = source.tell()
+        head = source.read(size)
+        source.seek(start)
+        return head, source
+
+    head = source.read(size)
+    return head, _PrefixedReader(head, source)
+
+
+def local_name(tag: str) -> str:
+    """Return an XML tag without its ``{namespace}`` prefix."""
+
+    return tag[tag.rfind("}") + 1 :]
+
+
+def iter_xml(
+    source: Source,
+    *,
+    units: AbstractSet[str],
+    containers: AbstractSet[str] = frozenset(),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[str, ET.Element]]:
+    """Incrementally parse XML, yielding complete ``units`` and then discarding them.
+
+    Tags are matched on their local name so namespaced documents need no
+    prefix handling. Each element named in ``units`` is yielded as an
+    ``("end", element)`` pair once it closes, with its subtree intact; when the
+    consumer resumes, the element is cleared and detached from its parent.
+    Elements outside of a unit are dropped as soon as they close, so only the
+    open ancestor chain and the unit currently being collected stay in memory.
+    Elements named in ``containers`` are yielded as ``("start", element)`` when
+    they open and ``("end", element)`` when they close, without being retained,
+    so callers can track scope (attributes are available, children are not).
+
+    Raises ``xml.etree.ElementTree.ParseError`` for malformed documents.
+    """
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    ancestors: list[ET.Element] = []
+    unit_depth = 0
+
+    def _events() -> Iterator[Tuple[str, ET.Element]]:
+        for chunk in iter_chunks(source, chunk_size=chunk_size):
+            parser.feed(chunk)
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+
+    for event, element in _events():
+        if event == "start":
+            if unit_depth:
+                unit_depth += 1
+                continue
+            ancestors.append(element)
+            name = local_name(element.tag)
+            if name in units:
+                unit_depth = 1
+            if name in containers:
+                yield event, element
+            continue
+
+        if unit_depth > 1:
+            unit_depth -= 1
+            continue
+
+        ancestors.pop()
+        if unit_depth:
+            unit_depth = 0
+            yield event, element
+        elif local_name(element.tag) in containers:
+            yield event, element
+
+        element.clear()
+        if ancestors:
+            parent = ancestors[-1]
+            if len(parent) and parent[-1] is element:
+                del parent[-1]
+            else:
+                parent.remove(element)
+
+
+JSONPath = Tuple[str, ...]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_UNSTRUCTURED = re.compile(r'[^"\[\]{}]*')
+# What a number, literal or (surrogate pair) escape cut off at the end of the
+# buffer can look like.
+_PARTIAL_NUMBER = re.compile(r"-?\d*(?:\.\d*)?(?:[eE][+-]?\d*)?")
+_PARTIAL_ESCAPE = re.compile(r"u[0-9a-fA-F]{0,4}(?:\\(?:u[0-9a-fA-F]{0,3})?)?")
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+class _JSONCursor:
+    """Buffered view over a text stream that decodes or skips one JSON value at a time."""
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        self._chunks = chunks
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, at_least: int = 1) -> bool:
+        """Append at least ``at_least`` more characters unless the stream is exhausted."""
+
+        if self._eof:
+            return False
+        parts = [self._buffer[self._pos :]]
+        added = 0
+        while added < at_least:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            parts.append(chunk)
+            added += len(chunk)
+        self._buffer = "".join(parts)
+        self._pos = 0
+        return added > 0
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _truncated(self, exc: json.JSONDecodeError) -> bool:
+        """Whether ``exc`` can be explained by the value running past the end of the buffer.
+
+        Anything else is malformed input, which must fail at once rather than
+        pull the rest of the upload into the buffer.
+        """
+
+        tail = self._buffer[exc.pos :]
+        if not tail or exc.msg.startswith("Unterminated string"):
+            return True
+        if exc.msg.startswith("Invalid \\uXXXX escape"):
+            return len(tail) <= 11 and _PARTIAL_ESCAPE.fullmatch(tail) is not None
+        if exc.msg == "Expecting value" and any(literal.startswith(tail) for literal in _LITERALS):
+            return True
+        return len(tail) <= 32 and _PARTIAL_NUMBER.fullmatch(tail) is not None
+
+    def decode(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                # Truncated at the buffer edge: grow geometrically so a large
+                # value is not re-scanned once per chunk.
+                if not self._truncated(exc) or not self._fill(max(len(self._buffer) - self._pos, DEFAULT_CHUNK_SIZE)):
+                    raise
+                continue
+            # A number ending at, or only a partial fraction or exponent away
+            # from, the end of the buffer may continue in the next chunk.
+            if (
+                isinstance(value, (int, float))
+                and len(self._buffer) - end <= 32
+                and _PARTIAL_NUMBER.fullmatch(self._buffer, end)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+    def skip(self) -> None:
+        first = self.peek()
+        if first not in ('"', "[", "{"):
+            self.decode()
+            return
+        depth = 0
+        while True:
+            if self._pos >= len(self._buffer) and not self._fill():
+                raise self._error("Unterminated JSON value")
+            char = self._buffer[self._pos]
+            if char == '"':
+                match = _STRING.match(self._buffer, self._pos)
+                if match is None:
+                    if not self._fill(max(len(self._buffer) - self._pos, DEFAULT_CHUNK_SIZE)):
+                        raise self._error("Unterminated string")
+                    continue
+                self._pos = match.end()
+            elif char in "[{":
+                depth += 1
+                self._pos += 1
+            elif char in "]}":
+                depth -= 1
+                self._pos += 1
+            else:
+                self._pos = _UNSTRUCTURED.match(self._buffer, self._pos).end()
+                continue
+            if depth == 0:
+                return
+
+
+def _walk_json(
+    cursor: _JSONCursor, path: JSONPath, targets: AbstractSet[JSONPath], prefixes: AbstractSet[JSONPath]
+) -> Iterator[Tuple[JSONPath, Any]]:
+    if path in targets:
+        yield path, cursor.decode()
+        return
+    if path not in prefixes:
+        cursor.skip()
+        return
+
+    first = cursor.peek()
+    if first == "{":
+        cursor.expect("{")
+        if cursor.peek() == "}":
+            cursor.expect("}")
+            return
+        while True:
+            if cursor.peek() != '"':
+                raise cursor._error("Expecting property name")
+            key = cursor.decode()
+            cursor.expect(":")
+            yield from _walk_json(cursor, path + (key,), targets, prefixes)
+            if cursor.peek() == ",":
+                cursor.expect(",")
+                continue
+            cursor.expect("}")
+            return
+    elif first == "[":
+        cursor.expect("[")
+        if cursor.peek() == "]":
+            cursor.expect("]")
+            return
+        while True:
+            yield from _walk_json(cursor, path + ("*",), targets, prefixes)
+            if cursor.peek() == ",":
+                cursor.expect(",")
+                continue
+            cursor.expect("]")
+            return
+    else:
+        cursor.skip()
+
+
+def iter_json(
+    source: Source, targets: Collection[JSONPath], *, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[JSONPath, Any]]:
+    """Incrementally walk a JSON document, decoding only the values at ``targets``.
+
+    Paths are tuples of object keys, with ``"*"`` standing for every element of
+    an array, e.g. ``("profiles", "*", "controls", "*")``. Matching values are
+    yielded as ``(path, value)`` in document order; everything else is skipped
+    without being materialized, so memory is bounded by the largest target.
+
+    Raises ``json.JSONDecodeError`` for malformed documents.
+    """
+
+    target_set = {tuple(target) for target in targets}
+    prefixes = {target[:depth] for target in target_set for depth in range(len(target))}
+    cursor = _JSONCursor(iter_text(source, chunk_size=chunk_size))
+    yield from _walk_json(cursor, (), target_set, prefixes)
+    if cursor.peek():
+        raise cursor._error("Extra data")
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "JSONPath",
+    "Source",
+    "iter_chunks",
+    "iter_json",
+    "iter_text",
+    "iter_text_lines",
+    "iter_xml",
+    "local_name",
+    "peek",
+]
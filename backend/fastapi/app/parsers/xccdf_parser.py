@@ -1,9 +1,142 @@
-"""Placeholder XCCDF/ARF parser."""
+"""Streaming parser for XCCDF results and SCAP ARF reports."""
 
-from typing import Any, List
+from __future__ import annotations
 
+import re
+from typing import Iterator, List, Optional
+from xml.etree import ElementTree as ET
 
-def parse_xccdf(document: bytes | str) -> List[Any]:
-    """Stub parser for XCCDF/ARF results."""
+from ..enums import FindingSeverity, FindingStatus
+from .base import ParsedFinding, ParserError
+from .stig import severity_from_label
+from .streaming import DEFAULT_CHUNK_SIZE, Source, iter_xml, local_name
 
-    raise NotImplementedError("XCCDF parsing is pending implementation")
+
+class XCCDFParserError(ParserError):
+    """Raised when the XCCDF/ARF payload cannot be parsed."""
+
+
+# Severities XCCDF allows on top of the checklist labels.
+_XCCDF_SEVERITY_MAP = {
+    "info": FindingSeverity.INFO,
+    "unknown": FindingSeverity.CAT_III,
+}
+
+_RESULT_MAP = {
+    "pass": FindingStatus.NOT_A_FINDING,
+    "fixed": FindingStatus.NOT_A_FINDING,
+    "fail": FindingStatus.OPEN,
+    "notapplicable": FindingStatus.NOT_APPLICABLE,
+    "error": FindingStatus.REVIEW_REQUIRED,
+    "unknown": FindingStatus.REVIEW_REQUIRED,
+    "notchecked": FindingStatus.REVIEW_REQUIRED,
+    "informational": FindingStatus.REVIEW_REQUIRED,
+}
+
+# SCAP content prefixes rule ids with the benchmark's reverse-DNS namespace,
+# e.g. ``xccdf_mil.disa.stig_rule_SV-230221r858734_rule``; CKL files carry the
+# bare ``SV-...`` form, so strip it to keep rule ids comparable across formats.
+_RULE_ID_PREFIX = re.compile(r"^xccdf_[^_]+_rule_")
+
+
+def _namespace(tag: str) -> str:
+    return tag[: tag.rfind("}") + 1]
+
+
+def _finding_from_rule_result(
+    rule_result: ET.Element, asset_id: int | None, host: str | None
+) -> Optional[ParsedFinding]:
+    ns = _namespace(rule_result.tag)
+    result_raw = (rule_result.findtext(f"{ns}result") or "").strip().lower()
+    if result_raw == "notselected":
+        return None
+
+    idref = rule_result.get("idref")
+    if not idref:
+        return None
+    rule_id = _RULE_ID_PREFIX.sub("", idref)
+
+    severity_raw = (rule_result.get("severity") or "unknown").strip().lower()
+    severity = severity_from_label(severity_raw) or _XCCDF_SEVERITY_MAP.get(severity_raw)
+    if not severity:
+        raise XCCDFParserError(f"Unsupported severity '{severity_raw}' for rule '{rule_id}'")
+
+    messages = [message.text.strip() for message in rule_result.findall(f"{ns}message") if message.text]
+    return ParsedFinding(
+        rule_id=rule_id,
+        severity=severity,
+        status=_RESULT_MAP.get(result_raw, FindingStatus.REVIEW_REQUIRED),
+        comments="\n".join(messages) or None,
+        asset_id=asset_id,
+        host=host,
+    )
+
+
+def iter_xccdf(
+    source: Source,
+    *,
+    target: str | None = None,
+    asset_id: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[ParsedFinding]:
+    """Stream findings from the ``rule-result`` elements of an XCCDF TestResult.
+
+    Works on bare XCCDF 1.1/1.2 results and on ARF collections, whose report
+    bodies and OVAL payloads are discarded element by element as they stream
+    past. When ``target`` is given, only the TestResult whose ``target`` or
+    ``target-address`` matches it is used, otherwise the first TestResult is
+    used; parsing stops as soon as the selected TestResult closes.
+    """
+
+    wanted = target.strip().lower() if target else None
+    in_test_result = False
+    selected: bool | None = None
+    host: str | None = None
+    names: List[str] = []
+
+    try:
+        for event, element in iter_xml(
+            source,
+            units={"rule-result", "target", "target-address"},
+            containers={"TestResult"},
+            chunk_size=chunk_size,
+        ):
+            name = local_name(element.tag)
+            if name == "TestResult":
+                if event == "start":
+                    in_test_result, selected, host, names = True, None, None, []
+                    continue
+                in_test_result = False
+                if selected:
+                    return
+                continue
+
+            if not in_test_result:
+                continue
+
+            if name in ("target", "target-address"):
+                value = (element.text or "").strip()
+                if value:
+                    names.append(value.lower())
+                    host = host or value
+                continue
+
+            if selected is None:
+                selected = wanted is None or wanted in names
+            if not selected:
+                continue
+
+            finding = _finding_from_rule_result(element, asset_id, host)
+            if finding is not None:
+                yield finding
+    except ET.ParseError as exc:
+        raise XCCDFParserError("Invalid XCCDF XML payload") from exc
+
+
+def parse_xccdf(document: Source, *, target: str | None = None, asset_id: int | None = None) -> List[ParsedFinding]:
+    """Parse XCCDF/ARF results into normalized findings."""
+
+    return list(iter_xccdf(document, target=target, asset_id=asset_id))
+
+
+__all__ = ["XCCDFParserError", "iter_xccdf", "parse_xccdf"]
@@ -57,6 +57,39 @@ class AssessmentRead(BaseModel):
         orm_mode = True
 
 
+class AssessmentRunStatus(AssessmentRead):
+    progress: Optional[float] = Field(
+        None, ge=0, le=1, description="Estimated fraction of the run done; unknown while running without history."
+    )
+    error: Optional[str] = None
+
+
+class FleetRunRequest(BaseModel):
+    profile_id: int
+    asset_ids: Optional[List[int]] = None
+    platform: Optional[str] = None
+    owner: Optional[str] = None
+    connection: dict = Field(
+        default_factory=dict, description="Runner parameters shared by every asset; each asset's address is its host."
+    )
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Assets assessed at once; capped by the server.")
+    subnet_rate_per_minute: Optional[int] = Field(None, ge=1, description="Runs started per subnet per minute.")
+
+
+class FleetRunStatus(BaseModel):
+    id: int
+    profile_id: int
+    status: AssessmentStatus
+    total: int
+    completed: int
+    failed: int
+    pending: int
+    max_concurrency: int
+    subnet_rate_per_minute: Optional[int]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+
+
 class FindingBase(BaseModel):
     rule_id: str
     severity: FindingSeverity
@@ -65,18 +98,91 @@ class FindingBase(BaseModel):
     asset_id: int
 
 
+class BulkExportRequest(BaseModel):
+    asset_ids: List[int] = Field(
+        ..., description="Assets to export; each gets the checklist of its latest completed assessment."
+    )
+
+
 class FindingRead(FindingBase):
     id: int
+    assessment_id: int
+    waived: bool = False
+    updated_at: datetime
 
     class Config:
         orm_mode = True
 
 
+class FindingPage(BaseModel):
+    items: List[FindingRead]
+    next_cursor: Optional[str] = Field(None, description="Pass as ``cursor`` to fetch the next page; null on the last page.")
+
+
+class WaiverCreate(BaseModel):
+    approved_by: str
+    justification: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+
+class WaiverRead(WaiverCreate):
+    finding_id: int
+
+
+class PostureGroup(BaseModel):
+    key: str
+    total: int
+    waived: int
+    by_severity: dict[str, dict[str, int]] = Field(..., description="Finding counts by severity, then status.")
+
+
+class FindingSummary(BaseModel):
+    group_by: str
+    latest_only: bool
+    groups: List[PostureGroup]
+
+
 class CKLUploadResponse(BaseModel):
     count: int
     findings: List[FindingBase]
 
 
+class UploadResponse(BaseModel):
+    count: int
+    format: str
+    findings: List[FindingBase]
+
+
+class ArchiveAssetFindings(BaseModel):
+    asset: str
+    count: int
+    findings: List[FindingBase]
+
+
+class ArchiveFileError(BaseModel):
+    file: str
+    detail: str
+
+
+class ArchiveUploadResponse(BaseModel):
+    files: int
+    assets: List[ArchiveAssetFindings]
+    errors: List[ArchiveFileError]
+
+
+class UploadJobAccepted(BaseModel):
+    job_id: str
+    state: str
+
+
+class UploadJobStatus(BaseModel):
+    job_id: str
+    state: str
+    parsed: int = 0
+    count: Optional[int] = None
+    error: Optional[str] = None
+
+
 class DeltaFinding(BaseModel):
     rule_id: str
     severity: FindingSeverity
@@ -96,3 +202,23 @@ class DeltaSummary(BaseModel):
 class DeltaReport(BaseModel):
     findings: List[DeltaFinding]
     summary: DeltaSummary
+
+
+class FleetDeltaRequest(BaseModel):
+    assessment_ids: Optional[List[int]] = Field(None, description="Assessments to compare baseline-to-post.")
+    window_start: Optional[datetime] = Field(None, description="Per asset, the last assessment before this is the baseline.")
+    window_end: Optional[datetime] = Field(None, description="Per asset, the last assessment up to this is the post report.")
+    max_assets_per_rule: int = 50
+
+
+class FleetRuleRegression(BaseModel):
+    rule_id: str
+    severity: FindingSeverity
+    host_count: int
+    asset_ids: List[int]
+
+
+class FleetDeltaReport(BaseModel):
+    comparisons: int
+    regressions: List[FleetRuleRegression]
+    summary: DeltaSummary
@@ -0,0 +1,273 @@
+"""Parallel ingestion of CKL bundles delivered as zip or tar archives."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import tarfile
+import threading
+import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import IO, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..config import get_settings
+from ..parsers import ParsedFinding, ParserError, get_parser
+
+logger = logging.getLogger(__name__)
+
+_CKL_SUFFIX = ".ckl"
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class ArchiveError(ValueError):
+    """Raised when an upload is neither a readable zip nor tar archive."""
+
+
+@dataclass(frozen=True)
+class ArchiveMemberError:
+    file: str
+    detail: str
+
+
+@dataclass
+class ArchiveIngestResult:
+    """Findings merged per asset plus a per-file error report."""
+
+    files: int = 0
+    assets: Dict[str, List[ParsedFinding]] = field(default_factory=dict)
+    errors: List[ArchiveMemberError] = field(default_factory=list)
+
+
+def parse_workers() -> int:
+    return get_settings().archive_parse_workers or os.cpu_count() or 1
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Return the process pool shared by parse-heavy work (archives, fleet deltas) in this process.
+
+    Callers run on the request threadpool, so the pool is created under a lock;
+    a pool that broke (a worker died) is replaced once it has been discarded
+    with :func:`discard_parse_executor`.
+    """
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned children only import the parser modules, and avoid forking a
+            # multi-threaded server process.
+            _executor = ProcessPoolExecutor(
+                max_workers=parse_workers(), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def discard_parse_executor(executor: Executor) -> None:
+    """Drop ``executor`` if it is the shared pool, so the next caller gets a fresh one.
+
+    Called after :class:`BrokenProcessPool`: a pool whose worker died rejects
+    all further work. Executors supplied by callers are left alone.
+    """
+
+    global _executor
+    with _executor_lock:
+        if executor is not _executor:
+            return
+        _executor = None
+    logger.warning("Parse process pool broke; starting a new one")
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+# What a damaged member raises while being decompressed or read.
+_MEMBER_READ_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, tarfile.TarError, NotImplementedError)
+
+
+def _read_error(exc: BaseException) -> str:
+    return f"Unreadable archive member: {exc or type(exc).__name__}"
+
+
+def iter_archive_members(stream: IO[bytes]) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """Yield ``(name, payload, error)`` for each regular file in a zip or tar archive.
+
+    Members are read one at a time; the payload is ``None`` for files that are
+    not checklists so callers can report them without reading their content,
+    and for members that could not be read, whose ``error`` says why. A zip
+    keeps going past a damaged member; a damaged tar stream cannot be read
+    beyond it, so the rest of the archive is reported as one error.
+    """
+
+    if zipfile.is_zipfile(stream):
+        stream.seek(0)
+        with zipfile.ZipFile(stream) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                if not info.filename.lower().endswith(_CKL_SUFFIX):
+                    yield info.filename, None, None
+                    continue
+                try:
+                    payload = archive.read(info)
+                except _MEMBER_READ_ERRORS as exc:
+                    yield info.filename, None, _read_error(exc)
+                    continue
+                yield info.filename, payload, None
+        return
+
+    stream.seek(0)
+    try:
+        archive = tarfile.open(fileobj=stream, mode="r|*")
+    except tarfile.ReadError as exc:
+        raise ArchiveError("Upload is not a zip or tar archive") from exc
+    with archive:
+        members = iter(archive)
+        started = False
+        while True:
+            member = None
+            try:
+                member = next(members, None)
+                if member is None:
+                    return
+                started = True
+                if not member.isfile():
+                    continue
+                payload = None
+                if member.name.lower().endswith(_CKL_SUFFIX):
+                    extracted = archive.extractfile(member)
+                    payload = extracted.read() if extracted else b""
+            except _MEMBER_READ_ERRORS as exc:
+                if not started and isinstance(exc, tarfile.ReadError):
+                    raise ArchiveError("Upload is not a zip or tar archive") from exc
+                name = member.name if member is not None else "(archive)"
+                yield name, None, f"{_read_error(exc)}; the rest of the archive was not read"
+                return
+            yield member.name, payload, None
+
+
+def _parse_member(name: str, payload: bytes, asset_id: int | None) -> Tuple[str, List[ParsedFinding]]:
+    findings = list(get_parser("ckl")(payload, asset_id=asset_id))
+    host = next((finding.host for finding in findings if finding.host), None)
+    return host or PurePosixPath(name).stem, findings
+
+
+_Member = Tuple[str, bytes]
+
+
+def _merge(result: ArchiveIngestResult, name: str, future: Future) -> bool:
+    """Merge a finished member into ``result``; ``False`` if the pool broke under it."""
+
+    try:
+        asset, findings = future.result()
+    except BrokenProcessPool:
+        return False
+    except ParserError as exc:
+        result.errors.append(ArchiveMemberError(file=name, detail=str(exc)))
+    except Exception as exc:
+        logger.exception("Checklist parse failed", extra={"file": name})
+        result.errors.append(ArchiveMemberError(file=name, detail=f"Checklist could not be parsed: {exc}"))
+    else:
+        result.assets.setdefault(asset, []).extend(findings)
+    return True
+
+
+def _collect(result: ArchiveIngestResult, futures: Dict[Future, _Member], done: Set[Future]) -> List[_Member]:
+    """Merge the ``done`` members and return those lost to a broken pool."""
+
+    lost: List[_Member] = []
+    for future in done:
+        member = futures.pop(future)
+        if not _merge(result, member[0], future):
+            lost.append(member)
+    return lost
+
+
+def _recover(
+    result: ArchiveIngestResult,
+    futures: Dict[Future, _Member],
+    lost: List[_Member],
+    executor: Executor,
+    asset_id: int | None,
+) -> Executor:
+    """Replace a broken pool and re-run the members it took down, one at a time.
+
+    Every member in flight fails with the pool, and nothing says which one
+    killed the worker, so each is retried alone on a fresh pool: the rest
+    parse normally and only a member that breaks the pool again is reported.
+    """
+
+    lost = lost + _collect(result, futures, set(futures))
+    broken = True
+    for name, payload in lost:
+        if broken:
+            discard_parse_executor(executor)
+            executor = get_parse_executor()
+        try:
+            future = executor.submit(_parse_member, name, payload, asset_id)
+            broken = not _merge(result, name, future)
+        except BrokenProcessPool:
+            broken = True
+        if broken:
+            result.errors.append(ArchiveMemberError(file=name, detail="Parser process crashed on this checklist"))
+    if broken:
+        discard_parse_executor(executor)
+        executor = get_parse_executor()
+    return executor
+
+
+def ingest_archive(
+    stream: IO[bytes],
+    *,
+    asset_id: int | None = None,
+    executor: Executor | None = None,
+    max_in_flight: int | None = None,
+) -> ArchiveIngestResult:
+    """Parse every checklist in an archive on a process pool and merge per asset.
+
+    Members are streamed out of the archive and submitted as they are read, with
+    at most ``max_in_flight`` payloads queued so memory stays bounded on large
+    bundles. A checklist that fails to parse, or even crashes its worker
+    process, is recorded in ``errors`` and does not abort the rest of the
+    archive; a broken pool is replaced and the members it held are retried.
+    """
+
+    executor = executor or get_parse_executor()
+    max_in_flight = max_in_flight or 2 * parse_workers()
+    result = ArchiveIngestResult()
+    futures: Dict[Future, _Member] = {}
+
+    for name, payload, error in iter_archive_members(stream):
+        result.files += 1
+        if payload is None:
+            result.errors.append(ArchiveMemberError(file=name, detail=error or "Unsupported file type"))
+            continue
+        try:
+            futures[executor.submit(_parse_member, name, payload, asset_id)] = (name, payload)
+        except BrokenProcessPool:
+            executor = _recover(result, futures, [(name, payload)], executor, asset_id)
+            continue
+        if len(futures) >= max_in_flight:
+            done, _pending = wait(futures, return_when=FIRST_COMPLETED)
+            lost = _collect(result, futures, done)
+            if lost:
+                executor = _recover(result, futures, lost, executor, asset_id)
+
+    lost = _collect(result, futures, set(futures))
+    if lost:
+        _recover(result, futures, lost, executor, asset_id)
+    return result
+
+
+__all__ = [
+    "ArchiveError",
+    "ArchiveIngestResult",
+    "ArchiveMemberError",
+    "discard_parse_executor",
+    "get_parse_executor",
+    "ingest_archive",
+    "iter_archive_members",
+]
@@ -0,0 +1,180 @@
+"""Execution of queued assessment runs on the Celery workers."""
+
+from __future__ import annotations
+
+import logging
+from contextlib import AbstractContextManager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Mapping, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..enums import AssessmentStatus
+from ..models import Assessment
+from ..runners.inspec_runner import run_inspec_profile
+from .assessment_store import AssessmentStore, get_assessment_store
+
+logger = logging.getLogger(__name__)
+
+# Connection parameters forwarded to the worker; credentials stay in Vault.
+RUNNER_TARGET_KEYS = ("host", "user", "port", "protocol")
+
+# Placeholder scan reports recorded until the runner returns real ones.
+SAMPLE_BASELINE = {
+    "profiles": [
+        {
+            "name": "sample",
+            "controls": [
+                {"id": "V-12345", "impact": 0.9, "results": [{"status": "failed"}]},
+                {"id": "V-67890", "impact": 0.5, "results": [{"status": "passed"}]},
+            ],
+        }
+    ]
+}
+
+SAMPLE_POST = {
+    "profiles": [
+        {
+            "name": "sample",
+            "controls": [
+                {"id": "V-12345", "impact": 0.9, "results": [{"status": "passed"}]},
+                {"id": "V-67890", "impact": 0.5, "results": [{"status": "passed"}]},
+                {"id": "V-54321", "impact": 0.3, "results": [{"status": "skipped"}]},
+            ],
+        }
+    ]
+}
+
+
+class AssessmentNotFound(LookupError):
+    """Raised when a queued run refers to an assessment that no longer exists."""
+
+
+def runner_target(connection: Mapping) -> Dict:
+    """Return the subset of a run request's connection that is sent to the worker."""
+
+    return {key: connection[key] for key in RUNNER_TARGET_KEYS if connection.get(key) is not None}
+
+
+def run_error(reports: Mapping[str, dict]) -> Optional[str]:
+    """Return the failure recorded in an assessment's result report, if any."""
+
+    result = reports.get("result") or {}
+    return result.get("error") if result.get("status") == "failed" else None
+
+
+def expected_run_seconds(session: Session, profile_id: int, *, sample: int = 20) -> Optional[float]:
+    """Return the mean duration of the profile's last ``sample`` completed runs, if any."""
+
+    recent = (
+        select((func.extract("epoch", Assessment.completed_at) - func.extract("epoch", Assessment.started_at)).label("seconds"))
+        .where(
+            Assessment.profile_id == profile_id,
+            Assessment.status == AssessmentStatus.COMPLETED,
+            Assessment.started_at.is_not(None),
+            Assessment.completed_at.is_not(None),
+        )
+        .order_by(Assessment.completed_at.desc())
+        .limit(sample)
+        .subquery()
+    )
+    seconds = session.execute(select(func.avg(recent.c.seconds))).scalar_one()
+    return float(seconds) if seconds is not None else None
+
+
+def run_progress(
+    status: AssessmentStatus,
+    started_at: Optional[datetime],
+    expected_seconds: Optional[float],
+    *,
+    now: Optional[datetime] = None,
+) -> Optional[float]:
+    """Estimate how far through its run an assessment is, from 0.0 to 1.0.
+
+    InSpec reports nothing until a run ends, so a running assessment's
+    progress is its elapsed time against the profile's recent run durations,
+    held below 1.0 until it finishes; it is unknown without that history.
+    """
+
+    if status in (AssessmentStatus.COMPLETED, AssessmentStatus.FAILED):
+        return 1.0
+    if status is not AssessmentStatus.RUNNING:
+        return 0.0
+    if started_at is None or not expected_seconds:
+        return None
+    elapsed = ((now or datetime.now(timezone.utc)) - started_at).total_seconds()
+    return round(min(max(elapsed / expected_seconds, 0.0), 0.99), 2)
+
+
+def execute_assessment(
+    assessment_id: int,
+    target: Mapping,
+    *,
+    runner: Callable[..., Dict] = run_inspec_profile,
+    store: Optional[AssessmentStore] = None,
+    session_scope: Optional[Callable[[], AbstractContextManager[Session]]] = None,
+) -> AssessmentStatus:
+    """Run a queued assessment, recording RUNNING and then COMPLETED or FAILED.
+
+    Each state change commits on its own, so status polls see the run start
+    and finish. A failed run records the error in its ``result`` report and
+    re-raises it.
+    """
+
+    if session_scope is None:
+        from ..database import get_db as session_scope
+    store = store or get_assessment_store()
+
+    with session_scope() as session:
+        assessment = session.get(Assessment, assessment_id)
+        if assessment is None:
+            raise AssessmentNotFound(f"Assessment {assessment_id} not found")
+        # Late acknowledgement can redeliver a run that already finished.
+        if assessment.status in (AssessmentStatus.COMPLETED, AssessmentStatus.FAILED):
+            return assessment.status
+        profile_id = assessment.profile_id
+        store.update(session, assessment_id, status=AssessmentStatus.RUNNING, started_at=datetime.now(timezone.utc))
+
+    try:
+        result = runner(
+            str(profile_id),
+            host=target.get("host", "localhost"),
+            user=target.get("user", "root"),
+            port=target.get("port"),
+            protocol=target.get("protocol", "ssh"),
+        )
+    except Exception as exc:
+        logger.exception("Assessment run failed", extra={"assessment_id": assessment_id})
+        with session_scope() as session:
+            store.update(
+                session,
+                assessment_id,
+                status=AssessmentStatus.FAILED,
+                completed_at=datetime.now(timezone.utc),
+                reports={"result": {"status": "failed", "error": str(exc) or type(exc).__name__}},
+            )
+        raise
+
+    with session_scope() as session:
+        store.update(
+            session,
+            assessment_id,
+            status=AssessmentStatus.COMPLETED,
+            completed_at=datetime.now(timezone.utc),
+            reports={"baseline": SAMPLE_BASELINE, "post": SAMPLE_POST, "result": result},
+        )
+    return AssessmentStatus.COMPLETED
+
+
+__all__ = [
+    "RUNNER_TARGET_KEYS",
+    "SAMPLE_BASELINE",
+    "SAMPLE_POST",
+    "AssessmentNotFound",
+    "execute_assessment",
+    "expected_run_seconds",
+    "run_error",
+    "run_progress",
+    "runner_target",
+]
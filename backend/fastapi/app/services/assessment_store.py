@@ -0,0 +1,424 @@
+"""Persistent assessment records behind a per-process read-through cache."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import redis
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.orm import Session
+
+from ..caching import BoundedLRU
+from ..config import get_settings
+from ..enums import AssessmentStatus
+from ..models import Assessment, AssessmentReport
+from .cache_service import digest_report, get_report_cache
+
+logger = logging.getLogger(__name__)
+
+REPORT_KINDS = ("baseline", "post", "result")
+
+INVALIDATION_CHANNEL = "aegis:assessments:invalidated"
+
+# Decoded JSON takes several times its encoded size as Python objects.
+_DECODED_EXPANSION = 4
+_RECORD_OVERHEAD_BYTES = 512
+
+_PENDING_INVALIDATIONS = "aegis.assessment_store.pending"
+
+# Only settled assessments are cached: queued and running ones are about to
+# change on a worker, and status polls must see that even without Redis.
+_SETTLED = (AssessmentStatus.COMPLETED, AssessmentStatus.FAILED)
+
+
+@dataclass(frozen=True)
+class AssessmentRecord:
+    """An assessment with its raw reports decoded, as cached per process."""
+
+    id: int
+    asset_id: int
+    profile_id: int
+    status: AssessmentStatus
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    reports: Mapping[str, dict]
+    size_bytes: int = 0
+
+
+def report_key(assessment_id: int, kind: str) -> str:
+    """Return the normalized report cache key of one of an assessment's reports."""
+
+    return f"assessment:{assessment_id}:{kind}"
+
+
+def _record_weight(record: AssessmentRecord) -> int:
+    return record.size_bytes * _DECODED_EXPANSION + _RECORD_OVERHEAD_BYTES
+
+
+def _encode_report(report: dict) -> bytes:
+    return json.dumps(report, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+class FileReportStorage:
+    """Content-addressed report blobs in a directory shared by the API and workers.
+
+    Blobs are gzip-compressed canonical JSON named by their SHA-256, so a
+    report shared by many assessments is stored once, and each blob is
+    written to a temporary name and renamed into place.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root)
+
+    def put(self, digest: str, payload: bytes) -> str:
+        path = self._root / digest[:2] / f"{digest}.json.gz"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.part")
+            partial.write_bytes(gzip.compress(payload, compresslevel=6))
+            os.replace(partial, path)
+        return path.as_uri()
+
+    def get(self, uri: str) -> bytes:
+        parsed = urlparse(uri)
+        if parsed.scheme != "file":
+            raise ValueError(f"Unsupported report storage URI '{uri}'")
+        return gzip.decompress(Path(url2pathname(parsed.path)).read_bytes())
+
+
+class AssessmentStore:
+    """Assessments persisted through ``models.Assessment`` behind a per-process LRU.
+
+    Reads go through a byte-bounded LRU, so hot lookups such as repeated
+    deltas cost no database round trip. Writers mark the assessments they
+    change with :meth:`invalidate`; once the transaction commits, the entries
+    are dropped locally and announced on a Redis channel that every worker
+    listens to. While a worker is not subscribed it cannot hear invalidations,
+    so it bypasses its cache until the subscription is back.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        storage: FileReportStorage,
+        inline_max_bytes: int,
+        redis_client: Any = None,
+        on_invalidate: Optional[Callable[[int], None]] = None,
+        retry_seconds: float = 1.0,
+    ) -> None:
+        self._memory: BoundedLRU[int, AssessmentRecord] = BoundedLRU(max_bytes, weigher=_record_weight)
+        self._storage = storage
+        self._inline_max_bytes = inline_max_bytes
+        self._redis = redis_client
+        self._on_invalidate = on_invalidate
+        self._retry_seconds = retry_seconds
+        # Advanced on every invalidation; a load that raced one is not cached.
+        self._generations = count(1)
+        self._generation = 0
+        self._subscribed = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+        self.invalidations = 0
+
+    def create(
+        self,
+        session: Session,
+        *,
+        asset_id: int,
+        profile_id: int,
+        status: AssessmentStatus = AssessmentStatus.DRAFT,
+        started_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None,
+        reports: Optional[Mapping[str, dict]] = None,
+    ) -> AssessmentRecord:
+        """Add an assessment and its reports to ``session`` and flush it to obtain an id."""
+
+        assessment = Assessment(
+            asset_id=asset_id,
+            profile_id=profile_id,
+            status=status,
+            started_at=started_at,
+            completed_at=completed_at,
+        )
+        rows = [self._report_row(kind, report) for kind, report in (reports or {}).items()]
+        assessment.reports.extend(rows)
+        session.add(assessment)
+        session.flush()
+        return AssessmentRecord(
+            id=assessment.id,
+            asset_id=asset_id,
+            profile_id=profile_id,
+            status=status,
+            started_at=started_at,
+            completed_at=completed_at,
+            reports=dict(reports or {}),
+            size_bytes=sum(row.size_bytes for row in rows),
+        )
+
+    def update(
+        self,
+        session: Session,
+        assessment_id: int,
+        *,
+        status: Optional[AssessmentStatus] = None,
+        started_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None,
+        reports: Optional[Mapping[str, dict]] = None,
+    ) -> bool:
+        """Change an assessment's state and replace the given reports; ``False`` if it does not exist."""
+
+        assessment = session.get(Assessment, assessment_id)
+        if assessment is None:
+            return False
+        if status is not None:
+            assessment.status = status
+        if started_at is not None:
+            assessment.started_at = started_at
+        if completed_at is not None:
+            assessment.completed_at = completed_at
+        for kind, report in (reports or {}).items():
+            row = self._report_row(kind, report)
+            row.assessment_id = assessment_id
+            session.merge(row)
+        session.flush()
+        self.invalidate(session, [assessment_id])
+        return True
+
+    def get(self, session: Session, assessment_id: int) -> Optional[AssessmentRecord]:
+        return self.get_many(session, [assessment_id]).get(assessment_id)
+
+    def get_many(self, session: Session, assessment_ids: Iterable[int]) -> Dict[int, AssessmentRecord]:
+        """Return the records of ``assessment_ids`` that exist, loading cache misses in one query."""
+
+        self._ensure_listener()
+        use_cache = self._redis is None or self._subscribed.is_set()
+        records: Dict[int, AssessmentRecord] = {}
+        missing: List[int] = []
+        for assessment_id in dict.fromkeys(assessment_ids):
+            record = self._memory.get(assessment_id) if use_cache else None
+            if record is None:
+                missing.append(assessment_id)
+            else:
+                records[assessment_id] = record
+        if missing:
+            generation = self._generation
+            loaded = self._load(session, missing)
+            records.update(loaded)
+            if use_cache and generation == self._generation:
+                for assessment_id, record in loaded.items():
+                    if record.status in _SETTLED:
+                        self._memory.put(assessment_id, record)
+        return records
+
+    def window_pairs(self, session: Session, start: datetime, end: datetime) -> List[Tuple[int, int, int]]:
+        """Return ``(asset_id, baseline_id, post_id)`` for assets assessed on both sides of ``start``.
+
+        The baseline is each asset's last assessment completed by ``start``
+        and the post its last one completed after ``start`` up to ``end``;
+        only assessments holding a post report are considered.
+        """
+
+        before = Assessment.completed_at <= start
+        ranked = (
+            select(
+                Assessment.id,
+                Assessment.asset_id,
+                before.label("before"),
+                func.row_number()
+                .over(
+                    partition_by=(Assessment.asset_id, before),
+                    order_by=(Assessment.completed_at.desc(), Assessment.id.desc()),
+                )
+                .label("position"),
+            )
+            .join(
+                AssessmentReport,
+                and_(AssessmentReport.assessment_id == Assessment.id, AssessmentReport.kind == "post"),
+            )
+            .where(Assessment.completed_at <= end)
+            .subquery()
+        )
+        baselines: Dict[int, int] = {}
+        posts: Dict[int, int] = {}
+        statement = select(ranked.c.asset_id, ranked.c.before, ranked.c.id).where(ranked.c.position == 1)
+        for asset_id, is_before, assessment_id in session.execute(statement):
+            (baselines if is_before else posts)[asset_id] = assessment_id
+        return [
+            (asset_id, baselines[asset_id], post_id)
+            for asset_id, post_id in sorted(posts.items())
+            if asset_id in baselines
+        ]
+
+    def invalidate(self, session: Session, assessment_ids: Iterable[int]) -> None:
+        """Drop ``assessment_ids`` from this worker now and from every worker once ``session`` commits.
+
+        Dropping again after the commit discards anything a concurrent read
+        cached from the previous state in the meantime.
+        """
+
+        ids = set(assessment_ids)
+        session.info.setdefault(_PENDING_INVALIDATIONS, {}).setdefault(self, set()).update(ids)
+        self._drop(ids)
+
+    def publish(self, assessment_ids: Set[int]) -> None:
+        self._drop(assessment_ids)
+        if self._redis is not None and assessment_ids:
+            try:
+                self._redis.publish(INVALIDATION_CHANNEL, ",".join(map(str, sorted(assessment_ids))))
+            except Exception:  # pragma: no cover - workers fall back to bypassing their caches
+                logger.warning("Failed to publish assessment cache invalidation", exc_info=True)
+
+    def clear(self) -> None:
+        self._generation = next(self._generations)
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        stats = self._memory.stats().as_dict()
+        stats["redis_enabled"] = self._redis is not None
+        stats["subscribed"] = self._subscribed.is_set()
+        stats["invalidations"] = self.invalidations
+        return stats
+
+    def _report_row(self, kind: str, report: dict) -> AssessmentReport:
+        payload = _encode_report(report)
+        digest = digest_report(payload)
+        # Both columns are always set, so merging over a stored report clears the other.
+        if len(payload) <= self._inline_max_bytes:
+            content, storage_uri = report, None
+        else:
+            content, storage_uri = None, self._storage.put(digest, payload)
+        return AssessmentReport(
+            kind=kind, digest=digest, size_bytes=len(payload), content=content, storage_uri=storage_uri
+        )
+
+    def _load(self, session: Session, assessment_ids: Sequence[int]) -> Dict[int, AssessmentRecord]:
+        reports: Dict[int, Dict[str, dict]] = {}
+        sizes: Dict[int, int] = {}
+        statement = select(
+            AssessmentReport.assessment_id,
+            AssessmentReport.kind,
+            AssessmentReport.size_bytes,
+            AssessmentReport.content,
+            AssessmentReport.storage_uri,
+        ).where(AssessmentReport.assessment_id.in_(assessment_ids))
+        for assessment_id, kind, size_bytes, content, storage_uri in session.execute(statement):
+            if content is None and storage_uri is not None:
+                content = json.loads(self._storage.get(storage_uri))
+            reports.setdefault(assessment_id, {})[kind] = content
+            sizes[assessment_id] = sizes.get(assessment_id, 0) + size_bytes
+
+        statement = select(
+            Assessment.id,
+            Assessment.asset_id,
+            Assessment.profile_id,
+            Assessment.status,
+            Assessment.started_at,
+            Assessment.completed_at,
+        ).where(Assessment.id.in_(assessment_ids))
+        return {
+            row.id: AssessmentRecord(
+                **row._mapping, reports=reports.get(row.id, {}), size_bytes=sizes.get(row.id, 0)
+            )
+            for row in session.execute(statement)
+        }
+
+    def _drop(self, assessment_ids: Iterable[int]) -> None:
+        self._generation = next(self._generations)
+        for assessment_id in assessment_ids:
+            self.invalidations += 1
+            self._memory.invalidate(assessment_id)
+            if self._on_invalidate is not None:
+                self._on_invalidate(assessment_id)
+
+    def _ensure_listener(self) -> None:
+        if self._redis is None or self._listener is not None:
+            return
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="assessment-cache-invalidation", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Invalidations published while unsubscribed were missed.
+                self.clear()
+                self._subscribed.set()
+                for message in pubsub.listen():
+                    self._handle_message(message)
+            except Exception:  # pragma: no cover - retried until Redis is reachable
+                logger.warning("Assessment cache invalidation listener disconnected", exc_info=True)
+            finally:
+                self._subscribed.clear()
+                if pubsub is not None:
+                    pubsub.close()
+            time.sleep(self._retry_seconds)
+
+    def _handle_message(self, message: dict) -> None:
+        data = message.get("data")
+        if isinstance(data, bytes):
+            data = data.decode("ascii")
+        if data:
+            self._drop(int(assessment_id) for assessment_id in data.split(","))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_invalidations(session: Session) -> None:
+    for store, assessment_ids in session.info.pop(_PENDING_INVALIDATIONS, {}).items():
+        store.publish(assessment_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+@lru_cache()
+def get_assessment_store() -> AssessmentStore:
+    """Return the process-wide assessment store configured from settings."""
+
+    settings = get_settings()
+    report_cache = get_report_cache()
+
+    def _drop_normalized_reports(assessment_id: int) -> None:
+        for kind in REPORT_KINDS:
+            report_cache.invalidate(report_key(assessment_id, kind))
+
+    redis_url = settings.assessment_cache_redis_url
+    return AssessmentStore(
+        settings.assessment_cache_max_bytes,
+        storage=FileReportStorage(settings.report_storage_dir),
+        inline_max_bytes=settings.report_inline_max_bytes,
+        redis_client=redis.Redis.from_url(redis_url) if redis_url else None,
+        on_invalidate=_drop_normalized_reports,
+    )
+
+
+__all__ = [
+    "INVALIDATION_CHANNEL",
+    "REPORT_KINDS",
+    "AssessmentRecord",
+    "AssessmentStore",
+    "FileReportStorage",
+    "get_assessment_store",
+    "report_key",
+]
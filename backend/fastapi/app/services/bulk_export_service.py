@@ -0,0 +1,162 @@
+"""Bulk export of one checklist per asset as a streamed zip archive."""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..enums import AssessmentStatus
+from ..models import Assessment, Asset, Finding
+from .archive_service import discard_parse_executor, get_parse_executor, parse_workers
+from .export_service import ExportRow, stream_ckl
+
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class _ZipSink:
+    """Write-only file object collecting zip output until it is drained.
+
+    It has no ``tell``/``seek``, so :class:`zipfile.ZipFile` writes data
+    descriptors instead of seeking back to patch local headers.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def member_name(asset_name: str) -> str:
+    """Return the archive member name for an asset's checklist."""
+
+    return f"{_UNSAFE_NAME.sub('_', asset_name).strip('._') or 'asset'}.ckl"
+
+
+def render_ckl(asset_name: str, rows: Sequence[ExportRow]) -> bytes:
+    """Render one asset's checklist; runs on the worker pool."""
+
+    return b"".join(stream_ckl(map(ExportRow._make, rows), asset_name))
+
+
+def iter_asset_rows(session: Session, asset_ids: Sequence[int]) -> Iterator[Tuple[str, List[ExportRow]]]:
+    """Yield ``(hostname, rows)`` from each asset's latest completed assessment, one asset at a time.
+
+    Findings are streamed from a single query ordered by asset, so only the
+    asset currently being grouped is held in memory. Assets without a
+    completed assessment are skipped.
+    """
+
+    latest = (
+        select(func.max(Assessment.id))
+        .where(Assessment.asset_id.in_(asset_ids), Assessment.status == AssessmentStatus.COMPLETED)
+        .group_by(Assessment.asset_id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(Asset.hostname, Finding.rule_id, Finding.severity, Finding.status, Finding.comments)
+        .join(Asset, Asset.id == Finding.asset_id)
+        .where(Finding.assessment_id.in_(latest))
+        .order_by(Finding.asset_id, Finding.rule_id)
+        .execution_options(yield_per=5000)
+    )
+    for hostname, rows in groupby(session.execute(statement), key=itemgetter(0)):
+        yield hostname, [ExportRow._make(row[1:]) for row in rows]
+
+
+def stream_ckl_zip(
+    assets: Iterable[Tuple[str, Sequence[ExportRow]]],
+    *,
+    executor: Executor | None = None,
+    max_in_flight: int | None = None,
+    compresslevel: int = 1,
+) -> Iterator[bytes]:
+    """Yield a zip archive holding one CKL per asset as checklists finish rendering.
+
+    Checklists render on ``executor`` (the shared parse pool by default) with
+    at most ``max_in_flight`` outstanding, and each finished one is compressed
+    into the archive and flushed to the caller straight away. Neither the
+    archive nor more than ``max_in_flight`` checklists are ever held in memory,
+    and nothing is staged on disk. Members appear in completion order.
+
+    Compression runs on the calling thread, so it defaults to the fastest
+    level to keep up with the pool; checklist XML still shrinks many-fold.
+    """
+
+    executor = executor or get_parse_executor()
+    max_in_flight = max_in_flight or 2 * parse_workers()
+    sink = _ZipSink()
+    try:
+        yield from _render_zip(sink, assets, executor, max_in_flight, compresslevel)
+    except BrokenProcessPool:
+        # This export is lost, but later ones get a working pool.
+        discard_parse_executor(executor)
+        raise
+    yield sink.drain()
+
+
+def _render_zip(
+    sink: _ZipSink,
+    assets: Iterable[Tuple[str, Sequence[ExportRow]]],
+    executor: Executor,
+    max_in_flight: int,
+    compresslevel: int,
+) -> Iterator[bytes]:
+    futures: Dict[Future, str] = {}
+    seen: Set[str] = set()
+
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+
+        def _write(done: Set[Future]) -> Iterator[bytes]:
+            for future in done:
+                archive.writestr(futures.pop(future), future.result())
+                yield sink.drain()
+
+        for asset_name, rows in assets:
+            name = member_name(asset_name)
+            # Distinct hostnames can sanitize to the same member name.
+            while name in seen:
+                name = f"{name[:-4]}_.ckl"
+            seen.add(name)
+            futures[executor.submit(render_ckl, asset_name, rows)] = name
+            if len(futures) >= max_in_flight:
+                done, _pending = wait(futures, return_when=FIRST_COMPLETED)
+                yield from _write(done)
+
+        while futures:
+            done, _pending = wait(futures, return_when=FIRST_COMPLETED)
+            yield from _write(done)
+
+
+def stream_bulk_export(asset_ids: Sequence[int], *, executor: Executor | None = None) -> Iterator[bytes]:
+    """Stream the zip of checklists for ``asset_ids`` using its own database session.
+
+    The session lives as long as the stream rather than the request, since
+    a streaming response body outlives the request's dependencies.
+    """
+
+    from ..database import get_db
+
+    with get_db() as session:
+        yield from stream_ckl_zip(iter_asset_rows(session, asset_ids), executor=executor)
+
+
+__all__ = ["ExportRow", "iter_asset_rows", "member_name", "render_ckl", "stream_bulk_export", "stream_ckl_zip"]
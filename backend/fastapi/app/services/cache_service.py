@@ -0,0 +1,290 @@
+"""Content-addressed caches for expensive parse and normalization results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import replace
+from functools import lru_cache
+from typing import IO, Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import redis
+
+from ..caching import BoundedLRU
+from ..config import get_settings
+from ..enums import FindingSeverity, FindingStatus
+from ..parsers.base import ParsedFinding
+from ..parsers.streaming import DEFAULT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+_Rows = Sequence[ParsedFinding]
+
+# Mirrors ``delta_service.CompactReport``: rule ids, severity codes, status ranks.
+_Compact = Tuple[List[str], bytes, bytes]
+
+# Per-rule cost of the list slot and str object header, on top of the id itself.
+_RULE_OVERHEAD_BYTES = 64
+
+
+def digest_stream(stream: IO[bytes], *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """Return the SHA-256 hex digest of ``stream`` and rewind it for parsing."""
+
+    digest = hashlib.sha256()
+    while chunk := stream.read(chunk_size):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def digest_report(report: Union[dict, bytes, str, IO[bytes]]) -> str:
+    """Return the SHA-256 hex digest of a report's content.
+
+    Decoded reports are hashed over their canonical (key-sorted) JSON so that
+    equal reports share a digest regardless of key order.
+    """
+
+    if isinstance(report, dict):
+        payload = json.dumps(report, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    elif isinstance(report, str):
+        payload = report.encode("utf-8")
+    elif isinstance(report, (bytes, bytearray)):
+        payload = bytes(report)
+    else:
+        return digest_stream(report)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _encode(findings: _Rows) -> bytes:
+    rows = [
+        [finding.rule_id, finding.severity.value, finding.status.value, finding.comments, finding.host]
+        for finding in findings
+    ]
+    return json.dumps(rows, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(payload: bytes) -> List[ParsedFinding]:
+    return [
+        ParsedFinding(
+            rule_id=rule_id,
+            severity=FindingSeverity(severity),
+            status=FindingStatus(status),
+            comments=comments,
+            asset_id=None,
+            host=host,
+        )
+        for rule_id, severity, status, comments, host in json.loads(payload)
+    ]
+
+
+class ParseCache:
+    """Cache of parser output keyed by format and payload SHA-256.
+
+    Entries are kept as compact JSON so the in-process LRU can be bounded by
+    total bytes, and the same encoding is shared with the optional Redis tier.
+    Cached findings are stored without an ``asset_id``; it is rebound on read
+    so one payload uploaded for different assets shares a single entry.
+    """
+
+    def __init__(self, max_bytes: int, *, redis_client: Any = None, ttl_seconds: int = 86400) -> None:
+        self._memory: BoundedLRU[str, bytes] = BoundedLRU(max_bytes, weigher=len)
+        self._redis = redis_client
+        self._ttl_seconds = ttl_seconds
+        self.redis_hits = 0
+
+    def get(self, fmt: str, digest: str, *, asset_id: int | None = None) -> Optional[List[ParsedFinding]]:
+        key = f"parse:{fmt}:{digest}"
+        payload = self._memory.get(key)
+        if payload is None and self._redis is not None:
+            payload = self._redis_get(key)
+            if payload is not None:
+                self.redis_hits += 1
+                self._memory.put(key, payload)
+        if payload is None:
+            return None
+        findings = _decode(payload)
+        if asset_id is not None:
+            findings = [replace(finding, asset_id=asset_id) for finding in findings]
+        return findings
+
+    def put(self, fmt: str, digest: str, findings: _Rows) -> None:
+        key = f"parse:{fmt}:{digest}"
+        payload = _encode(findings)
+        self._memory.put(key, payload)
+        if self._redis is not None:
+            try:
+                self._redis.set(key, payload, ex=self._ttl_seconds)
+            except Exception:  # pragma: no cover - the shared tier is best effort
+                logger.warning("Failed to store parse cache entry in Redis", exc_info=True)
+
+    def stats(self) -> dict:
+        stats = self._memory.stats().as_dict()
+        stats["redis_enabled"] = self._redis is not None
+        stats["redis_hits"] = self.redis_hits
+        return stats
+
+    def _redis_get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._redis.get(key)
+        except Exception:  # pragma: no cover - the shared tier is best effort
+            logger.warning("Failed to read parse cache entry from Redis", exc_info=True)
+            return None
+
+
+def _compact_weight(compact: _Compact) -> int:
+    rule_ids, severities, statuses = compact
+    return sum(map(len, rule_ids)) + len(rule_ids) * _RULE_OVERHEAD_BYTES + len(severities) + len(statuses)
+
+
+def _encode_compact(compact: _Compact) -> bytes:
+    rule_ids, severities, statuses = compact
+    return json.dumps([rule_ids, severities.hex(), statuses.hex()], separators=(",", ":")).encode("utf-8")
+
+
+def _decode_compact(payload: bytes) -> _Compact:
+    rule_ids, severities, statuses = json.loads(payload)
+    return rule_ids, bytes.fromhex(severities), bytes.fromhex(statuses)
+
+
+class ReportCache:
+    """Cache of normalized reports in the compact form used by the delta engines.
+
+    Keys are either caller-chosen (e.g. ``assessment:12:baseline``) or report
+    content digests. The in-process LRU holds decoded entries so a hit costs
+    nothing beyond the lookup, bounded by an estimate of their size in bytes;
+    the optional Redis tier persists the encoded form across workers.
+    """
+
+    def __init__(self, max_bytes: int, *, redis_client: Any = None, ttl_seconds: int = 86400) -> None:
+        self._memory: BoundedLRU[str, _Compact] = BoundedLRU(max_bytes, weigher=_compact_weight)
+        self._redis = redis_client
+        self._ttl_seconds = ttl_seconds
+        self.redis_hits = 0
+
+    def get(self, key: str) -> Optional[_Compact]:
+        compact = self._memory.get(key)
+        if compact is None and self._redis is not None:
+            payload = self._redis_call("get", f"report:{key}")
+            if payload is not None:
+                self.redis_hits += 1
+                compact = _decode_compact(payload)
+                self._memory.put(key, compact)
+        return compact
+
+    def put(self, key: str, compact: _Compact) -> None:
+        self._memory.put(key, compact)
+        if self._redis is not None:
+            self._redis_call("set", f"report:{key}", _encode_compact(compact), ex=self._ttl_seconds)
+
+    def invalidate(self, key: str) -> None:
+        self._memory.invalidate(key)
+        if self._redis is not None:
+            self._redis_call("delete", f"report:{key}")
+
+    def stats(self) -> dict:
+        stats = self._memory.stats().as_dict()
+        stats["redis_enabled"] = self._redis is not None
+        stats["redis_hits"] = self.redis_hits
+        return stats
+
+    def _redis_call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return getattr(self._redis, method)(*args, **kwargs)
+        except Exception:  # pragma: no cover - the shared tier is best effort
+            logger.warning("Redis %s failed for normalized report cache", method, exc_info=True)
+            return None
+
+
+class ExportCache:
+    """Cache of rendered export payloads keyed by their ETag.
+
+    ETags fingerprint the exported findings state, so entries never go stale;
+    superseded versions simply age out of the byte-bounded LRU. Payloads
+    larger than ``max_entry_bytes`` are never cached, so a cold export of a
+    huge assessment streams in bounded memory instead of being buffered.
+    """
+
+    def __init__(self, max_bytes: int, *, max_entry_bytes: Optional[int] = None) -> None:
+        self._memory: BoundedLRU[str, bytes] = BoundedLRU(max_bytes, weigher=len)
+        self._max_entry_bytes = min(max_entry_bytes or max_bytes, max_bytes)
+
+    def get(self, etag: str) -> Optional[bytes]:
+        return self._memory.get(etag)
+
+    def put(self, etag: str, payload: bytes) -> None:
+        if len(payload) <= self._max_entry_bytes:
+            self._memory.put(etag, payload)
+
+    def tee(self, etag: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Pass ``chunks`` through, caching the whole payload once fully produced.
+
+        Collection stops once the payload outgrows ``max_entry_bytes``, so
+        streaming an oversized export costs no more memory than it would
+        uncached.
+        """
+
+        collected: Optional[List[bytes]] = []
+        size = 0
+        for chunk in chunks:
+            if collected is not None:
+                size += len(chunk)
+                if size <= self._max_entry_bytes:
+                    collected.append(chunk)
+                else:
+                    collected = None
+            yield chunk
+        if collected is not None:
+            self.put(etag, b"".join(collected))
+
+    def stats(self) -> dict:
+        return self._memory.stats().as_dict()
+
+
+def _redis_client(url: Optional[str]) -> Any:
+    return redis.Redis.from_url(url) if url else None
+
+
+@lru_cache()
+def get_parse_cache() -> ParseCache:
+    """Return the process-wide parse cache configured from settings."""
+
+    settings = get_settings()
+    return ParseCache(
+        settings.parse_cache_max_bytes,
+        redis_client=_redis_client(settings.parse_cache_redis_url),
+        ttl_seconds=settings.parse_cache_ttl_seconds,
+    )
+
+
+@lru_cache()
+def get_report_cache() -> ReportCache:
+    """Return the process-wide normalized report cache configured from settings."""
+
+    settings = get_settings()
+    redis_url = settings.parse_cache_redis_url if settings.report_cache_persist else None
+    return ReportCache(
+        settings.report_cache_max_bytes,
+        redis_client=_redis_client(redis_url),
+        ttl_seconds=settings.parse_cache_ttl_seconds,
+    )
+
+
+@lru_cache()
+def get_export_cache() -> ExportCache:
+    """Return the process-wide export payload cache configured from settings."""
+
+    settings = get_settings()
+    return ExportCache(settings.export_cache_max_bytes, max_entry_bytes=settings.export_cache_max_entry_bytes)
+
+
+__all__ = [
+    "ExportCache",
+    "ParseCache",
+    "ReportCache",
+    "digest_report",
+    "digest_stream",
+    "get_export_cache",
+    "get_parse_cache",
+    "get_report_cache",
+]
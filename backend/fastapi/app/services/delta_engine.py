@@ -0,0 +1,281 @@
+"""Columnar delta engine backed by NumPy.
+
+Reports are encoded once into parallel integer arrays (rule code, severity
+code, status code) so that aligning two reports and classifying every rule are
+vectorized operations instead of per-rule Python work. Rule ids are interned in
+a :class:`RuleVocabulary` shared by the reports being compared, and status
+codes are the ``_STATUS_RANK`` values, which lets "improved"/"regressed" be
+plain integer comparisons; ``-1`` marks a rule that is absent from one side.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from ..enums import FindingSeverity, FindingStatus
+from ..parsers.inspec_parser import Report
+from ..schemas import DeltaFinding, DeltaReport, DeltaSummary
+from .delta_service import (
+    _OUTCOMES,
+    _SEVERITIES,
+    _SEVERITY_CODE,
+    _STATUS_BY_CODE,
+    _STATUS_RANK,
+    CompactReport,
+    DeltaRow,
+    compact_report,
+)
+
+_MISSING = -1
+
+_DEFAULT_SEVERITY = _SEVERITY_CODE[FindingSeverity.CAT_III]
+
+_OPEN = _STATUS_RANK[FindingStatus.OPEN]
+_NOT_A_FINDING = _STATUS_RANK[FindingStatus.NOT_A_FINDING]
+
+# Index into this with ``improved + 2 * regressed``.
+_OUTCOME_BY_FLAGS = ("unchanged", "improved", "regressed")
+
+_ROW_BATCH = 4096
+
+
+class RuleVocabulary:
+    """Interns rule ids as dense integer codes.
+
+    Codes are assigned in first-seen order; :meth:`ranks` maps them to their
+    position in rule-id sort order, which is recomputed only after new rule
+    ids have been added. One vocabulary is meant to be shared by every report
+    of a comparison, e.g. a baseline and all post reports of a fleet.
+    """
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, int] = {}
+        self._rule_ids: List[str] = []
+        self._ranks: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._rule_ids)
+
+    def encode(self, rule_ids: Iterable[str]) -> np.ndarray:
+        codes = self._codes
+        size = len(codes)
+        encoded = np.fromiter((codes.setdefault(rule_id, len(codes)) for rule_id in rule_ids), dtype=np.int32)
+        if len(codes) != size:
+            self._rule_ids.extend(list(codes)[size:])
+            self._ranks = None
+        return encoded
+
+    def decode(self, codes: np.ndarray) -> List[str]:
+        rule_ids = self._rule_ids
+        return [rule_ids[code] for code in codes.tolist()]
+
+    def ranks(self) -> np.ndarray:
+        if self._ranks is None:
+            order = np.argsort(np.array(self._rule_ids, dtype=str), kind="stable")
+            ranks = np.empty(len(order), dtype=np.int64)
+            ranks[order] = np.arange(len(order))
+            self._ranks = ranks
+        return self._ranks
+
+
+@dataclass(frozen=True)
+class ColumnarReport:
+    """A normalized report as parallel arrays sorted by rule code."""
+
+    vocabulary: RuleVocabulary
+    codes: np.ndarray
+    severities: np.ndarray
+    statuses: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+def encode_compact(compact: CompactReport, vocabulary: RuleVocabulary) -> ColumnarReport:
+    """Intern a :data:`CompactReport` into ``vocabulary`` as a :class:`ColumnarReport`."""
+
+    rule_ids, severities, statuses = compact
+    codes = vocabulary.encode(rule_ids)
+    order = np.argsort(codes)
+    return ColumnarReport(
+        vocabulary=vocabulary,
+        codes=codes[order],
+        severities=np.frombuffer(severities, dtype=np.int8)[order],
+        statuses=np.frombuffer(statuses, dtype=np.int8)[order],
+    )
+
+
+def encode_report(report: Report, vocabulary: RuleVocabulary | None = None) -> ColumnarReport:
+    """Normalize an InSpec report into a :class:`ColumnarReport`.
+
+    Reports can only be compared when encoded with the same ``vocabulary``.
+    """
+
+    return encode_compact(compact_report(report), vocabulary if vocabulary is not None else RuleVocabulary())
+
+
+@dataclass(frozen=True)
+class _Alignment:
+    vocabulary: RuleVocabulary
+    codes: np.ndarray
+    severities: np.ndarray
+    before: np.ndarray
+    after: np.ndarray
+    improved: np.ndarray
+    regressed: np.ndarray
+
+
+def _project(report: ColumnarReport, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(severity, status)`` of ``report`` at ``codes``, ``-1`` where absent."""
+
+    severities = np.full(len(codes), _MISSING, dtype=np.int8)
+    statuses = np.full(len(codes), _MISSING, dtype=np.int8)
+    if len(report):
+        index = np.searchsorted(report.codes, codes)
+        np.minimum(index, len(report) - 1, out=index)
+        present = report.codes[index] == codes
+        severities[present] = report.severities[index[present]]
+        statuses[present] = report.statuses[index[present]]
+    return severities, statuses
+
+
+def _align(baseline: ColumnarReport, post: ColumnarReport) -> _Alignment:
+    if baseline.vocabulary is not post.vocabulary:
+        raise ValueError("Reports must be encoded with the same RuleVocabulary to be compared")
+
+    # Align on integer codes, then put rows in rule-id order to match the
+    # sorted output of the dict-based engine.
+    codes = np.union1d(baseline.codes, post.codes)
+    codes = codes[np.argsort(baseline.vocabulary.ranks()[codes])]
+    before_severity, before = _project(baseline, codes)
+    after_severity, after = _project(post, codes)
+
+    severities = np.where(after_severity >= 0, after_severity, before_severity)
+    severities[severities < 0] = _DEFAULT_SEVERITY
+
+    both = (before >= 0) & (after >= 0)
+    added = (before < 0) & (after >= 0)
+    improved = (both & (after < before)) | (added & (after == _NOT_A_FINDING))
+    regressed = (both & (after > before)) | (added & (after == _OPEN))
+    return _Alignment(baseline.vocabulary, codes, severities, before, after, improved, regressed)
+
+
+def _summarize(aligned: _Alignment) -> DeltaSummary:
+    total = len(aligned.codes)
+    improved = int(aligned.improved.sum())
+    regressed = int(aligned.regressed.sum())
+
+    # Buckets appear in order of each severity's first rule, matching the
+    # insertion order of the dict-based engine.
+    by_severity: Dict[str, Dict[str, int]] = {}
+    if total:
+        width = len(_SEVERITIES)
+        counts = np.bincount(aligned.severities, minlength=width)
+        improved_counts = np.bincount(aligned.severities, weights=aligned.improved, minlength=width)
+        regressed_counts = np.bincount(aligned.severities, weights=aligned.regressed, minlength=width)
+        present, first = np.unique(aligned.severities, return_index=True)
+        for code in present[np.argsort(first)]:
+            bucket_improved = int(improved_counts[code])
+            bucket_regressed = int(regressed_counts[code])
+            bucket_unchanged = int(counts[code]) - bucket_improved - bucket_regressed
+            by_severity[_SEVERITIES[code].value] = dict(
+                zip(_OUTCOMES, (bucket_improved, bucket_regressed, bucket_unchanged))
+            )
+
+    return DeltaSummary(
+        total=total,
+        improved=improved,
+        regressed=regressed,
+        unchanged=total - improved - regressed,
+        by_severity=by_severity,
+    )
+
+
+def _findings(aligned: _Alignment) -> List[DeltaFinding]:
+    changed = (aligned.before != aligned.after).tolist()
+    # Values are already validated enums, so skip per-row pydantic validation.
+    return [
+        DeltaFinding.construct(
+            rule_id=rule_id,
+            severity=_SEVERITIES[severity],
+            before_status=_STATUS_BY_CODE.get(before),
+            after_status=_STATUS_BY_CODE.get(after),
+            changed=is_changed,
+        )
+        for rule_id, severity, before, after, is_changed in zip(
+            aligned.vocabulary.decode(aligned.codes),
+            aligned.severities.tolist(),
+            aligned.before.tolist(),
+            aligned.after.tolist(),
+            changed,
+        )
+    ]
+
+
+def _encoded(report: Report | ColumnarReport, vocabulary: RuleVocabulary) -> ColumnarReport:
+    return report if isinstance(report, ColumnarReport) else encode_report(report, vocabulary)
+
+
+def iter_delta_rows(baseline_compact: CompactReport, post_compact: CompactReport) -> Iterator[DeltaRow]:
+    """Yield classified delta rows in rule-id order, materializing them in batches."""
+
+    vocabulary = RuleVocabulary()
+    aligned = _align(encode_compact(baseline_compact, vocabulary), encode_compact(post_compact, vocabulary))
+    flags = aligned.improved.astype(np.int8) + 2 * aligned.regressed.astype(np.int8)
+    for start in range(0, len(aligned.codes), _ROW_BATCH):
+        window = slice(start, start + _ROW_BATCH)
+        for rule_id, severity, before, after, flag in zip(
+            vocabulary.decode(aligned.codes[window]),
+            aligned.severities[window].tolist(),
+            aligned.before[window].tolist(),
+            aligned.after[window].tolist(),
+            flags[window].tolist(),
+        ):
+            yield (
+                rule_id,
+                _SEVERITIES[severity],
+                _STATUS_BY_CODE.get(before),
+                _STATUS_BY_CODE.get(after),
+                before != after,
+                _OUTCOME_BY_FLAGS[flag],
+            )
+
+
+def compute_delta_summary(baseline: ColumnarReport, post: ColumnarReport) -> DeltaSummary:
+    """Compute only the aggregate summary of two encoded reports."""
+
+    return _summarize(_align(baseline, post))
+
+
+def compute_delta_columnar(
+    baseline_report: Report | ColumnarReport, post_report: Report | ColumnarReport
+) -> DeltaReport:
+    """Columnar equivalent of :func:`delta_service.compute_delta`.
+
+    Accepts raw reports or reports already passed through :func:`encode_report`;
+    raw reports are encoded with the vocabulary of the other side when it is
+    already encoded.
+    """
+
+    vocabulary = next(
+        (report.vocabulary for report in (baseline_report, post_report) if isinstance(report, ColumnarReport)),
+        RuleVocabulary(),
+    )
+    baseline = _encoded(baseline_report, vocabulary)
+    post = _encoded(post_report, vocabulary)
+    aligned = _align(baseline, post)
+    return DeltaReport.construct(findings=_findings(aligned), summary=_summarize(aligned))
+
+
+__all__ = [
+    "ColumnarReport",
+    "RuleVocabulary",
+    "compute_delta_columnar",
+    "compute_delta_summary",
+    "encode_compact",
+    "encode_report",
+    "iter_delta_rows",
+]
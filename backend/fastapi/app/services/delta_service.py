@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import json
 from collections import defaultdict
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from ..enums import FindingSeverity, FindingStatus
+from ..parsers.inspec_parser import Report, iter_inspec
 from ..schemas import DeltaFinding, DeltaReport, DeltaSummary
+from .cache_service import ReportCache, digest_report
 
 _STATUS_RANK = {
     FindingStatus.OPEN: 3,
@@ -14,54 +17,123 @@ _STATUS_RANK = {
     FindingStatus.NOT_APPLICABLE: 1,
     FindingStatus.NOT_A_FINDING: 0,
 }
+_STATUS_BY_CODE = {rank: status for status, rank in _STATUS_RANK.items()}
 
+_OUTCOMES = ("improved", "regressed", "unchanged")
+_NDJSON_FLUSH_BYTES = 64 * 1024
 
-def _severity_from_impact(impact: Optional[float]) -> FindingSeverity:
-    if impact is None:
-        return FindingSeverity.CAT_III
-    if impact >= 0.7:
-        return FindingSeverity.CAT_I
-    if impact >= 0.5:
-        return FindingSeverity.CAT_II
-    if impact > 0:
-        return FindingSeverity.CAT_III
-    return FindingSeverity.INFO
-
-
-def _status_from_results(results: Iterable[dict]) -> FindingStatus:
-    statuses = {str(result.get("status", "")).lower() for result in results}
-    if "failed" in statuses:
-        return FindingStatus.OPEN
-    if "passed" in statuses:
-        return FindingStatus.NOT_A_FINDING
-    if "not_applicable" in statuses:
-        return FindingStatus.NOT_APPLICABLE
-    return FindingStatus.REVIEW_REQUIRED
-
-
-def _normalize(report: dict) -> Dict[str, Tuple[FindingSeverity, FindingStatus]]:
-    normalized: Dict[str, Tuple[FindingSeverity, FindingStatus]] = {}
-    for profile in report.get("profiles", []):
-        for control in profile.get("controls", []):
-            rule_id = control.get("id") or control.get("ref_id")
-            if not rule_id:
-                continue
-            impact = control.get("impact")
-            severity = _severity_from_impact(impact)
-            status = _status_from_results(control.get("results", []))
-            normalized[rule_id] = (severity, status)
-    return normalized
-
-
-def compute_delta(baseline_report: dict, post_report: dict) -> DeltaReport:
-    """Compute rule-level delta and aggregate summary."""
-
-    baseline = _normalize(baseline_report)
-    post = _normalize(post_report)
+_SEVERITIES: List[FindingSeverity] = list(FindingSeverity)
+_SEVERITY_CODE = {severity: code for code, severity in enumerate(_SEVERITIES)}
 
+# Rule ids plus one byte per rule for the severity code and the status rank:
+# the normalized form shared by both engines, small to pickle between
+# processes and to cache.
+CompactReport = Tuple[List[str], bytes, bytes]
+
+# (rule_id, severity, before_status, after_status, changed, outcome)
+DeltaRow = Tuple[str, FindingSeverity, Optional[FindingStatus], Optional[FindingStatus], bool, str]
+
+
+def compact_report(report: Report) -> CompactReport:
+    """Normalize an InSpec report into its :data:`CompactReport` form.
+
+    The last control wins when a rule id repeats.
+    """
+
+    normalized = {finding.rule_id: finding for finding in iter_inspec(report)}
+    severities = bytes(_SEVERITY_CODE[finding.severity] for finding in normalized.values())
+    statuses = bytes(_STATUS_RANK[finding.status] for finding in normalized.values())
+    return list(normalized), severities, statuses
+
+
+def normalize_report(report: Report, *, cache: ReportCache | None = None, key: str | None = None) -> CompactReport:
+    """Return the compact form of ``report``, normalizing it at most once per ``cache``.
+
+    Entries are looked up under ``key`` (e.g. an assessment id) or, without
+    one, under the SHA-256 of the report content.
+    """
+
+    if cache is None:
+        return compact_report(report)
+    key = key or digest_report(report)
+    compact = cache.get(key)
+    if compact is None:
+        compact = compact_report(report)
+        cache.put(key, compact)
+    return compact
+
+
+def _expand(compact: CompactReport) -> Dict[str, Tuple[FindingSeverity, FindingStatus]]:
+    rule_ids, severities, statuses = compact
+    return {
+        rule_id: (_SEVERITIES[severity], _STATUS_BY_CODE[status])
+        for rule_id, severity, status in zip(rule_ids, severities, statuses)
+    }
+
+
+DELTA_ENGINES = ("python", "columnar")
+
+
+def compute_delta(
+    baseline_report: Report,
+    post_report: Report,
+    *,
+    engine: str = "python",
+    cache: ReportCache | None = None,
+    baseline_key: str | None = None,
+    post_key: str | None = None,
+) -> DeltaReport:
+    """Compute rule-level delta and aggregate summary.
+
+    ``engine="columnar"`` dispatches to the NumPy-backed engine in
+    :mod:`delta_engine`, which produces the same report for large rule sets at
+    a fraction of the CPU cost. With a ``cache``, each report is normalized
+    once and later comparisons only pay for the comparison itself.
+    """
+
+    if engine not in DELTA_ENGINES:
+        raise ValueError(f"Unknown delta engine '{engine}'; expected one of {', '.join(DELTA_ENGINES)}")
+
+    return delta_from_compact(
+        normalize_report(baseline_report, cache=cache, key=baseline_key),
+        normalize_report(post_report, cache=cache, key=post_key),
+        engine=engine,
+    )
+
+
+def delta_from_compact(
+    baseline_compact: CompactReport, post_compact: CompactReport, *, engine: str = "python"
+) -> DeltaReport:
+    """Compute the delta of two already normalized reports."""
+
+    if engine == "columnar":
+        from .delta_engine import RuleVocabulary, compute_delta_columnar, encode_compact
+
+        vocabulary = RuleVocabulary()
+        return compute_delta_columnar(
+            encode_compact(baseline_compact, vocabulary), encode_compact(post_compact, vocabulary)
+        )
+
+    counter = _SummaryCounter()
     delta_findings: list[DeltaFinding] = []
-    summary_counts = {"improved": 0, "regressed": 0, "unchanged": 0}
-    severity_buckets: dict[str, dict[str, int]] = defaultdict(lambda: {"improved": 0, "regressed": 0, "unchanged": 0})
+    for rule_id, severity, before_status, after_status, changed, outcome in _iter_rows(baseline_compact, post_compact):
+        counter.add(severity, outcome)
+        delta_findings.append(
+            DeltaFinding(
+                rule_id=rule_id,
+                severity=severity,
+                before_status=before_status,
+                after_status=after_status,
+                changed=changed,
+            )
+        )
+
+    return DeltaReport(findings=delta_findings, summary=counter.summary())
+
+
+def _iter_rows(baseline_compact: CompactReport, post_compact: CompactReport) -> Iterator[DeltaRow]:
+    baseline = _expand(baseline_compact)
+    post = _expand(post_compact)
 
     for rule_id in sorted(set(baseline.keys()) | set(post.keys())):
         before = baseline.get(rule_id)
@@ -74,28 +146,91 @@ def compute_delta(baseline_report: dict, post_report: dict) -> DeltaReport:
         outcome = "unchanged"
         if changed:
             outcome = _classify_change(before_status, after_status)
-        summary_counts[outcome] += 1
-        severity_buckets[severity.value][outcome] += 1
+        yield rule_id, severity, before_status, after_status, changed, outcome
 
-        delta_findings.append(
-            DeltaFinding(
-                rule_id=rule_id,
-                severity=severity,
-                before_status=before_status,
-                after_status=after_status,
-                changed=changed,
-            )
+
+class _SummaryCounter:
+    """Accumulates a :class:`DeltaSummary` one classified rule at a time."""
+
+    def __init__(self) -> None:
+        self.counts = dict.fromkeys(_OUTCOMES, 0)
+        self.by_severity: dict[str, dict[str, int]] = defaultdict(lambda: dict.fromkeys(_OUTCOMES, 0))
+
+    def add(self, severity: FindingSeverity, outcome: str) -> None:
+        self.counts[outcome] += 1
+        self.by_severity[severity.value][outcome] += 1
+
+    def summary(self) -> DeltaSummary:
+        return DeltaSummary(
+            total=sum(self.counts.values()),
+            improved=self.counts["improved"],
+            regressed=self.counts["regressed"],
+            unchanged=self.counts["unchanged"],
+            by_severity={key: dict(value) for key, value in self.by_severity.items()},
         )
 
-    summary = DeltaSummary(
-        total=len(delta_findings),
-        improved=summary_counts["improved"],
-        regressed=summary_counts["regressed"],
-        unchanged=summary_counts["unchanged"],
-        by_severity={key: dict(value) for key, value in severity_buckets.items()},
-    )
 
-    return DeltaReport(findings=delta_findings, summary=summary)
+def stream_delta(
+    baseline_report: Report,
+    post_report: Report,
+    *,
+    changed_only: bool = False,
+    engine: str = "python",
+    cache: ReportCache | None = None,
+    baseline_key: str | None = None,
+    post_key: str | None = None,
+    flush_bytes: int = _NDJSON_FLUSH_BYTES,
+) -> Iterator[bytes]:
+    """Yield the delta as NDJSON: one ``DeltaFinding`` object per line, then the summary.
+
+    Rows are serialized as they are classified and flushed in ``flush_bytes``
+    chunks, so memory does not grow with the number of rules beyond the
+    normalized reports themselves. With ``changed_only`` unchanged rules are
+    omitted from the rows but still counted. The last line is
+    ``{"summary": {...}}`` covering every rule.
+    """
+
+    if engine not in DELTA_ENGINES:
+        raise ValueError(f"Unknown delta engine '{engine}'; expected one of {', '.join(DELTA_ENGINES)}")
+
+    baseline_compact = normalize_report(baseline_report, cache=cache, key=baseline_key)
+    post_compact = normalize_report(post_report, cache=cache, key=post_key)
+    if engine == "columnar":
+        from .delta_engine import iter_delta_rows
+
+        rows = iter_delta_rows(baseline_compact, post_compact)
+    else:
+        rows = _iter_rows(baseline_compact, post_compact)
+
+    counter = _SummaryCounter()
+    buffer: list[str] = []
+    size = 0
+    for rule_id, severity, before_status, after_status, changed, outcome in rows:
+        counter.add(severity, outcome)
+        if changed_only and not changed:
+            continue
+        line = _dumps(
+            {
+                "rule_id": rule_id,
+                "severity": severity.value,
+                "before_status": before_status.value if before_status else None,
+                "after_status": after_status.value if after_status else None,
+                "changed": changed,
+            }
+        )
+        buffer.append(line)
+        size += len(line)
+        if size >= flush_bytes:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+
+    buffer.append(_dumps({"summary": counter.summary().dict()}))
+    yield "".join(buffer).encode("utf-8")
+
+
+def _dumps(row: dict) -> str:
+    return json.dumps(row, separators=(",", ":")) + "\n"
 
 
 def _classify_change(before: FindingStatus | None, after: FindingStatus | None) -> str:
@@ -1,14 +1,39 @@
-"""Export services including CKL regeneration."""
+"""Export services including CKL and CKLB regeneration."""
 
 from __future__ import annotations
 
-import xml.etree.ElementTree as ET
-from typing import Iterable
+import hashlib
+import json
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+from xml.sax.saxutils import escape
+from uuid import NAMESPACE_URL, uuid5
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from ..enums import FindingSeverity, FindingStatus
+from ..models import Assessment, Asset, Finding, FindingVersion
 from ..schemas import FindingBase
 
 
+class ExportRow(NamedTuple):
+    """The finding fields a checklist needs; cheaper to pickle and build than ``FindingBase``."""
+
+    rule_id: str
+    severity: FindingSeverity
+    status: FindingStatus
+    comments: Optional[str]
+
+
+class ExportVersion(NamedTuple):
+    """Identifies the exact findings state an export of one assessment is rendered from."""
+
+    asset_id: int
+    asset_name: str
+    assessment_id: int
+    findings_version: int
+
+
 _SEVERITY_LABEL = {
     FindingSeverity.CAT_I: "high",
     FindingSeverity.CAT_II: "medium",
@@ -23,32 +48,156 @@ _STATUS_LABEL = {
     FindingStatus.REVIEW_REQUIRED: "Not_Reviewed",
 }
 
+# STIG Viewer 3 spells the same statuses in snake case.
+_CKLB_STATUS_LABEL = {
+    FindingStatus.OPEN: "open",
+    FindingStatus.NOT_A_FINDING: "not_a_finding",
+    FindingStatus.NOT_APPLICABLE: "not_applicable",
+    FindingStatus.REVIEW_REQUIRED: "not_reviewed",
+}
+
+
+_CKL_FLUSH_BYTES = 64 * 1024
+_EXPORT_BATCH_ROWS = 5000
+
+_CKL_HEADER = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    "<CHECKLIST><ASSET><ASSET_NAME>{asset}</ASSET_NAME><HOST_NAME>{asset}</HOST_NAME></ASSET><STIGS><iSTIG>"
+)
+_CKL_FOOTER = "</iSTIG></STIGS></CHECKLIST>"
+_CKL_VULN = (
+    "<VULN><STATUS>{status}</STATUS>"
+    "<FINDING_DETAILS>{comments}</FINDING_DETAILS><COMMENTS>{comments}</COMMENTS>"
+    "<STIG_DATA><VULN_ATTRIBUTE>Vuln_Num</VULN_ATTRIBUTE><ATTRIBUTE_DATA>{rule_id}</ATTRIBUTE_DATA></STIG_DATA>"
+    "<STIG_DATA><VULN_ATTRIBUTE>Rule_ID</VULN_ATTRIBUTE><ATTRIBUTE_DATA>{rule_id}</ATTRIBUTE_DATA></STIG_DATA>"
+    "<STIG_DATA><VULN_ATTRIBUTE>Severity</VULN_ATTRIBUTE><ATTRIBUTE_DATA>{severity}</ATTRIBUTE_DATA></STIG_DATA>"
+    "</VULN>"
+)
+
+
+def stream_ckl(
+    findings: Iterable[FindingBase], asset_name: str = "Unknown Asset", *, flush_bytes: int = _CKL_FLUSH_BYTES
+) -> Iterator[bytes]:
+    """Yield a CKL XML payload as UTF-8 chunks of roughly ``flush_bytes``.
+
+    Each VULN is rendered from a fixed template with its text escaped, so no
+    element tree is built and memory stays flat however many findings are
+    exported. ``findings`` is consumed lazily.
+    """
+
+    buffer = [_CKL_HEADER.format(asset=escape(asset_name))]
+    size = len(buffer[0])
+    for finding in findings:
+        vuln = _CKL_VULN.format(
+            status=_STATUS_LABEL.get(finding.status, "Not_Reviewed"),
+            comments=escape(finding.comments or ""),
+            rule_id=escape(finding.rule_id),
+            severity=_SEVERITY_LABEL.get(finding.severity, "low"),
+        )
+        buffer.append(vuln)
+        size += len(vuln)
+        if size >= flush_bytes:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+    buffer.append(_CKL_FOOTER)
+    yield "".join(buffer).encode("utf-8")
+
 
 def generate_ckl(findings: Iterable[FindingBase], asset_name: str = "Unknown Asset") -> str:
     """Generate a CKL XML payload from normalized findings."""
 
-    checklist = ET.Element("CHECKLIST")
-    asset = ET.SubElement(checklist, "ASSET")
-    ET.SubElement(asset, "ASSET_NAME").text = asset_name
+    return b"".join(stream_ckl(findings, asset_name)).decode("utf-8")
 
-    stigs = ET.SubElement(checklist, "STIGS")
-    istig = ET.SubElement(stigs, "iSTIG")
 
-    for finding in findings:
-        vuln = ET.SubElement(istig, "VULN")
-        status_text = _STATUS_LABEL.get(finding.status, "Not_Reviewed")
-        ET.SubElement(vuln, "STATUS").text = status_text
-        ET.SubElement(vuln, "FINDING_DETAILS").text = finding.comments or ""
-        ET.SubElement(vuln, "COMMENTS").text = finding.comments or ""
-
-        def _stig_data(attribute: str, value: str) -> None:
-            stig_data = ET.SubElement(vuln, "STIG_DATA")
-            ET.SubElement(stig_data, "VULN_ATTRIBUTE").text = attribute
-            ET.SubElement(stig_data, "ATTRIBUTE_DATA").text = value
-
-        _stig_data("Vuln_Num", finding.rule_id)
-        _stig_data("Rule_ID", finding.rule_id)
-        severity_label = _SEVERITY_LABEL.get(finding.severity, "low")
-        _stig_data("Severity", severity_label)
-
-    return ET.tostring(checklist, encoding="utf-8", xml_declaration=True).decode("utf-8")
+def generate_cklb(findings: Iterable[FindingBase], asset_name: str = "Unknown Asset") -> str:
+    """Generate a STIG Viewer 3 CKLB JSON payload from normalized findings.
+
+    Identifiers are derived from the asset name and rule ids, so exporting the
+    same findings twice yields byte-identical checklists.
+    """
+
+    checklist_id = uuid5(NAMESPACE_URL, f"aegis:cklb:{asset_name}")
+    stig_id = uuid5(checklist_id, "stig")
+    rules = [
+        {
+            "uuid": str(uuid5(stig_id, finding.rule_id)),
+            "stig_uuid": str(stig_id),
+            "group_id": finding.rule_id,
+            "rule_id": finding.rule_id,
+            "severity": _SEVERITY_LABEL.get(finding.severity, "low"),
+            "status": _CKLB_STATUS_LABEL.get(finding.status, "not_reviewed"),
+            "finding_details": finding.comments or "",
+            "comments": finding.comments or "",
+            "overrides": {},
+        }
+        for finding in findings
+    ]
+    checklist = {
+        "title": asset_name,
+        "id": str(checklist_id),
+        "active": False,
+        "mode": 1,
+        "has_path": False,
+        "target_data": {"target_type": "Computing", "host_name": asset_name, "is_web_database": False},
+        "stigs": [
+            {"stig_name": "Exported Findings", "display_name": "Exported Findings", "uuid": str(stig_id), "rules": rules}
+        ],
+        "cklb_version": "1.0",
+    }
+    return json.dumps(checklist, separators=(",", ":"))
+
+
+def findings_version(session: Session, assessment_id: int) -> Optional[ExportVersion]:
+    """Return the current :class:`ExportVersion` of an assessment, or ``None`` if it does not exist.
+
+    The version is the assessment's ``finding_versions`` counter, bumped by
+    every findings upsert that writes a row; assessments never written to are
+    at version 0.
+    """
+
+    row = session.execute(
+        select(Assessment.asset_id, Asset.hostname, func.coalesce(FindingVersion.version, 0))
+        .join(Asset, Asset.id == Assessment.asset_id)
+        .outerjoin(FindingVersion, FindingVersion.assessment_id == Assessment.id)
+        .where(Assessment.id == assessment_id)
+    ).first()
+    if row is None:
+        return None
+    asset_id, asset_name, version = row
+    return ExportVersion(asset_id, asset_name, assessment_id, version)
+
+
+def iter_export_rows(session: Session, assessment_id: int) -> Iterator[ExportRow]:
+    """Stream an assessment's findings in rule order for export, ``_EXPORT_BATCH_ROWS`` at a time."""
+
+    statement = (
+        select(Finding.rule_id, Finding.severity, Finding.status, Finding.comments)
+        .where(Finding.assessment_id == assessment_id)
+        .order_by(Finding.rule_id)
+        .execution_options(yield_per=_EXPORT_BATCH_ROWS)
+    )
+    for row in session.execute(statement):
+        yield ExportRow._make(row)
+
+
+def stream_assessment_ckl(assessment_id: int, asset_name: str) -> Iterator[bytes]:
+    """Stream an assessment's CKL using its own database session.
+
+    The session lives as long as the stream rather than the request, since
+    a streaming response body outlives the request's dependencies.
+    """
+
+    from ..database import get_db
+
+    with get_db() as session:
+        yield from stream_ckl(iter_export_rows(session, assessment_id), asset_name)
+
+
+def export_etag(fmt: str, version: ExportVersion) -> str:
+    """Return the strong ETag of an export of ``version`` in ``fmt``."""
+
+    fingerprint = "|".join(
+        (fmt, str(version.asset_id), version.asset_name, str(version.assessment_id), str(version.findings_version))
+    )
+    return f'"{hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:32]}"'
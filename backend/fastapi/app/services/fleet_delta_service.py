@@ -0,0 +1,163 @@
+"""Fleet-wide delta computation across many baseline/post report pairs."""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..parsers.inspec_parser import Report
+from ..schemas import DeltaSummary, FleetDeltaReport, FleetRuleRegression
+from .archive_service import discard_parse_executor, get_parse_executor
+from .cache_service import ReportCache, digest_report
+from .delta_engine import RuleVocabulary, _align, _summarize, encode_compact
+from .delta_service import _OUTCOMES, _SEVERITIES, CompactReport, compact_report
+
+# Below this many distinct reports the process pool costs more than it saves.
+_PARALLEL_THRESHOLD = 8
+_CHUNKSIZE = 16
+
+
+@dataclass(frozen=True)
+class FleetPair:
+    """One host's baseline and post report, with optional report cache keys."""
+
+    asset_id: int
+    baseline: Report
+    post: Report
+    baseline_key: Optional[str] = None
+    post_key: Optional[str] = None
+
+
+def _normalize_all(
+    reports: List[Report], keys: List[Optional[str]], executor: Executor | None, cache: ReportCache | None
+) -> List[CompactReport]:
+    compacts: List[Optional[CompactReport]] = [None] * len(reports)
+    if cache is not None:
+        keys = [key or digest_report(report) for key, report in zip(keys, reports)]
+        compacts = [cache.get(key) for key in keys]
+
+    pending = [index for index, compact in enumerate(compacts) if compact is None]
+    todo = [reports[index] for index in pending]
+    if executor is None and len(todo) < _PARALLEL_THRESHOLD:
+        results = [compact_report(report) for report in todo]
+    else:
+        pool = executor or get_parse_executor()
+        try:
+            results = list(pool.map(compact_report, todo, chunksize=_CHUNKSIZE))
+        except BrokenProcessPool:
+            # This request is lost, but later ones get a working pool.
+            discard_parse_executor(pool)
+            raise
+
+    for index, compact in zip(pending, results):
+        compacts[index] = compact
+        if cache is not None:
+            cache.put(keys[index], compact)
+    return compacts
+
+
+def _merge_summaries(summaries: Sequence[DeltaSummary]) -> DeltaSummary:
+    by_severity: Dict[str, Dict[str, int]] = {}
+    for summary in summaries:
+        for severity, counts in summary.by_severity.items():
+            bucket = by_severity.setdefault(severity, dict.fromkeys(_OUTCOMES, 0))
+            for outcome in _OUTCOMES:
+                bucket[outcome] += counts[outcome]
+    return DeltaSummary(
+        total=sum(summary.total for summary in summaries),
+        improved=sum(summary.improved for summary in summaries),
+        regressed=sum(summary.regressed for summary in summaries),
+        unchanged=sum(summary.unchanged for summary in summaries),
+        by_severity=by_severity,
+    )
+
+
+def compute_fleet_delta(
+    pairs: Sequence[FleetPair],
+    *,
+    executor: Executor | None = None,
+    cache: ReportCache | None = None,
+    max_assets_per_rule: int = 50,
+) -> FleetDeltaReport:
+    """Compare every pair and aggregate regressions per rule across the fleet.
+
+    Each distinct report object is normalized exactly once, so a baseline shared
+    by many hosts costs a single pass; normalization runs on ``executor`` (the
+    shared parse pool for larger fleets) unless ``cache`` already holds it.
+    Comparisons then run on the columnar engine against one shared rule
+    vocabulary. Regressions are reported with the number of affected assets
+    and up to ``max_assets_per_rule`` of their ids, most widespread first.
+    """
+
+    slots: Dict[int, int] = {}
+    reports: List[Report] = []
+    keys: List[Optional[str]] = []
+    for pair in pairs:
+        for report, key in ((pair.baseline, pair.baseline_key), (pair.post, pair.post_key)):
+            if id(report) not in slots:
+                slots[id(report)] = len(reports)
+                reports.append(report)
+                keys.append(key)
+
+    vocabulary = RuleVocabulary()
+    encoded = [encode_compact(compact, vocabulary) for compact in _normalize_all(reports, keys, executor, cache)]
+
+    summaries: List[DeltaSummary] = []
+    regressed_codes: List[np.ndarray] = []
+    regressed_assets: List[np.ndarray] = []
+    regressed_severities: List[np.ndarray] = []
+    for pair in pairs:
+        aligned = _align(encoded[slots[id(pair.baseline)]], encoded[slots[id(pair.post)]])
+        summaries.append(_summarize(aligned))
+        codes = aligned.codes[aligned.regressed]
+        regressed_codes.append(codes)
+        regressed_assets.append(np.full(len(codes), pair.asset_id, dtype=np.int64))
+        regressed_severities.append(aligned.severities[aligned.regressed])
+
+    return FleetDeltaReport(
+        comparisons=len(pairs),
+        regressions=_regressions(
+            vocabulary, regressed_codes, regressed_assets, regressed_severities, max_assets_per_rule
+        ),
+        summary=_merge_summaries(summaries),
+    )
+
+
+def _regressions(
+    vocabulary: RuleVocabulary,
+    codes: List[np.ndarray],
+    assets: List[np.ndarray],
+    severities: List[np.ndarray],
+    max_assets_per_rule: int,
+) -> List[FleetRuleRegression]:
+    if not codes or not sum(len(chunk) for chunk in codes):
+        return []
+
+    all_codes = np.concatenate(codes)
+    order = np.argsort(all_codes, kind="stable")
+    all_codes = all_codes[order]
+    all_assets = np.concatenate(assets)[order]
+    all_severities = np.concatenate(severities)[order]
+
+    rules, starts, host_counts = np.unique(all_codes, return_index=True, return_counts=True)
+    # A rule's severity may differ between reports; report the most severe.
+    worst = np.minimum.reduceat(all_severities, starts)
+
+    ranking = np.lexsort((vocabulary.ranks()[rules], worst, -host_counts))
+    rule_ids = vocabulary.decode(rules)
+    return [
+        FleetRuleRegression(
+            rule_id=rule_ids[index],
+            severity=_SEVERITIES[int(worst[index])],
+            host_count=int(host_counts[index]),
+            asset_ids=all_assets[starts[index] : starts[index] + min(host_counts[index], max_assets_per_rule)].tolist(),
+        )
+        for index in ranking.tolist()
+    ]
+
+
+__all__ = ["FleetPair", "compute_fleet_delta"]
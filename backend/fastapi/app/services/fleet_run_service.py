@@ -0,0 +1,394 @@
+"""Fleet runs: one profile fanned out across many assets with bounded concurrency."""
+
+from __future__ import annotations
+
+import ipaddress
+import logging
+import time
+from collections import defaultdict
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain as iter_chain, zip_longest
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import redis
+from celery import chain, chord, group
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..enums import AssessmentStatus
+from ..models import Assessment, Asset, FleetRun, FleetRunMember
+from ..schemas import FleetRunStatus
+from .assessment_run_service import RUNNER_TARGET_KEYS, execute_assessment
+
+logger = logging.getLogger(__name__)
+
+MEMBER_TASK = "assessments.run_fleet_member"
+FINISH_TASK = "assessments.finish_fleet_run"
+
+_START_RUN = text(
+    """
+    UPDATE fleet_runs SET status = 'RUNNING', started_at = now(), updated_at = now()
+    WHERE id = :fleet_run_id AND status = 'DRAFT'
+    """
+)
+
+# Settles a member once: only the first report of its outcome moves the
+# fleet run's counters, so redelivered tasks cannot count twice.
+_SETTLE_MEMBER = text(
+    """
+    WITH settled AS (
+        UPDATE fleet_run_members SET status = CAST(:status AS assessmentstatus), updated_at = now()
+        WHERE fleet_run_id = :fleet_run_id AND assessment_id = :assessment_id AND status IS NULL
+        RETURNING status
+    )
+    UPDATE fleet_runs
+    SET completed = completed + (SELECT count(*) FROM settled WHERE status = 'COMPLETED'),
+        failed = failed + (SELECT count(*) FROM settled WHERE status = 'FAILED'),
+        updated_at = now()
+    WHERE id = :fleet_run_id
+    """
+)
+
+# Members still unsettled when the run closes never reported an outcome (their
+# lane was cut short), so they and their stranded assessments count as failed.
+# Closing is idempotent: the chord body and its errback may both get here.
+_FINISH_RUN = text(
+    """
+    WITH abandoned AS (
+        UPDATE fleet_run_members SET status = 'FAILED', updated_at = now()
+        WHERE fleet_run_id = :fleet_run_id AND status IS NULL
+        RETURNING assessment_id
+    ), stranded AS (
+        UPDATE assessments SET status = 'FAILED', completed_at = now(), updated_at = now()
+        WHERE id IN (SELECT assessment_id FROM abandoned) AND status IN ('DRAFT', 'RUNNING')
+    )
+    UPDATE fleet_runs
+    SET failed = failed + (SELECT count(*) FROM abandoned),
+        status = CASE WHEN failed + (SELECT count(*) FROM abandoned) >= total AND total > 0
+                      THEN 'FAILED' ELSE 'COMPLETED' END::assessmentstatus,
+        completed_at = now(), updated_at = now()
+    WHERE id = :fleet_run_id AND completed_at IS NULL
+    """
+)
+
+
+class NoMatchingAssets(LookupError):
+    """Raised when a fleet selector matches no assets."""
+
+
+class SubnetRateLimited(Exception):
+    """Raised when a subnet has used its run starts for the current window."""
+
+    def __init__(self, subnet: str, retry_after: float) -> None:
+        super().__init__(f"Run rate for subnet {subnet} exhausted; retry in {retry_after:.0f}s")
+        self.subnet = subnet
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class FleetMember:
+    """One asset's run within a fleet run, as dispatched to the workers."""
+
+    assessment_id: int
+    target: Dict[str, Any]
+    subnet: Optional[str] = None
+
+
+def subnet_of(address: Optional[str], *, prefix: int = 24) -> Optional[str]:
+    """Return the subnet an asset's address falls in; IPv6 addresses use their /64.
+
+    Assets known only by hostname have no subnet and are not rate limited.
+    """
+
+    if not address:
+        return None
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return None
+    return str(ipaddress.ip_network(f"{ip}/{prefix if ip.version == 4 else 64}", strict=False))
+
+
+def select_assets(
+    session: Session,
+    *,
+    asset_ids: Optional[Sequence[int]] = None,
+    platform: Optional[str] = None,
+    owner: Optional[str] = None,
+) -> List[Asset]:
+    """Return the assets matching every given criterion, ordered by id."""
+
+    statement = select(Asset).order_by(Asset.id)
+    if asset_ids is not None:
+        statement = statement.where(Asset.id.in_(asset_ids))
+    if platform is not None:
+        statement = statement.where(Asset.platform == platform)
+    if owner is not None:
+        statement = statement.where(Asset.owner == owner)
+    return list(session.scalars(statement))
+
+
+def plan_lanes(members: Sequence[FleetMember], concurrency: int) -> List[List[FleetMember]]:
+    """Deal members into at most ``concurrency`` lanes that each run sequentially.
+
+    Members are first interleaved across subnets, so concurrent lanes start on
+    different subnets rather than queueing behind one subnet's rate limit.
+    """
+
+    by_subnet: Dict[Optional[str], List[FleetMember]] = defaultdict(list)
+    for member in members:
+        by_subnet[member.subnet].append(member)
+    interleaved = [member for member in iter_chain(*zip_longest(*by_subnet.values())) if member is not None]
+
+    lanes: List[List[FleetMember]] = [[] for _ in range(max(1, min(concurrency, len(interleaved))))]
+    for position, member in enumerate(interleaved):
+        lanes[position % len(lanes)].append(member)
+    return [lane for lane in lanes if lane]
+
+
+def create_fleet_run(
+    session: Session,
+    *,
+    profile_id: int,
+    assets: Sequence[Asset],
+    connection: Mapping,
+    max_concurrency: int,
+    subnet_rate_per_minute: Optional[int],
+    selector: Optional[dict] = None,
+    subnet_prefix: int = 24,
+) -> tuple[FleetRun, List[FleetMember]]:
+    """Add a fleet run with one queued assessment per asset, inserted in bulk."""
+
+    if not assets:
+        raise NoMatchingAssets("No assets match the selector")
+
+    fleet_run = FleetRun(
+        profile_id=profile_id,
+        status=AssessmentStatus.DRAFT,
+        selector=selector,
+        max_concurrency=max_concurrency,
+        subnet_rate_per_minute=subnet_rate_per_minute,
+        total=len(assets),
+    )
+    session.add(fleet_run)
+    session.flush()
+
+    assessment_ids = session.scalars(
+        insert(Assessment).returning(Assessment.id, sort_by_parameter_order=True),
+        [{"asset_id": asset.id, "profile_id": profile_id, "status": AssessmentStatus.DRAFT} for asset in assets],
+    ).all()
+    session.execute(
+        insert(FleetRunMember),
+        [{"fleet_run_id": fleet_run.id, "assessment_id": assessment_id} for assessment_id in assessment_ids],
+    )
+
+    shared = {key: connection[key] for key in RUNNER_TARGET_KEYS if key != "host" and connection.get(key) is not None}
+    members = [
+        FleetMember(
+            assessment_id=assessment_id,
+            target={**shared, "host": asset.ip_address or asset.hostname},
+            subnet=subnet_of(asset.ip_address, prefix=subnet_prefix),
+        )
+        for asset, assessment_id in zip(assets, assessment_ids)
+    ]
+    return fleet_run, members
+
+
+def fleet_run_signature(fleet_run: FleetRun, members: Sequence[FleetMember], *, app: Any) -> Any:
+    """Build the Celery canvas of a fleet run.
+
+    A chord over ``max_concurrency`` chains: each chain runs its lane's
+    members one after another, so no more than that many of the run's
+    assessments are ever in flight, and the chord body closes the run once
+    every lane has finished. Lanes run in parallel on as many workers as are
+    free, so wall time falls with workers rather than growing with assets.
+
+    A lane cut short by an unhandled error fails the chord, which skips the
+    body; the same close is therefore linked as the body's errback, so the run
+    never stays RUNNING.
+    """
+
+    lanes = plan_lanes(members, fleet_run.max_concurrency)
+    header = group(
+        [
+            chain(
+                *[
+                    app.signature(
+                        MEMBER_TASK,
+                        args=(fleet_run.id, member.assessment_id, member.target),
+                        kwargs={"subnet": member.subnet, "rate_per_minute": fleet_run.subnet_rate_per_minute},
+                        immutable=True,
+                    )
+                    for member in lane
+                ]
+            )
+            for lane in lanes
+        ]
+    )
+    finish = app.signature(FINISH_TASK, args=(fleet_run.id,), immutable=True)
+    return chord(header, finish.clone().on_error(finish))
+
+
+class SubnetRateLimiter:
+    """Fixed-window limit on run starts per subnet, shared by all workers through Redis."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        window_seconds: int = 60,
+        unavailable_retry_seconds: int = 10,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._redis = redis_client
+        self._window_seconds = window_seconds
+        self._unavailable_retry_seconds = unavailable_retry_seconds
+        self._clock = clock
+
+    def acquire(self, subnet: str, limit: int) -> float:
+        """Take one start from ``subnet``'s window; return 0, or the seconds until the next window."""
+
+        now = self._clock()
+        window = int(now // self._window_seconds)
+        key = f"fleet:subnet:{subnet}:{window}"
+        try:
+            pipeline = self._redis.pipeline()
+            pipeline.incr(key)
+            pipeline.expire(key, self._window_seconds * 2)
+            started, _ = pipeline.execute()
+        except redis.RedisError:
+            # Without the shared counter the rate cannot be enforced, so wait rather than risk a burst.
+            logger.warning("Subnet rate limiter unavailable", exc_info=True)
+            return float(self._unavailable_retry_seconds)
+        if started <= limit:
+            return 0.0
+        return (window + 1) * self._window_seconds - now
+
+
+@lru_cache()
+def get_subnet_rate_limiter() -> SubnetRateLimiter:
+    """Return the process-wide subnet rate limiter configured from settings."""
+
+    settings = get_settings()
+    return SubnetRateLimiter(redis.Redis.from_url(settings.fleet_rate_limit_redis_url or settings.celery_broker_url))
+
+
+def _session_scope() -> Callable[[], AbstractContextManager[Session]]:
+    from ..database import get_db
+
+    return get_db
+
+
+def execute_fleet_member(
+    fleet_run_id: int,
+    assessment_id: int,
+    target: Mapping,
+    *,
+    subnet: Optional[str] = None,
+    rate_per_minute: Optional[int] = None,
+    limiter: Optional[SubnetRateLimiter] = None,
+    session_scope: Optional[Callable[[], AbstractContextManager[Session]]] = None,
+    **run_options: Any,
+) -> AssessmentStatus:
+    """Run one member of a fleet run and count its outcome towards the run's progress.
+
+    Raises :class:`SubnetRateLimited` before starting if the member's subnet
+    is out of starts; the caller retries it later. Any other error, including
+    a soft time limit, counts the member as failed rather than being raised, so
+    the rest of its lane still runs. If even the outcome cannot be recorded,
+    the member is left for :func:`finish_fleet_run` to settle.
+    """
+
+    if subnet is not None and rate_per_minute:
+        retry_after = (limiter or get_subnet_rate_limiter()).acquire(subnet, rate_per_minute)
+        if retry_after:
+            raise SubnetRateLimited(subnet, retry_after)
+
+    session_scope = session_scope or _session_scope()
+    status = AssessmentStatus.FAILED
+    try:
+        with session_scope() as session:
+            session.execute(_START_RUN, {"fleet_run_id": fleet_run_id})
+        status = execute_assessment(assessment_id, target, session_scope=session_scope, **run_options)
+    except Exception:
+        logger.exception("Fleet member failed", extra={"fleet_run_id": fleet_run_id, "assessment_id": assessment_id})
+
+    try:
+        with session_scope() as session:
+            session.execute(
+                _SETTLE_MEMBER,
+                {"fleet_run_id": fleet_run_id, "assessment_id": assessment_id, "status": status.name},
+            )
+    except Exception:
+        logger.exception(
+            "Fleet member outcome not recorded", extra={"fleet_run_id": fleet_run_id, "assessment_id": assessment_id}
+        )
+    return status
+
+
+def finish_fleet_run(
+    fleet_run_id: int, *, session_scope: Optional[Callable[[], AbstractContextManager[Session]]] = None
+) -> None:
+    """Close a fleet run once all of its lanes have finished, failing members that never reported."""
+
+    with (session_scope or _session_scope())() as session:
+        session.execute(_FINISH_RUN, {"fleet_run_id": fleet_run_id})
+
+
+def fleet_run_status(session: Session, fleet_run_id: int) -> Optional[FleetRunStatus]:
+    """Return a fleet run's state and progress counters, read fresh from the database."""
+
+    fleet_run = session.get(FleetRun, fleet_run_id)
+    if fleet_run is None:
+        return None
+    return FleetRunStatus(
+        id=fleet_run.id,
+        profile_id=fleet_run.profile_id,
+        status=fleet_run.status,
+        total=fleet_run.total,
+        completed=fleet_run.completed,
+        failed=fleet_run.failed,
+        pending=fleet_run.total - fleet_run.completed - fleet_run.failed,
+        max_concurrency=fleet_run.max_concurrency,
+        subnet_rate_per_minute=fleet_run.subnet_rate_per_minute,
+        started_at=fleet_run.started_at,
+        completed_at=fleet_run.completed_at,
+    )
+
+
+def mark_fleet_run_failed(session: Session, fleet_run: FleetRun, members: Sequence[FleetMember]) -> None:
+    """Fail a fleet run that could not be dispatched, along with its queued assessments."""
+
+    now = datetime.now(timezone.utc)
+    fleet_run.status = AssessmentStatus.FAILED
+    fleet_run.completed_at = now
+    fleet_run.failed = fleet_run.total
+    session.execute(
+        Assessment.__table__.update()
+        .where(Assessment.id.in_([member.assessment_id for member in members]))
+        .values(status=AssessmentStatus.FAILED, completed_at=now, updated_at=now)
+    )
+
+
+__all__ = [
+    "FINISH_TASK",
+    "MEMBER_TASK",
+    "FleetMember",
+    "NoMatchingAssets",
+    "SubnetRateLimited",
+    "SubnetRateLimiter",
+    "create_fleet_run",
+    "execute_fleet_member",
+    "finish_fleet_run",
+    "fleet_run_signature",
+    "fleet_run_status",
+    "get_subnet_rate_limiter",
+    "mark_fleet_run_failed",
+    "plan_lanes",
+    "select_assets",
+    "subnet_of",
+]
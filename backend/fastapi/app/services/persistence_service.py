@@ -0,0 +1,161 @@
+"""Bulk persistence of parsed findings into the findings table."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..parsers.base import ParsedFinding
+from .rollup_service import rollup_delta_cte
+
+DEFAULT_BATCH_SIZE = 10_000
+
+# One statement per batch: the parsed columns travel as arrays and are expanded
+# server-side with unnest, so the SQL text is constant and the round trip count
+# does not depend on the number of findings. ``xmax = 0`` distinguishes fresh
+# inserts from conflict updates; rows skipped by the WHERE clause are unchanged
+# and therefore absent from RETURNING.
+#
+# The same statement keeps ``finding_rollups`` current: every CTE sees the
+# snapshot from before the upsert, so ``previous`` holds the old severity and
+# status of rewritten rows, which are decremented while the new values are
+# incremented. Comment-only updates cancel out and touch no rollup. Any write
+# also bumps the assessment's ``finding_versions`` counter, which export ETags
+# are derived from.
+#
+# That snapshot is only exact if no concurrent writer changes the rows after
+# it is taken, so the batch's existing rows are first locked by
+# ``_LOCK_FINDINGS``. The lock is a statement of its own: under READ COMMITTED
+# the upsert then starts after any concurrent upsert or waiver change of those
+# rows has committed and reads their latest values. (``FOR UPDATE`` inside the
+# ``previous`` CTE would not do: it skips rows the same statement has already
+# rewritten.) A rule that a concurrent transaction inserts first has no row to
+# lock yet; its old values are not in ``previous`` and the drift is left for
+# ``reconcile_rollups``.
+_LOCK_FINDINGS = text(
+    """
+    SELECT findings.id FROM findings
+    WHERE findings.assessment_id = :assessment_id
+      AND findings.rule_id = ANY(CAST(:rule_ids AS varchar[]))
+    ORDER BY findings.id
+    FOR UPDATE
+    """
+)
+
+_UPSERT_FINDINGS = text(
+    f"""
+    WITH batch AS (
+        SELECT * FROM unnest(
+            CAST(:rule_ids AS varchar[]), CAST(:severities AS varchar[]),
+            CAST(:statuses AS varchar[]), CAST(:comments AS text[])
+        ) AS batch(rule_id, severity, status, comments)
+    ), previous AS (
+        SELECT findings.rule_id, findings.severity, findings.status, waivers.id IS NOT NULL AS waived
+        FROM findings LEFT JOIN waivers ON waivers.finding_id = findings.id
+        WHERE findings.assessment_id = :assessment_id
+          AND findings.rule_id = ANY(CAST(:rule_ids AS varchar[]))
+    ), upserted AS (
+        INSERT INTO findings (assessment_id, asset_id, rule_id, severity, status, comments, created_at, updated_at)
+        SELECT :assessment_id, :asset_id, batch.rule_id,
+               CAST(batch.severity AS findingseverity), CAST(batch.status AS findingstatus), batch.comments,
+               now(), now()
+        FROM batch
+        ON CONFLICT ON CONSTRAINT uq_findings_assessment_rule DO UPDATE
+        SET asset_id = EXCLUDED.asset_id,
+            severity = EXCLUDED.severity,
+            status = EXCLUDED.status,
+            comments = EXCLUDED.comments,
+            updated_at = EXCLUDED.updated_at
+        WHERE (findings.asset_id, findings.severity, findings.status, findings.comments)
+              IS DISTINCT FROM (EXCLUDED.asset_id, EXCLUDED.severity, EXCLUDED.status, EXCLUDED.comments)
+        RETURNING findings.rule_id, findings.severity, findings.status, (xmax = 0) AS inserted
+    ), changes AS (
+        SELECT CAST(:assessment_id AS integer) AS assessment_id, upserted.severity, upserted.status,
+               coalesce(previous.waived, false) AS waived, 1 AS delta
+        FROM upserted LEFT JOIN previous ON previous.rule_id = upserted.rule_id
+        UNION ALL
+        SELECT CAST(:assessment_id AS integer), previous.severity, previous.status, previous.waived, -1
+        FROM upserted JOIN previous ON previous.rule_id = upserted.rule_id
+        WHERE NOT upserted.inserted
+    ), {rollup_delta_cte("changes")}, versioned AS (
+        INSERT INTO finding_versions (assessment_id, version, created_at, updated_at)
+        SELECT :assessment_id, 1, now(), now() WHERE EXISTS (SELECT 1 FROM upserted)
+        ON CONFLICT (assessment_id) DO UPDATE
+        SET version = finding_versions.version + 1, updated_at = EXCLUDED.updated_at
+    )
+    SELECT inserted FROM upserted
+    """
+)
+
+
+@dataclass(frozen=True)
+class UpsertResult:
+    """Row counts produced by a bulk findings upsert."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+def _batches(findings: Iterable[ParsedFinding], size: int) -> Iterator[List[ParsedFinding]]:
+    iterator = iter(findings)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _batch_params(batch: List[ParsedFinding], *, assessment_id: int, asset_id: int) -> dict:
+    # ON CONFLICT cannot touch the same row twice in one statement, so the last
+    # occurrence of a rule within the batch wins.
+    by_rule: Dict[str, ParsedFinding] = {finding.rule_id: finding for finding in batch}
+    rows = list(by_rule.values())
+    return {
+        "assessment_id": assessment_id,
+        "asset_id": asset_id,
+        "rule_ids": [finding.rule_id for finding in rows],
+        "severities": [finding.severity.name for finding in rows],
+        "statuses": [finding.status.name for finding in rows],
+        "comments": [finding.comments for finding in rows],
+    }
+
+
+def upsert_findings(
+    session: Session,
+    findings: Iterable[ParsedFinding],
+    *,
+    assessment_id: int,
+    asset_id: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> UpsertResult:
+    """Insert or update parsed findings for an assessment in bulk.
+
+    ``findings`` may be any iterable, including the streaming parsers, and is
+    consumed ``batch_size`` rows at a time. Rows are keyed on the
+    ``uq_findings_assessment_rule`` constraint; existing rows are only rewritten
+    when one of the persisted columns actually changed. The assessment's
+    ``finding_rollups`` are adjusted by delta and its ``finding_versions``
+    counter is bumped in the same statement, after the batch's existing rows
+    are locked against concurrent writers.
+    """
+
+    inserted = updated = unchanged = 0
+    for batch in _batches(findings, batch_size):
+        params = _batch_params(batch, assessment_id=assessment_id, asset_id=asset_id)
+        session.execute(_LOCK_FINDINGS, params)
+        flags = session.execute(_UPSERT_FINDINGS, params).scalars().all()
+        batch_inserted = sum(1 for flag in flags if flag)
+        inserted += batch_inserted
+        updated += len(flags) - batch_inserted
+        unchanged += len(params["rule_ids"]) - len(flags)
+
+    return UpsertResult(inserted=inserted, updated=updated, unchanged=unchanged)
+
+
+__all__ = ["DEFAULT_BATCH_SIZE", "UpsertResult", "upsert_findings"]
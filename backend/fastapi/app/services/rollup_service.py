@@ -0,0 +1,147 @@
+"""Posture rollups: per-assessment finding counts maintained by delta."""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from ..enums import AssessmentStatus
+from ..models import Assessment, FindingRollup, Profile
+from ..schemas import FindingSummary, PostureGroup
+
+SUMMARY_GROUPS = ("asset", "profile", "framework")
+
+
+def rollup_delta_cte(source: str) -> str:
+    """Return a ``rolled`` CTE adding the deltas in CTE ``source`` to ``finding_rollups``.
+
+    ``source`` must provide ``assessment_id, severity, status, waived, delta``
+    columns. Increments are applied with ``ON CONFLICT`` arithmetic, so
+    concurrent writers never overwrite each other's counts.
+    """
+
+    return f"""
+    rolled AS (
+        INSERT INTO finding_rollups (assessment_id, severity, status, waived, finding_count, created_at, updated_at)
+        SELECT assessment_id, severity, status, waived, sum(delta), now(), now()
+        FROM {source}
+        GROUP BY assessment_id, severity, status, waived
+        HAVING sum(delta) <> 0
+        ON CONFLICT (assessment_id, severity, status, waived) DO UPDATE
+        SET finding_count = finding_rollups.finding_count + EXCLUDED.finding_count,
+            updated_at = EXCLUDED.updated_at
+    )
+    """
+
+
+_RECONCILE = """
+    WITH actual AS (
+        SELECT findings.assessment_id, findings.severity, findings.status,
+               waivers.id IS NOT NULL AS waived, count(*) AS finding_count
+        FROM findings LEFT JOIN waivers ON waivers.finding_id = findings.id
+        {where_findings}
+        GROUP BY 1, 2, 3, 4
+    ), fixed AS (
+        INSERT INTO finding_rollups (assessment_id, severity, status, waived, finding_count, created_at, updated_at)
+        SELECT assessment_id, severity, status, waived, finding_count, now(), now() FROM actual
+        ON CONFLICT (assessment_id, severity, status, waived) DO UPDATE
+        SET finding_count = EXCLUDED.finding_count, updated_at = EXCLUDED.updated_at
+        WHERE finding_rollups.finding_count <> EXCLUDED.finding_count
+        RETURNING 1
+    ), cleared AS (
+        DELETE FROM finding_rollups
+        WHERE {where_rollups} NOT EXISTS (
+            SELECT 1 FROM actual
+            WHERE (actual.assessment_id, actual.severity, actual.status, actual.waived)
+                = (finding_rollups.assessment_id, finding_rollups.severity,
+                   finding_rollups.status, finding_rollups.waived)
+        )
+        RETURNING finding_count
+    )
+    SELECT (SELECT count(*) FROM fixed) + (SELECT count(*) FROM cleared WHERE finding_count <> 0)
+"""
+
+_RECONCILE_ALL = text(_RECONCILE.format(where_findings="", where_rollups=""))
+_RECONCILE_ASSESSMENTS = text(
+    _RECONCILE.format(
+        where_findings="WHERE findings.assessment_id = ANY(:assessment_ids)",
+        where_rollups="finding_rollups.assessment_id = ANY(:assessment_ids) AND",
+    )
+)
+
+
+def reconcile_rollups(session: Session, assessment_ids: Optional[Sequence[int]] = None) -> int:
+    """Recompute rollups from ``findings`` and fix any that drifted.
+
+    Covers every assessment unless ``assessment_ids`` is given. Only rows whose
+    count differs are written, and rows for combinations that no longer occur
+    are removed. Returns the number of rollup rows that were wrong; emptied
+    rows left behind by delta updates are cleared without being counted.
+    """
+
+    if assessment_ids is None:
+        return session.execute(_RECONCILE_ALL).scalar_one()
+    return session.execute(_RECONCILE_ASSESSMENTS, {"assessment_ids": list(assessment_ids)}).scalar_one()
+
+
+def posture_summary(
+    session: Session,
+    *,
+    group_by: str = "asset",
+    latest_only: bool = True,
+    asset_id: Optional[int] = None,
+    profile_id: Optional[int] = None,
+    framework: Optional[str] = None,
+) -> FindingSummary:
+    """Summarize finding counts per asset, profile or framework from the rollups alone.
+
+    With ``latest_only`` each (asset, profile) pair contributes only its most
+    recent completed assessment, i.e. the current posture; otherwise every
+    assessment is counted. The query touches at most a few dozen rollup rows per assessment,
+    however many findings those assessments hold.
+    """
+
+    if group_by not in SUMMARY_GROUPS:
+        raise ValueError(f"Unknown summary grouping '{group_by}'; expected one of {', '.join(SUMMARY_GROUPS)}")
+
+    key = {"asset": Assessment.asset_id, "profile": Assessment.profile_id, "framework": Profile.framework}[group_by]
+    statement = (
+        select(key, FindingRollup.severity, FindingRollup.status, FindingRollup.waived, func.sum(FindingRollup.finding_count))
+        .join(Assessment, Assessment.id == FindingRollup.assessment_id)
+        .join(Profile, Profile.id == Assessment.profile_id)
+        .group_by(key, FindingRollup.severity, FindingRollup.status, FindingRollup.waived)
+        .order_by(key, FindingRollup.severity, FindingRollup.status)
+    )
+    if latest_only:
+        # Queued, running and failed runs have no posture of their own yet.
+        latest = (
+            select(func.max(Assessment.id))
+            .where(Assessment.status == AssessmentStatus.COMPLETED)
+            .group_by(Assessment.asset_id, Assessment.profile_id)
+        )
+        statement = statement.where(FindingRollup.assessment_id.in_(latest))
+    if asset_id is not None:
+        statement = statement.where(Assessment.asset_id == asset_id)
+    if profile_id is not None:
+        statement = statement.where(Assessment.profile_id == profile_id)
+    if framework is not None:
+        statement = statement.where(Profile.framework == framework)
+
+    groups: Dict[str, PostureGroup] = {}
+    for group_key, severity, status, waived, count in session.execute(statement):
+        if not count:
+            continue
+        group = groups.get(str(group_key))
+        if group is None:
+            group = groups[str(group_key)] = PostureGroup(key=str(group_key), total=0, waived=0, by_severity={})
+        group.total += count
+        if waived:
+            group.waived += count
+        statuses = group.by_severity.setdefault(severity.value, {})
+        statuses[status.value] = statuses.get(status.value, 0) + count
+    return FindingSummary(group_by=group_by, latest_only=latest_only, groups=list(groups.values()))
+
+
+__all__ = ["SUMMARY_GROUPS", "posture_summary", "reconcile_rollups", "rollup_delta_cte"]
@@ -0,0 +1,155 @@
+"""Delta computation pushed into the database over persisted findings."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from ..enums import FindingSeverity, FindingStatus
+from ..schemas import DeltaFinding, DeltaReport, DeltaSummary
+from .delta_service import _OUTCOMES, _SEVERITY_CODE, _STATUS_RANK, CompactReport
+
+# Enum columns hold member names; the ranking mirrors ``_STATUS_RANK`` so the
+# SQL and Python paths classify changes identically.
+_RANK_CASES = " ".join(f"WHEN '{status.name}' THEN {rank}" for status, rank in _STATUS_RANK.items())
+
+# One FULL OUTER JOIN of the two assessments on rule_id. Both sides are range
+# scans of the (assessment_id, rule_id) index behind uq_findings_assessment_rule.
+# Rows are ordered with the "C" collation to match Python's code point ordering.
+_DELTA_CTE = f"""
+    WITH baseline AS (
+        SELECT rule_id, severity, status FROM findings WHERE assessment_id = :baseline_id
+    ), post AS (
+        SELECT rule_id, severity, status FROM findings WHERE assessment_id = :post_id
+    ), joined AS (
+        SELECT COALESCE(post.rule_id, baseline.rule_id) AS rule_id,
+               CAST(COALESCE(post.severity, baseline.severity) AS text) AS severity,
+               CAST(baseline.status AS text) AS before_status,
+               CAST(post.status AS text) AS after_status,
+               CASE CAST(baseline.status AS text) {_RANK_CASES} END AS before_rank,
+               CASE CAST(post.status AS text) {_RANK_CASES} END AS after_rank
+        FROM baseline FULL OUTER JOIN post ON post.rule_id = baseline.rule_id
+    ), classified AS (
+        SELECT rule_id, severity, before_status, after_status,
+               before_status IS DISTINCT FROM after_status AS changed,
+               CASE
+                   WHEN after_status IS NULL OR before_status = after_status THEN 'unchanged'
+                   WHEN before_status IS NULL THEN
+                       CASE after_status
+                           WHEN '{FindingStatus.OPEN.name}' THEN 'regressed'
+                           WHEN '{FindingStatus.NOT_A_FINDING.name}' THEN 'improved'
+                           ELSE 'unchanged'
+                       END
+                   WHEN after_rank < before_rank THEN 'improved'
+                   WHEN after_rank > before_rank THEN 'regressed'
+                   ELSE 'unchanged'
+               END AS outcome
+        FROM joined
+    )
+"""
+
+_SUMMARY_CTE = """
+    , summary AS (
+        SELECT severity,
+               count(*) FILTER (WHERE outcome = 'improved') AS improved,
+               count(*) FILTER (WHERE outcome = 'regressed') AS regressed,
+               count(*) FILTER (WHERE outcome = 'unchanged') AS unchanged,
+               min(rule_id COLLATE "C") AS first_rule
+        FROM classified
+        GROUP BY severity
+    )
+"""
+
+# Rows and per-severity buckets come back from one statement, so they share a
+# snapshot and the join runs once: ``classified`` is referenced twice and is
+# therefore materialized. Summary lines follow the rows; buckets are ordered by
+# each severity's first rule, matching the insertion order of the in-Python
+# summary.
+_DELTA_REPORT = text(
+    _DELTA_CTE
+    + _SUMMARY_CTE
+    + """
+    SELECT * FROM (
+        SELECT false AS is_summary, rule_id, severity, before_status, after_status, changed,
+               NULL::bigint AS improved, NULL::bigint AS regressed, NULL::bigint AS unchanged
+        FROM classified
+        WHERE changed OR NOT :changed_only
+        UNION ALL
+        SELECT true, first_rule, severity, NULL, NULL, NULL, improved, regressed, unchanged
+        FROM summary
+    ) AS report
+    ORDER BY is_summary, rule_id COLLATE "C"
+    """
+).bindparams(bindparam("changed_only", value=False))
+
+_DELTA_SUMMARY = text(
+    _DELTA_CTE
+    + _SUMMARY_CTE
+    + """
+    SELECT severity, improved, regressed, unchanged FROM summary ORDER BY first_rule
+    """
+)
+
+_ASSESSMENT_FINDINGS = text(
+    """
+    SELECT rule_id, CAST(severity AS text), CAST(status AS text)
+    FROM findings WHERE assessment_id = :assessment_id
+    """
+)
+
+
+def _summary(buckets: Iterable[Tuple[str, int, int, int]]) -> DeltaSummary:
+    by_severity: Dict[str, Dict[str, int]] = {}
+    for severity, *counts in buckets:
+        by_severity[FindingSeverity[severity].value] = dict(zip(_OUTCOMES, counts))
+    totals = {outcome: sum(bucket[outcome] for bucket in by_severity.values()) for outcome in _OUTCOMES}
+    return DeltaSummary(total=sum(totals.values()), by_severity=by_severity, **totals)
+
+
+def compute_delta_summary_sql(session: Session, baseline_id: int, post_id: int) -> DeltaSummary:
+    """Aggregate the delta between two persisted assessments entirely in SQL."""
+
+    return _summary(session.execute(_DELTA_SUMMARY, {"baseline_id": baseline_id, "post_id": post_id}))
+
+
+def compute_delta_sql(
+    session: Session, baseline_id: int, post_id: int, *, changed_only: bool = False
+) -> DeltaReport:
+    """Return the same :class:`DeltaReport` as ``compute_delta`` for persisted findings.
+
+    The join, status ranking and severity bucketing all run in the database,
+    in a single statement; Python only maps result rows onto the response
+    models.
+    """
+
+    params = {"baseline_id": baseline_id, "post_id": post_id, "changed_only": changed_only}
+    findings: List[DeltaFinding] = []
+    buckets: List[Tuple[str, int, int, int]] = []
+    for is_summary, rule_id, severity, before, after, changed, *counts in session.execute(_DELTA_REPORT, params):
+        if is_summary:
+            buckets.append((severity, *counts))
+            continue
+        findings.append(
+            DeltaFinding.construct(
+                rule_id=rule_id,
+                severity=FindingSeverity[severity],
+                before_status=FindingStatus[before] if before else None,
+                after_status=FindingStatus[after] if after else None,
+                changed=changed,
+            )
+        )
+    return DeltaReport.construct(findings=findings, summary=_summary(buckets))
+
+
+def load_compact(session: Session, assessment_id: int) -> CompactReport:
+    """Load an assessment's persisted findings in the compact form used by the Python engines."""
+
+    rows = session.execute(_ASSESSMENT_FINDINGS, {"assessment_id": assessment_id}).all()
+    severities = bytes(_SEVERITY_CODE[FindingSeverity[severity]] for _rule, severity, _status in rows)
+    statuses = bytes(_STATUS_RANK[FindingStatus[status]] for _rule, _severity, status in rows)
+    return [rule_id for rule_id, _severity, _status in rows], severities, statuses
+
+
+__all__ = ["compute_delta_sql", "compute_delta_summary_sql", "load_compact"]
@@ -0,0 +1,141 @@
+"""Asynchronous CKL ingestion jobs: spooled uploads parsed on the Celery workers.
+
+An accepted upload is spooled to the directory shared by the API and the
+workers. The worker streams it through the CKL parser and writes the
+normalized findings next to it as gzipped NDJSON, so the result backend only
+ever holds a count rather than the findings themselves.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import IO, Callable, Iterator, List, Optional
+
+from ..parsers import get_parser
+
+# Recorded in the result backend when a job is accepted, so that ids never
+# issued (which Celery reports as PENDING) can be told apart from queued jobs.
+ACCEPTED_STATE = "ACCEPTED"
+
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+_RESULTS_SUFFIX = ".findings.ndjson.gz"
+# Everything a job leaves in the spool: uploads a lost or rejected job never
+# parsed, results files, and results a dead worker left half written.
+_SPOOL_PATTERNS = ("*.ckl", f"*{_RESULTS_SUFFIX}", f"*{_RESULTS_SUFFIX}.part")
+
+
+def is_job_id(value: str) -> bool:
+    """Return whether ``value`` has the shape of an issued job id."""
+
+    return _JOB_ID.fullmatch(value) is not None
+
+
+def upload_path(directory: str, job_id: str) -> Path:
+    return Path(directory) / f"{job_id}.ckl"
+
+
+def results_path(directory: str, job_id: str) -> Path:
+    return Path(directory) / f"{job_id}{_RESULTS_SUFFIX}"
+
+
+def spool_upload(stream: IO[bytes], directory: str, job_id: str, chunk_size: int) -> Path:
+    """Copy an upload to the spool directory in ``chunk_size`` pieces."""
+
+    target = upload_path(directory, job_id)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("wb") as destination:
+        shutil.copyfileobj(stream, destination, chunk_size)
+    return target
+
+
+def ingest_spooled_ckl(
+    directory: str,
+    job_id: str,
+    *,
+    asset_id: Optional[int] = None,
+    chunk_size: int = 1024 * 1024,
+    on_progress: Optional[Callable[[int], None]] = None,
+    progress_interval: int = 500,
+) -> int:
+    """Parse a spooled CKL upload into its results file and return the finding count.
+
+    The spooled upload is removed once parsed, and a partially written results
+    file is removed if parsing fails.
+    """
+
+    source = upload_path(directory, job_id)
+    target = results_path(directory, job_id)
+    partial = target.with_name(f"{target.name}.part")
+    iter_ckl = get_parser("ckl")
+    count = 0
+    try:
+        with source.open("rb") as stream, gzip.open(partial, "wt", encoding="utf-8") as out:
+            for item in iter_ckl(stream, asset_id=asset_id, chunk_size=chunk_size):
+                record = {
+                    "rule_id": item.rule_id,
+                    "severity": item.severity.value,
+                    "status": item.status.value,
+                    "comments": item.comments,
+                    "asset_id": asset_id or 0,
+                }
+                out.write(json.dumps(record, separators=(",", ":")))
+                out.write("\n")
+                count += 1
+                if on_progress is not None and count % progress_interval == 0:
+                    on_progress(count)
+        partial.replace(target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        source.unlink(missing_ok=True)
+    return count
+
+
+def iter_results(directory: str, job_id: str) -> Iterator[dict]:
+    """Yield the normalized findings of a completed job; raises if they were purged."""
+
+    with gzip.open(results_path(directory, job_id), "rt", encoding="utf-8") as lines:
+        for line in lines:
+            yield json.loads(line)
+
+
+def read_results(directory: str, job_id: str) -> List[dict]:
+    return list(iter_results(directory, job_id))
+
+
+def purge_results(directory: str, max_age_seconds: float, *, now: Optional[float] = None) -> int:
+    """Remove spooled uploads and results files older than ``max_age_seconds``.
+
+    Returns how many files were removed.
+    """
+
+    cutoff = (time.time() if now is None else now) - max_age_seconds
+    removed = 0
+    spool = Path(directory)
+    for path in (path for pattern in _SPOOL_PATTERNS for path in spool.glob(pattern)):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+__all__ = [
+    "ACCEPTED_STATE",
+    "ingest_spooled_ckl",
+    "is_job_id",
+    "iter_results",
+    "purge_results",
+    "read_results",
+    "results_path",
+    "spool_upload",
+    "upload_path",
+]
@@ -0,0 +1,90 @@
+"""Granting and revoking finding waivers while keeping posture rollups current."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..schemas import WaiverRead
+from .rollup_service import rollup_delta_cte
+
+# Taken as a statement of its own before either waiver statement, so that the
+# finding's severity and status read below are the latest committed ones and a
+# concurrent findings upsert waits for the waiver change (see
+# ``persistence_service``).
+_LOCK_FINDING = text("SELECT findings.id FROM findings WHERE findings.id = :finding_id FOR UPDATE")
+
+# Moves the finding's rollup count between the waived and unwaived rows. Only
+# a newly created waiver shifts it; re-granting just refreshes the approval.
+_GRANT_WAIVER = text(
+    f"""
+    WITH granted AS (
+        INSERT INTO waivers (finding_id, approved_by, justification, expires_at, created_at, updated_at)
+        SELECT findings.id, :approved_by, :justification, :expires_at, now(), now()
+        FROM findings WHERE findings.id = :finding_id
+        ON CONFLICT (finding_id) DO UPDATE
+        SET approved_by = EXCLUDED.approved_by,
+            justification = EXCLUDED.justification,
+            expires_at = EXCLUDED.expires_at,
+            updated_at = EXCLUDED.updated_at
+        RETURNING finding_id, approved_by, justification, expires_at, (xmax = 0) AS inserted
+    ), changes AS (
+        SELECT findings.assessment_id, findings.severity, findings.status, shift.waived, shift.delta
+        FROM granted
+        JOIN findings ON findings.id = granted.finding_id
+        CROSS JOIN (VALUES (false, -1), (true, 1)) AS shift(waived, delta)
+        WHERE granted.inserted
+    ), {rollup_delta_cte("changes")}
+    SELECT finding_id, approved_by, justification, expires_at FROM granted
+    """
+)
+
+_REVOKE_WAIVER = text(
+    f"""
+    WITH revoked AS (
+        DELETE FROM waivers WHERE finding_id = :finding_id RETURNING finding_id
+    ), changes AS (
+        SELECT findings.assessment_id, findings.severity, findings.status, shift.waived, shift.delta
+        FROM revoked
+        JOIN findings ON findings.id = revoked.finding_id
+        CROSS JOIN (VALUES (true, -1), (false, 1)) AS shift(waived, delta)
+    ), {rollup_delta_cte("changes")}
+    SELECT count(*) FROM revoked
+    """
+)
+
+
+def grant_waiver(
+    session: Session,
+    finding_id: int,
+    *,
+    approved_by: str,
+    justification: Optional[str] = None,
+    expires_at: Optional[datetime] = None,
+) -> Optional[WaiverRead]:
+    """Waive ``finding_id``, or update its existing waiver; ``None`` if the finding does not exist."""
+
+    session.execute(_LOCK_FINDING, {"finding_id": finding_id})
+    row = session.execute(
+        _GRANT_WAIVER,
+        {
+            "finding_id": finding_id,
+            "approved_by": approved_by,
+            "justification": justification,
+            "expires_at": expires_at,
+        },
+    ).first()
+    return WaiverRead(**row._mapping) if row is not None else None
+
+
+def revoke_waiver(session: Session, finding_id: int) -> bool:
+    """Remove the waiver on ``finding_id``; ``False`` if it had none."""
+
+    session.execute(_LOCK_FINDING, {"finding_id": finding_id})
+    return bool(session.execute(_REVOKE_WAIVER, {"finding_id": finding_id}).scalar_one())
+
+
+__all__ = ["grant_waiver", "revoke_waiver"]
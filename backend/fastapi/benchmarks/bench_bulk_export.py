@@ -0,0 +1,81 @@
+"""Benchmark streamed bulk CKL export across many assets.
+
+Usage::
+
+    python -m backend.fastapi.benchmarks.bench_bulk_export --assets 500 --rules 1000
+
+Renders one checklist per asset into a zip, once serially in-process and once
+on the shared process pool, and discards the archive chunks as they are
+yielded, as a streaming response would.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import cycle, islice
+
+from ..app.enums import FindingSeverity, FindingStatus
+from ..app.services.bulk_export_service import render_ckl, stream_ckl_zip
+
+
+class _InlineExecutor(Executor):
+    """Runs submissions immediately in the calling thread."""
+
+    def __init__(self, max_workers: int) -> None:
+        self._max_workers = max_workers
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def _assets(count: int, rules: int) -> list:
+    kinds = list(islice(cycle(zip(FindingSeverity, FindingStatus)), rules))
+    rows = [(f"SV-{index}r1_rule", severity, status, "x" * 80) for index, (severity, status) in enumerate(kinds)]
+    return [(f"host-{index:04d}.example.mil", rows) for index in range(count)]
+
+
+def _run(assets, executor) -> tuple[float, int, int]:
+    started = time.perf_counter()
+    size = largest = 0
+    for chunk in stream_ckl_zip(assets, executor=executor, max_in_flight=2 * executor._max_workers):
+        size += len(chunk)
+        largest = max(largest, len(chunk))
+    return time.perf_counter() - started, size, largest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    assets = _assets(args.assets, args.rules)
+    raw = len(render_ckl(*assets[0])) * args.assets
+
+    pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+    list(pool.map(render_ckl, *zip(*assets[: args.workers])))  # start the workers
+
+    for name, executor in (("serial", _InlineExecutor(max_workers=1)), (f"pool x{args.workers}", pool)):
+        elapsed, size, largest = _run(assets, executor)
+        print(
+            f"{name:>10}: {args.assets} checklists ({raw / 2**20:,.0f} MB of CKL -> {size / 2**20:,.1f} MB zip) "
+            f"in {elapsed:.2f}s; {args.assets / elapsed:,.0f} assets/s, {raw / 2**20 / elapsed:,.0f} MB/s; "
+            f"largest chunk {largest / 2**10:,.0f} KB"
+        )
+
+    payload = b"".join(stream_ckl_zip(assets[:3], executor=pool, max_in_flight=2))
+    assert zipfile.ZipFile(io.BytesIO(payload)).testzip() is None
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark CKL (XML) against CKLB (JSON) export and parsing.
+
+Usage::
+
+    python -m backend.fastapi.benchmarks.bench_checklist_formats --rules 50000
+
+Both formats go through the same severity/status normalization, so the
+difference in timings is the cost of the serialization format itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+from itertools import cycle, islice
+
+from ..app.enums import FindingSeverity, FindingStatus
+from ..app.parsers.ckl_parser import iter_ckl
+from ..app.parsers.cklb_parser import iter_cklb
+from ..app.schemas import FindingBase
+from ..app.services.export_service import generate_ckl, generate_cklb
+
+
+def _findings(count: int) -> list:
+    kinds = islice(cycle(zip(FindingSeverity, FindingStatus)), count)
+    return [
+        FindingBase(rule_id=f"SV-{index}r1_rule", severity=severity, status=status, comments="x" * 80, asset_id=1)
+        for index, (severity, status) in enumerate(kinds)
+    ]
+
+
+def _time(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=50_000)
+    args = parser.parse_args()
+
+    findings = _findings(args.rules)
+    for name, generate, iterate in (("ckl", generate_ckl, iter_ckl), ("cklb", generate_cklb, iter_cklb)):
+        export_elapsed, payload = _time(generate, findings, "bench-host")
+        data = payload.encode("utf-8")
+        parse_elapsed, parsed = _time(lambda: sum(1 for _ in iterate(io.BytesIO(data))))
+        print(
+            f"{name:>4}: {len(data) / 2**20:6.1f} MB; export {export_elapsed:.2f}s "
+            f"({args.rules / export_elapsed:,.0f} rules/s); parse {parsed} rules in {parse_elapsed:.2f}s "
+            f"({parsed / parse_elapsed:,.0f} rules/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
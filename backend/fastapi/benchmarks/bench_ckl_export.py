@@ -0,0 +1,82 @@
+"""Benchmark streaming CKL export against building a full ElementTree.
+
+Usage::
+
+    python -m backend.fastapi.benchmarks.bench_ckl_export --rules 100000
+
+Reports wall time and the peak traced allocation of each exporter; the
+streaming exporter's chunks are discarded as they are produced, as they would
+be when written to a response.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from ..app.services.export_service import _SEVERITY_LABEL, _STATUS_LABEL, stream_ckl
+from .bench_checklist_formats import _findings
+
+
+def _generate_ckl_etree(findings, asset_name: str) -> str:
+    """The tree-building exporter that ``stream_ckl`` replaced."""
+
+    checklist = ET.Element("CHECKLIST")
+    asset = ET.SubElement(checklist, "ASSET")
+    ET.SubElement(asset, "ASSET_NAME").text = asset_name
+    istig = ET.SubElement(ET.SubElement(checklist, "STIGS"), "iSTIG")
+    for finding in findings:
+        vuln = ET.SubElement(istig, "VULN")
+        ET.SubElement(vuln, "STATUS").text = _STATUS_LABEL.get(finding.status, "Not_Reviewed")
+        ET.SubElement(vuln, "FINDING_DETAILS").text = finding.comments or ""
+        ET.SubElement(vuln, "COMMENTS").text = finding.comments or ""
+        for attribute, value in (
+            ("Vuln_Num", finding.rule_id),
+            ("Rule_ID", finding.rule_id),
+            ("Severity", _SEVERITY_LABEL.get(finding.severity, "low")),
+        ):
+            stig_data = ET.SubElement(vuln, "STIG_DATA")
+            ET.SubElement(stig_data, "VULN_ATTRIBUTE").text = attribute
+            ET.SubElement(stig_data, "ATTRIBUTE_DATA").text = value
+    return ET.tostring(checklist, encoding="utf-8", xml_declaration=True).decode("utf-8")
+
+
+def _drain(findings) -> int:
+    return sum(len(chunk) for chunk in stream_ckl(findings, "bench-host"))
+
+
+def _peak_allocation(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=100_000)
+    args = parser.parse_args()
+
+    findings = _findings(args.rules)
+    # Time without tracing, then trace separately: tracemalloc slows both sides.
+    exporters = (
+        ("etree", lambda: len(_generate_ckl_etree(findings, "bench-host").encode("utf-8"))),
+        ("stream", lambda: _drain(findings)),
+    )
+    for name, func in exporters:
+        started = time.perf_counter()
+        size = func()
+        elapsed = time.perf_counter() - started
+        peak = _peak_allocation(func)
+        print(
+            f"{name:>6}: {size / 2**20:6.1f} MB in {elapsed:.2f}s ({args.rules / elapsed:,.0f} VULNs/s); "
+            f"peak allocation {peak / 2**20:,.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark the streaming XCCDF/ARF parser on a synthetic SCC-style ARF file.
+
+Usage::
+
+    python -m backend.fastapi.benchmarks.bench_xccdf_parser --size-mb 300
+
+The synthetic report puts a large OVAL results payload ahead of the XCCDF
+TestResult, which is the worst case for memory: everything before the
+rule-results has to be streamed past and discarded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from ..app.parsers.xccdf_parser import iter_xccdf
+
+_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<arf:asset-report-collection xmlns:arf="http://scap.nist.gov/schema/asset-reporting-format/1.1">'
+    "<arf:reports><arf:report id=\"oval0\"><arf:content>"
+    '<oval_results xmlns="http://oval.mitre.org/XMLSchema/oval-results-5"><results><system><definitions>'
+)
+_OVAL_DEFINITION = (
+    '<definition definition_id="oval:mil.disa.stig.rhel8:def:{index}" result="true" version="1">'
+    '<criteria operator="AND" result="true"><criterion test_ref="oval:mil.disa.stig.rhel8:tst:{index}" '
+    'result="true"/></criteria></definition>'
+)
+_TEST_RESULT_OPEN = (
+    "</definitions></system></results></oval_results></arf:content></arf:report>"
+    '<arf:report id="xccdf1"><arf:content>'
+    '<TestResult xmlns="http://checklists.nist.gov/xccdf/1.2" id="xccdf_mil.disa.stig_testresult_bench">'
+    "<target>bench-host</target><target-address>10.0.0.1</target-address>"
+)
+_RULE_RESULT = (
+    '<rule-result idref="xccdf_mil.disa.stig_rule_SV-{index}r1_rule" severity="medium" weight="10.0">'
+    "<result>{result}</result><ident system=\"http://cyber.mil/cci\">CCI-000366</ident></rule-result>"
+)
+_FOOTER = "</TestResult></arf:content></arf:report></arf:reports></arf:asset-report-collection>"
+
+
+def _write_synthetic_arf(path: str, size_bytes: int, rules: int) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(_HEADER)
+        index = 0
+        while handle.tell() < size_bytes:
+            handle.write("".join(_OVAL_DEFINITION.format(index=index + offset) for offset in range(1000)))
+            index += 1000
+        handle.write(_TEST_RESULT_OPEN)
+        for rule in range(rules):
+            handle.write(_RULE_RESULT.format(index=rule, result="fail" if rule % 3 == 0 else "pass"))
+        handle.write(_FOOTER)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--rules", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "synthetic-arf.xml")
+        _write_synthetic_arf(path, args.size_mb * 1024 * 1024, args.rules)
+        size = os.path.getsize(path)
+
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        with open(path, "rb") as stream:
+            parsed = sum(1 for _ in iter_xccdf(stream))
+        elapsed = time.perf_counter() - started
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(
+        f"parsed {parsed} rule-results from {size / 2**20:.0f} MB in {elapsed:.2f}s "
+        f"({size / 2**20 / elapsed:.1f} MB/s); peak RSS {peak_rss / 1024:.0f} MB "
+        f"(+{(peak_rss - baseline_rss) / 1024:.0f} MB while parsing)"
+    )
+
+
+if __name__ == "__main__":
+    main()
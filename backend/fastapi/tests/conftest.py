@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+# The API modules read settings at import time; no test connects to this database.
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://aegis@localhost/aegis")
+
+
+@pytest.fixture
+def pg_session():
+    """A session on ``AEGIS_TEST_DATABASE_URL`` inside a transaction rolled back afterwards.
+
+    The schema is created in a scratch namespace within that transaction, so
+    nothing outlives the test. Skipped when no test database is configured.
+    """
+
+    url = os.environ.get("AEGIS_TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("AEGIS_TEST_DATABASE_URL is not set")
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    from backend.fastapi.app.models import Base
+
+    engine = create_engine(url, future=True)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.execute(text("CREATE SCHEMA aegis_test"))
+        connection.execute(text("SET LOCAL search_path TO aegis_test"))
+        Base.metadata.create_all(connection)
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_engine():
+    """An engine on ``AEGIS_TEST_DATABASE_URL`` whose connections share a committed scratch schema.
+
+    For tests that need several concurrent transactions; the schema is dropped
+    afterwards. Skipped when no test database is configured.
+    """
+
+    url = os.environ.get("AEGIS_TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("AEGIS_TEST_DATABASE_URL is not set")
+
+    from sqlalchemy import create_engine, text
+
+    from backend.fastapi.app.models import Base
+
+    engine = create_engine(url, future=True, connect_args={"options": "-csearch_path=aegis_test_shared"})
+    with engine.begin() as connection:
+        connection.execute(text("CREATE SCHEMA aegis_test_shared"))
+        Base.metadata.create_all(connection)
+    try:
+        yield engine
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("DROP SCHEMA aegis_test_shared CASCADE"))
+        engine.dispose()
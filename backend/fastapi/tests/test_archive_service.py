@@ -0,0 +1,209 @@
+"""Tests for archive ingestion."""
+
+import io
+import multiprocessing
+import os
+import tarfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from backend.fastapi.app.services import archive_service
+from backend.fastapi.app.services.archive_service import (
+    ArchiveError,
+    discard_parse_executor,
+    get_parse_executor,
+    ingest_archive,
+)
+from backend.fastapi.tests.test_ckl_parser import SAMPLE_CKL
+
+
+def _checklist(host: str) -> bytes:
+    asset = f"<ASSET><HOST_NAME>{host}</HOST_NAME></ASSET>"
+    return SAMPLE_CKL.replace("<CHECKLIST>", f"<CHECKLIST>{asset}").encode("utf-8")
+
+
+MEMBERS = {
+    "bundle/web01-rhel8.ckl": _checklist("web01"),
+    "bundle/web01-apache.ckl": _checklist("web01"),
+    "bundle/db01-rhel8.ckl": _checklist("db01"),
+    "bundle/broken.ckl": b"<CHECKLIST><VULN>",
+    "bundle/README.txt": b"not a checklist",
+}
+
+
+def _zip_bundle() -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, payload in MEMBERS.items():
+            archive.writestr(name, payload)
+    buffer.seek(0)
+    return buffer
+
+
+def _tar_bundle() -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, payload in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(payload)
+            archive.addfile(info, io.BytesIO(payload))
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize("bundle", [_zip_bundle, _tar_bundle])
+def test_ingest_archive_merges_per_asset_and_reports_errors(bundle, executor):
+    result = ingest_archive(bundle(), asset_id=4, executor=executor, max_in_flight=2)
+
+    assert result.files == 5
+    assert sorted(result.assets) == ["db01", "web01"]
+    assert len(result.assets["web01"]) == 2
+    assert all(finding.asset_id == 4 for finding in result.assets["db01"])
+    errors = {error.file: error.detail for error in result.errors}
+    assert errors == {
+        "bundle/broken.ckl": "Invalid CKL XML payload",
+        "bundle/README.txt": "Unsupported file type",
+    }
+
+
+def test_ingest_archive_rejects_non_archives(executor):
+    with pytest.raises(ArchiveError):
+        ingest_archive(io.BytesIO(b"plain text"), executor=executor, max_in_flight=2)
+
+
+def _damage_zip_member(buffer: io.BytesIO, name: str) -> io.BytesIO:
+    data = bytearray(buffer.getvalue())
+    info = zipfile.ZipFile(io.BytesIO(bytes(data))).getinfo(name)
+    start = info.header_offset + 30 + len(info.filename.encode()) + len(info.extra)
+    data[start : start + 8] = b"\xff" * 8
+    return io.BytesIO(bytes(data))
+
+
+def test_ingest_archive_reports_damaged_zip_members_and_keeps_going(executor):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("web01.ckl", _checklist("web01"))
+        archive.writestr("db01.ckl", _checklist("db01"))
+    damaged = _damage_zip_member(buffer, "web01.ckl")
+
+    result = ingest_archive(damaged, executor=executor, max_in_flight=2)
+
+    assert sorted(result.assets) == ["db01"]
+    ((name, detail),) = [(error.file, error.detail) for error in result.errors]
+    assert name == "web01.ckl"
+    assert detail.startswith("Unreadable archive member")
+
+
+def test_ingest_archive_reports_truncated_tar_streams(executor):
+    payload = _tar_bundle().getvalue()
+    truncated = io.BytesIO(payload[: len(payload) * 2 // 3])
+
+    result = ingest_archive(truncated, executor=executor, max_in_flight=2)
+
+    *_, last = result.errors
+    assert last.detail.endswith("the rest of the archive was not read")
+    assert result.files < len(MEMBERS)
+
+
+_parse_member = archive_service._parse_member
+
+
+def _crashing_parse(name, payload, asset_id):
+    if payload == b"crash":
+        os._exit(1)
+    if payload == b"boom":
+        raise RuntimeError("parser bug")
+    return _parse_member(name, payload, asset_id)
+
+
+def _bundle(members) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, payload in members.items():
+            archive.writestr(name, payload)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture
+def forked_shared_pool(monkeypatch):
+    """Make the shared pool fork its workers, so they see this module's patches."""
+
+    fork = multiprocessing.get_context("fork")
+    monkeypatch.setattr(archive_service, "_parse_member", _crashing_parse)
+    monkeypatch.setattr(archive_service.multiprocessing, "get_context", lambda method: fork)
+    monkeypatch.setattr(archive_service, "parse_workers", lambda: 2)
+    monkeypatch.setattr(archive_service, "_executor", None)
+    yield
+    if archive_service._executor is not None:
+        archive_service._executor.shutdown()
+
+
+def test_worker_crash_is_reported_for_its_member_and_the_pool_replaced(forked_shared_pool):
+    members = {
+        "web01-rhel8.ckl": _checklist("web01"),
+        "crash.ckl": b"crash",
+        "web01-apache.ckl": _checklist("web01"),
+        "db01-rhel8.ckl": _checklist("db01"),
+    }
+
+    broken = get_parse_executor()
+    result = ingest_archive(_bundle(members), max_in_flight=2)
+
+    assert sorted((asset, len(findings)) for asset, findings in result.assets.items()) == [("db01", 1), ("web01", 2)]
+    assert [(error.file, error.detail) for error in result.errors] == [
+        ("crash.ckl", "Parser process crashed on this checklist")
+    ]
+    assert get_parse_executor() is not broken
+    assert ingest_archive(_bundle({"db01.ckl": _checklist("db01")})).assets.keys() == {"db01"}
+
+
+def test_unexpected_parse_errors_are_reported_per_file(monkeypatch):
+    monkeypatch.setattr(archive_service, "_parse_member", _crashing_parse)
+    members = {"web01.ckl": _checklist("web01"), "boom.ckl": b"boom"}
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        result = ingest_archive(_bundle(members), executor=pool, max_in_flight=2)
+
+    assert sorted(result.assets) == ["web01"]
+    assert [(error.file, error.detail) for error in result.errors] == [
+        ("boom.ckl", "Checklist could not be parsed: parser bug")
+    ]
+
+
+def test_shared_pool_is_created_once_and_replaced_after_discard(monkeypatch):
+    created = []
+
+    class _Pool:
+        def __init__(self, **options):
+            time.sleep(0.05)
+            created.append(self)
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    monkeypatch.setattr(archive_service, "ProcessPoolExecutor", _Pool)
+    monkeypatch.setattr(archive_service, "_executor", None)
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(get_parse_executor())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1 and all(pool is created[0] for pool in pools)
+    shared = created[0]
+    discard_parse_executor(object())
+    assert get_parse_executor() is shared
+    discard_parse_executor(shared)
+    assert get_parse_executor() is created[-1] is not shared
@@ -0,0 +1,100 @@
+"""Tests for the ASFF parser."""
+
+import io
+import json
+
+import pytest
+
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.parsers import detect_format
+from backend.fastapi.app.parsers.asff_parser import ASFFParserError, iter_asff, iter_asff_assets, parse_asff
+from backend.fastapi.app.parsers.base import RULE_ID_MAX_LENGTH
+
+_BUCKET = "arn:aws:s3:::audit-logs"
+_ROLE = "arn:aws:iam::111122223333:role/admin"
+
+
+def _finding(check: str, label: str, status: str | None, arn: str, kind: str) -> dict:
+    item = {
+        "SchemaVersion": "2018-10-08",
+        "Id": f"prowler-{check}-111122223333-us-east-1-abc",
+        "GeneratorId": f"prowler-{check}",
+        "AwsAccountId": "111122223333",
+        "Title": f"{check} title",
+        "Severity": {"Label": label},
+        "Resources": [{"Type": kind, "Id": arn, "Region": "us-east-1"}],
+    }
+    if status:
+        item["Compliance"] = {"Status": status}
+    return item
+
+
+_FINDINGS = [
+    _finding("s3_bucket_public_access", "CRITICAL", "FAILED", _BUCKET, "AwsS3Bucket"),
+    _finding("s3_bucket_versioning", "MEDIUM", "PASSED", _BUCKET, "AwsS3Bucket"),
+    _finding("iam_role_admin", "LOW", "WARNING", _ROLE, "AwsIamRole"),
+    _finding("iam_inventory", "INFORMATIONAL", None, _ROLE, "AwsIamRole"),
+]
+
+
+@pytest.mark.parametrize("document", [_FINDINGS, {"findings": _FINDINGS}, {"Findings": _FINDINGS}])
+def test_iter_asff_maps_severity_compliance_and_resource(document):
+    payload = json.dumps(document).encode()
+
+    findings = list(iter_asff(io.BytesIO(payload), asset_id=2, chunk_size=64))
+
+    assert detect_format(payload) == "asff"
+    assert [(f.rule_id, f.severity, f.status, f.host) for f in findings] == [
+        (f"prowler-s3_bucket_public_access@{_BUCKET}", FindingSeverity.CAT_I, FindingStatus.OPEN, _BUCKET),
+        (f"prowler-s3_bucket_versioning@{_BUCKET}", FindingSeverity.CAT_II, FindingStatus.NOT_A_FINDING, _BUCKET),
+        (f"prowler-iam_role_admin@{_ROLE}", FindingSeverity.CAT_III, FindingStatus.REVIEW_REQUIRED, _ROLE),
+        (f"prowler-iam_inventory@{_ROLE}", FindingSeverity.INFO, FindingStatus.NOT_A_FINDING, _ROLE),
+    ]
+    assert findings[0].comments == "s3_bucket_public_access title"
+
+
+def test_one_control_on_several_resources_gets_distinct_rule_ids():
+    buckets = [f"arn:aws:s3:::bucket-{index}" for index in range(3)] + ["arn:aws:s3:::" + "b" * 200]
+    items = [_finding("s3_bucket_versioning", "MEDIUM", "FAILED", arn, "AwsS3Bucket") for arn in buckets]
+    orphan = _finding("account_contact", "LOW", "FAILED", "", "AwsAccount")
+
+    rule_ids = [finding.rule_id for finding in parse_asff(json.dumps(items + [orphan]))]
+
+    assert len(set(rule_ids)) == 5
+    assert rule_ids[0] == "prowler-s3_bucket_versioning@arn:aws:s3:::bucket-0"
+    assert len(rule_ids[3]) == RULE_ID_MAX_LENGTH
+    assert rule_ids[4] == orphan["Id"]
+
+
+def test_iter_asff_assets_deduplicates_resources():
+    assets = list(iter_asff_assets(json.dumps(_FINDINGS)))
+
+    assert [(a.hostname, a.platform, a.owner) for a in assets] == [
+        (_BUCKET, "AwsS3Bucket", "111122223333"),
+        (_ROLE, "AwsIamRole", "111122223333"),
+    ]
+
+
+def test_parse_asff_rejects_bad_payloads():
+    with pytest.raises(ASFFParserError, match="Unsupported severity"):
+        parse_asff(json.dumps([_finding("x", "SEVERE", "FAILED", _ROLE, "AwsIamRole")]))
+    with pytest.raises(ASFFParserError, match="Invalid ASFF"):
+        parse_asff('[{"GeneratorId": ')
+
+
+@pytest.mark.parametrize(
+    "override, message",
+    [
+        ({"Severity": {"Normalized": "50"}}, "Severity.Normalized must be a number"),
+        ({"Severity": {"Normalized": True}}, "Severity.Normalized must be a number"),
+        ({"Severity": "HIGH"}, "Severity must be a JSON object"),
+        ({"Compliance": "FAILED"}, "Compliance must be a JSON object"),
+        ({"Resources": {"Id": _ROLE}}, "Resources must be a list"),
+        ({"Resources": [_ROLE]}, "Resources must be a JSON object"),
+    ],
+)
+def test_parse_asff_rejects_mistyped_fields(override, message):
+    item = {**_finding("iam_role_admin", "LOW", "FAILED", _ROLE, "AwsIamRole"), **override}
+
+    with pytest.raises(ASFFParserError, match=message):
+        parse_asff(json.dumps([item]))
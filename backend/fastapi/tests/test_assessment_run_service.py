@@ -0,0 +1,141 @@
+"""Tests for executing queued assessment runs."""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from backend.fastapi.app.enums import AssessmentStatus
+from backend.fastapi.app.models import Assessment, Asset, Profile
+from backend.fastapi.app.services.assessment_run_service import (
+    SAMPLE_POST,
+    AssessmentNotFound,
+    execute_assessment,
+    expected_run_seconds,
+    run_error,
+    run_progress,
+    runner_target,
+)
+
+
+class _Session:
+    def __init__(self, assessments):
+        self._assessments = assessments
+
+    def get(self, model, assessment_id):
+        return self._assessments.get(assessment_id)
+
+
+class _Store:
+    """Records updates in the order they were committed."""
+
+    def __init__(self):
+        self.updates = []
+
+    def update(self, session, assessment_id, **changes):
+        self.updates.append((assessment_id, changes))
+        return True
+
+
+def _scope(assessments):
+    @contextmanager
+    def session_scope():
+        yield _Session(assessments)
+
+    return session_scope
+
+
+def _queued(status=AssessmentStatus.DRAFT):
+    return {3: SimpleNamespace(profile_id=11, status=status)}
+
+
+def test_successful_run_moves_through_running_to_completed():
+    store = _Store()
+    calls = []
+
+    def runner(profile, **target):
+        assert [changes["status"] for _id, changes in store.updates] == [AssessmentStatus.RUNNING]
+        calls.append((profile, target))
+        return {"status": "completed"}
+
+    status = execute_assessment(3, {"host": "web-1"}, runner=runner, store=store, session_scope=_scope(_queued()))
+
+    assert status is AssessmentStatus.COMPLETED
+    assert calls == [("11", {"host": "web-1", "user": "root", "port": None, "protocol": "ssh"})]
+    (_, running), (_, completed) = store.updates
+    assert running["started_at"] is not None
+    assert completed["status"] is AssessmentStatus.COMPLETED
+    assert completed["reports"]["post"] == SAMPLE_POST
+    assert completed["reports"]["result"] == {"status": "completed"}
+
+
+def test_failed_run_records_the_error_and_reraises():
+    store = _Store()
+
+    def runner(profile, **target):
+        raise RuntimeError("connection refused")
+
+    with pytest.raises(RuntimeError):
+        execute_assessment(3, {}, runner=runner, store=store, session_scope=_scope(_queued()))
+
+    _id, failed = store.updates[-1]
+    assert failed["status"] is AssessmentStatus.FAILED
+    assert run_error(failed["reports"]) == "connection refused"
+
+
+def test_redelivered_finished_run_is_not_repeated():
+    store = _Store()
+
+    status = execute_assessment(
+        3, {}, runner=pytest.fail, store=store, session_scope=_scope(_queued(AssessmentStatus.COMPLETED))
+    )
+
+    assert status is AssessmentStatus.COMPLETED
+    assert store.updates == []
+
+
+def test_missing_assessment_is_reported():
+    with pytest.raises(AssessmentNotFound):
+        execute_assessment(4, {}, runner=pytest.fail, store=_Store(), session_scope=_scope({}))
+
+
+def test_runner_target_keeps_only_connection_parameters():
+    connection = {"host": "db-1", "port": 2222, "user": None, "password_ref": "vault:secret/db"}
+
+    assert runner_target(connection) == {"host": "db-1", "port": 2222}
+    assert run_error({"result": {"status": "completed"}}) is None
+    assert run_error({}) is None
+
+
+def test_run_progress_estimates_from_recent_durations():
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    assert run_progress(AssessmentStatus.DRAFT, None, None) == 0.0
+    assert run_progress(AssessmentStatus.RUNNING, started, 600, now=started + timedelta(minutes=5)) == 0.5
+    assert run_progress(AssessmentStatus.RUNNING, started, 600, now=started + timedelta(hours=1)) == 0.99
+    assert run_progress(AssessmentStatus.RUNNING, started, None) is None
+    assert run_progress(AssessmentStatus.FAILED, started, None) == 1.0
+
+
+def test_expected_run_seconds_averages_completed_runs_of_the_profile(pg_session):
+    asset = Asset(hostname="web-1")
+    profile = Profile(name="RHEL 9 STIG", framework="DISA STIG")
+    pg_session.add_all([asset, profile])
+    pg_session.flush()
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    runs = ((AssessmentStatus.COMPLETED, 4), (AssessmentStatus.COMPLETED, 6), (AssessmentStatus.FAILED, 60))
+    for status, minutes in runs:
+        pg_session.add(
+            Assessment(
+                asset_id=asset.id,
+                profile_id=profile.id,
+                status=status,
+                started_at=started,
+                completed_at=started + timedelta(minutes=minutes),
+            )
+        )
+    pg_session.flush()
+
+    assert expected_run_seconds(pg_session, profile.id) == 300.0
+    assert expected_run_seconds(pg_session, profile.id + 1) is None
@@ -0,0 +1,192 @@
+"""Tests for the assessment store and its read-through cache."""
+
+import queue
+import time
+
+from backend.fastapi.app.enums import AssessmentStatus
+from backend.fastapi.app.services.assessment_store import (
+    INVALIDATION_CHANNEL,
+    AssessmentRecord,
+    AssessmentStore,
+    FileReportStorage,
+    _publish_invalidations,
+)
+
+_REPORT = {"profiles": [{"name": "sample", "controls": [{"id": "V-1", "impact": 0.5, "results": []}]}]}
+
+
+class _PubSub:
+    def __init__(self, broker):
+        self._broker = broker
+        self._messages = queue.Queue()
+
+    def subscribe(self, channel):
+        assert channel == INVALIDATION_CHANNEL
+        self._broker.subscribers.append(self._messages)
+
+    def listen(self):
+        while True:
+            yield self._messages.get()
+
+    def close(self):
+        pass
+
+
+class _Redis:
+    """In-memory pub/sub broker shared by the stores of several "workers"."""
+
+    def __init__(self):
+        self.subscribers = []
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return _PubSub(self)
+
+    def publish(self, channel, data):
+        for messages in self.subscribers:
+            messages.put({"type": "message", "channel": channel, "data": data.encode("ascii")})
+
+
+class _Session:
+    def __init__(self):
+        self.info = {}
+
+
+class _CountingStore(AssessmentStore):
+    """Store whose database loads are served from a dict and counted."""
+
+    def __init__(self, rows, **kwargs):
+        kwargs.setdefault("storage", None)
+        kwargs.setdefault("inline_max_bytes", 1024)
+        super().__init__(1024 * 1024, **kwargs)
+        self.rows = rows
+        self.loads = []
+
+    def _load(self, session, assessment_ids):
+        self.loads.append(list(assessment_ids))
+        return {assessment_id: self.rows[assessment_id] for assessment_id in assessment_ids if assessment_id in self.rows}
+
+
+def _record(assessment_id, post=_REPORT):
+    return AssessmentRecord(
+        id=assessment_id,
+        asset_id=1,
+        profile_id=1,
+        status=AssessmentStatus.COMPLETED,
+        started_at=None,
+        completed_at=None,
+        reports={"baseline": _REPORT, "post": post},
+        size_bytes=100,
+    )
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_file_storage_round_trips_and_deduplicates(tmp_path):
+    storage = FileReportStorage(tmp_path)
+
+    uri = storage.put("ab" * 32, b'{"a":1}')
+
+    assert uri.startswith("file://")
+    assert storage.put("ab" * 32, b"ignored") == uri
+    assert storage.get(uri) == b'{"a":1}'
+    assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == [f"{'ab' * 32}.json.gz"]
+
+
+def test_large_reports_are_offloaded(tmp_path):
+    store = AssessmentStore(1024, storage=FileReportStorage(tmp_path), inline_max_bytes=64)
+
+    small = store._report_row("result", {"status": "completed"})
+    large = store._report_row("post", _REPORT)
+
+    assert (small.content, small.storage_uri) == ({"status": "completed"}, None)
+    assert large.content is None
+    assert large.size_bytes > 64
+    assert large.storage_uri.endswith(f"{large.digest}.json.gz")
+
+
+def test_reads_go_through_the_cache():
+    store = _CountingStore({1: _record(1), 2: _record(2)})
+    session = _Session()
+
+    assert set(store.get_many(session, [1, 2, 3])) == {1, 2}
+    assert store.get(session, 1) == _record(1)
+    assert store.get(session, 3) is None
+
+    assert store.loads == [[1, 2, 3], [3]]
+    assert store.stats()["hits"] == 1
+
+
+def test_invalidations_apply_locally_and_again_after_commit():
+    published = _Redis()
+    store = _CountingStore({1: _record(1)}, redis_client=published)
+    store._subscribed.set()
+    store._listener = object()
+    session = _Session()
+    store.get(session, 1)
+
+    store.invalidate(session, [1])
+    store.get(session, 1)
+    store.get(session, 1)
+    received = published.pubsub()
+    received.subscribe(INVALIDATION_CHANNEL)
+    _publish_invalidations(session)
+
+    assert store.loads == [[1], [1]]
+    assert session.info == {}
+    assert next(received.listen())["data"] == b"1"
+    store.get(session, 1)
+    assert store.loads == [[1], [1], [1]]
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    class _RacingStore(_CountingStore):
+        def _load(self, session, assessment_ids):
+            rows = super()._load(session, assessment_ids)
+            self._handle_message({"data": b"1"})
+            return rows
+
+    store = _RacingStore({1: _record(1)})
+
+    store.get(_Session(), 1)
+    store.get(_Session(), 1)
+
+    assert store.loads == [[1], [1]]
+
+
+def test_invalidations_reach_every_worker():
+    broker = _Redis()
+    dropped = []
+    writer = _CountingStore({7: _record(7)}, redis_client=broker)
+    reader = _CountingStore({7: _record(7)}, redis_client=broker, on_invalidate=dropped.append)
+
+    reader._ensure_listener()
+    _wait_for(reader._subscribed.is_set)
+    reader.get(_Session(), 7)
+    reader.get(_Session(), 7)
+    assert reader.loads == [[7]]
+
+    reader.rows[7] = _record(7, post={"profiles": []})
+    writer.publish({7})
+    _wait_for(lambda: 7 in dropped)
+
+    assert reader.get(_Session(), 7).reports["post"] == {"profiles": []}
+    assert reader.loads == [[7], [7]]
+
+
+def test_cache_is_bypassed_until_subscribed():
+    class _Unreachable:
+        def pubsub(self, ignore_subscribe_messages=False):
+            raise ConnectionError("redis is down")
+
+    store = _CountingStore({1: _record(1)}, redis_client=_Unreachable(), retry_seconds=60)
+
+    store.get(_Session(), 1)
+    store.get(_Session(), 1)
+
+    assert store.loads == [[1], [1]]
+    assert store.stats()["subscribed"] is False
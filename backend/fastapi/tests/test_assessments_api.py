@@ -0,0 +1,161 @@
+"""Tests for the assessment endpoints."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.fastapi.app.api import assessments
+from backend.fastapi.app.database import get_session
+from backend.fastapi.app.dependencies import UserContext, get_current_user
+from backend.fastapi.app.enums import AssessmentStatus
+from backend.fastapi.app.models import Assessment, Asset, Profile
+from backend.fastapi.app.schemas import DeltaReport, DeltaSummary
+from backend.fastapi.app.services.assessment_store import AssessmentRecord
+
+
+class _Session:
+    def __init__(self, known=(Asset, Profile)):
+        self._known = known
+        self.commits = 0
+
+    def get(self, model, key):
+        return object() if model in self._known else None
+
+    def commit(self):
+        self.commits += 1
+
+
+class _Store:
+    def __init__(self, records=None):
+        self.records = dict(records or {})
+        self.updates = []
+
+    def create(self, session, *, asset_id, profile_id):
+        record = _record(len(self.records) + 1, asset_id=asset_id, profile_id=profile_id)
+        self.records[record.id] = record
+        return record
+
+    def update(self, session, assessment_id, **changes):
+        self.updates.append((assessment_id, changes))
+        return True
+
+    def get(self, session, assessment_id):
+        return self.records.get(assessment_id)
+
+
+def _record(assessment_id, status=AssessmentStatus.DRAFT, *, asset_id=1, profile_id=2, started_at=None, reports=None):
+    return AssessmentRecord(
+        id=assessment_id,
+        asset_id=asset_id,
+        profile_id=profile_id,
+        status=status,
+        started_at=started_at,
+        completed_at=None,
+        reports=reports or {},
+        size_bytes=0,
+    )
+
+
+@pytest.fixture
+def session():
+    return _Session()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = _Store()
+    monkeypatch.setattr(assessments, "get_assessment_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def client(session, store):
+    app = FastAPI()
+    app.include_router(assessments.router, prefix="/assessments")
+    app.dependency_overrides[get_current_user] = lambda: UserContext(subject="tester")
+    app.dependency_overrides[get_session] = lambda: session
+    return TestClient(app)
+
+
+def _run(client):
+    return client.post(
+        "/assessments/run",
+        json={"asset_id": 1, "profile_id": 2, "connection": {"host": "web-1", "password_ref": "vault:x"}},
+    )
+
+
+def test_run_is_committed_queued_and_located(client, session, store, monkeypatch):
+    queued = []
+    monkeypatch.setattr(assessments.run_inspec_task, "apply_async", lambda args: queued.append((session.commits, args)))
+
+    response = _run(client)
+
+    assert response.status_code == 202
+    assert response.headers["Location"] == "/assessments/1"
+    assert response.json()["status"] == "draft"
+    assert response.json()["progress"] == 0.0
+    assert queued == [(1, (1, {"host": "web-1"}))]
+
+
+def test_run_that_cannot_be_queued_is_failed(client, session, store, monkeypatch):
+    def unavailable(args):
+        raise ConnectionError("broker is down")
+
+    monkeypatch.setattr(assessments.run_inspec_task, "apply_async", unavailable)
+
+    response = _run(client)
+
+    assert response.status_code == 503
+    assert "Location" not in response.headers
+    ((assessment_id, changes),) = store.updates
+    assert (assessment_id, changes["status"]) == (1, AssessmentStatus.FAILED)
+    assert session.commits == 2
+
+
+def test_run_against_unknown_asset_is_not_queued(client, session, store, monkeypatch):
+    session._known = (Profile,)
+    monkeypatch.setattr(assessments.run_inspec_task, "apply_async", pytest.fail)
+
+    assert _run(client).status_code == 404
+    assert store.records == {}
+
+
+def test_status_reports_estimated_progress_and_errors(client, store, monkeypatch):
+    started = datetime.now(timezone.utc) - timedelta(minutes=5)
+    store.records[7] = _record(7, AssessmentStatus.RUNNING, started_at=started)
+    store.records[8] = _record(8, AssessmentStatus.FAILED, reports={"result": {"status": "failed", "error": "timeout"}})
+    monkeypatch.setattr(assessments, "expected_run_seconds", lambda session, profile_id: 1200.0)
+
+    running = client.get("/assessments/7").json()
+    failed = client.get("/assessments/8").json()
+
+    assert (running["status"], running["progress"], running["error"]) == ("running", 0.25, None)
+    assert (failed["status"], failed["progress"], failed["error"]) == ("failed", 1.0, "timeout")
+    assert client.get("/assessments/9").status_code == 404
+
+
+def test_persisted_delta_of_unknown_assessments_is_not_found(client, session, monkeypatch):
+    monkeypatch.setattr(assessments, "compute_delta_sql", pytest.fail)
+
+    response = client.get("/assessments/delta/persisted?baseline_id=4&post_id=5")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Assessments not found: 4, 5"
+
+
+def test_persisted_delta_is_computed_in_sql(client, session, monkeypatch):
+    session._known = (Assessment,)
+    calls = []
+
+    def compute_delta_sql(db, baseline_id, post_id, *, changed_only):
+        calls.append((db, baseline_id, post_id, changed_only))
+        return DeltaReport(findings=[], summary=DeltaSummary(total=0, improved=0, regressed=0, unchanged=0, by_severity={}))
+
+    monkeypatch.setattr(assessments, "compute_delta_sql", compute_delta_sql)
+
+    response = client.get("/assessments/delta/persisted?baseline_id=4&post_id=5&changed_only=true")
+
+    assert response.status_code == 200
+    assert calls == [(session, 4, 5, True)]
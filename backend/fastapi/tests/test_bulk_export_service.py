@@ -0,0 +1,119 @@
+"""Tests for bulk checklist exports."""
+
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.fastapi.app.enums import AssessmentStatus, FindingSeverity, FindingStatus
+from backend.fastapi.app.models import Assessment, Asset, Finding, Profile
+from backend.fastapi.app.parsers.ckl_parser import parse_ckl
+from backend.fastapi.app.services.bulk_export_service import (
+    ExportRow,
+    iter_asset_rows,
+    member_name,
+    stream_ckl_zip,
+)
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def _rows(count, prefix="SV"):
+    return [
+        ExportRow(f"{prefix}-{index}r1_rule", FindingSeverity.CAT_II, FindingStatus.OPEN, f"note {index}")
+        for index in range(count)
+    ]
+
+
+class _RowSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, statement):
+        return iter(self.rows)
+
+
+def test_stream_ckl_zip_writes_one_checklist_per_asset(executor):
+    assets = [(f"host-{index}.example.mil", _rows(50 + index)) for index in range(6)]
+
+    chunks = list(stream_ckl_zip(iter(assets), executor=executor, max_in_flight=2))
+
+    assert len(chunks) > len(assets)
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == sorted(f"host-{index}.example.mil.ckl" for index in range(6))
+        findings = parse_ckl(archive.read("host-3.example.mil.ckl"))
+    assert [finding.rule_id for finding in findings] == [row.rule_id for row in assets[3][1]]
+    assert {finding.host for finding in findings} == {"host-3.example.mil"}
+
+
+def test_stream_ckl_zip_sanitizes_and_dedupes_member_names(executor):
+    assets = [("../etc/passwd", _rows(1)), ("web 01", _rows(1)), ("web/01", _rows(1))]
+
+    payload = b"".join(stream_ckl_zip(assets, executor=executor, max_in_flight=2))
+
+    with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+        assert sorted(archive.namelist()) == ["etc_passwd.ckl", "web_01.ckl", "web_01_.ckl"]
+    assert member_name("...") == "asset.ckl"
+
+
+def test_stream_ckl_zip_without_assets_is_an_empty_archive(executor):
+    payload = b"".join(stream_ckl_zip([], executor=executor, max_in_flight=2))
+
+    assert zipfile.ZipFile(io.BytesIO(payload)).namelist() == []
+
+
+def test_iter_asset_rows_groups_consecutive_assets():
+    session = _RowSession(
+        [
+            ("web01", "SV-1", FindingSeverity.CAT_I, FindingStatus.OPEN, None),
+            ("web01", "SV-2", FindingSeverity.CAT_III, FindingStatus.NOT_A_FINDING, "ok"),
+            ("db01", "SV-1", FindingSeverity.CAT_I, FindingStatus.NOT_APPLICABLE, None),
+        ]
+    )
+
+    grouped = list(iter_asset_rows(session, [1, 2]))
+
+    assert grouped == [
+        (
+            "web01",
+            [
+                ExportRow("SV-1", FindingSeverity.CAT_I, FindingStatus.OPEN, None),
+                ExportRow("SV-2", FindingSeverity.CAT_III, FindingStatus.NOT_A_FINDING, "ok"),
+            ],
+        ),
+        ("db01", [ExportRow("SV-1", FindingSeverity.CAT_I, FindingStatus.NOT_APPLICABLE, None)]),
+    ]
+
+
+def test_iter_asset_rows_exports_the_latest_completed_assessment(pg_session):
+    asset = Asset(hostname="web01")
+    profile = Profile(name="RHEL 9 STIG", framework="DISA STIG")
+    pg_session.add_all([asset, profile])
+    pg_session.flush()
+    older, newer, running = (
+        Assessment(asset_id=asset.id, profile_id=profile.id, status=status)
+        for status in (AssessmentStatus.COMPLETED, AssessmentStatus.COMPLETED, AssessmentStatus.RUNNING)
+    )
+    pg_session.add_all([older, newer, running])
+    pg_session.flush()
+    for assessment, rule_id in ((older, "SV-1"), (newer, "SV-2"), (running, "SV-3")):
+        pg_session.add(
+            Finding(
+                assessment_id=assessment.id,
+                asset_id=asset.id,
+                rule_id=rule_id,
+                severity=FindingSeverity.CAT_II,
+                status=FindingStatus.OPEN,
+            )
+        )
+    pg_session.flush()
+
+    assert list(iter_asset_rows(pg_session, [asset.id])) == [
+        ("web01", [ExportRow("SV-2", FindingSeverity.CAT_II, FindingStatus.OPEN, None)])
+    ]
@@ -0,0 +1,131 @@
+"""Tests for parse result caching."""
+
+import io
+import json
+
+from backend.fastapi.app.caching import BoundedLRU
+from backend.fastapi.app.parsers.ckl_parser import parse_ckl
+from backend.fastapi.app.services import delta_service
+from backend.fastapi.app.services.cache_service import (
+    ExportCache,
+    ParseCache,
+    ReportCache,
+    digest_report,
+    digest_stream,
+)
+from backend.fastapi.app.services.delta_service import compute_delta
+from backend.fastapi.tests.test_ckl_parser import SAMPLE_CKL
+from backend.fastapi.tests.test_delta_service import BASELINE, POST
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+def test_bounded_lru_evicts_least_recently_used_by_weight():
+    cache = BoundedLRU(10, weigher=len)
+    cache.put("a", b"xxxx")
+    cache.put("b", b"xxxx")
+    assert cache.get("a") == b"xxxx"
+
+    cache.put("c", b"xxxx")
+    cache.put("huge", b"x" * 11)
+
+    assert "b" not in cache
+    assert "huge" not in cache
+    stats = cache.stats()
+    assert (stats.hits, stats.evictions, stats.entries, stats.weight) == (1, 1, 2, 8)
+
+
+def test_parse_cache_round_trips_and_rebinds_asset():
+    stream = io.BytesIO(SAMPLE_CKL.encode("utf-8"))
+    digest = digest_stream(stream, chunk_size=32)
+    assert stream.tell() == 0
+
+    cache = ParseCache(1024 * 1024)
+    assert cache.get("ckl", digest) is None
+    cache.put("ckl", digest, parse_ckl(SAMPLE_CKL, asset_id=1))
+
+    cached = cache.get("ckl", digest, asset_id=2)
+    expected = parse_ckl(SAMPLE_CKL, asset_id=2)
+    assert cached == expected
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_parse_cache_falls_back_to_shared_redis_tier():
+    redis_client = _FakeRedis()
+    ParseCache(1024, redis_client=redis_client).put("ckl", "abc", parse_ckl(SAMPLE_CKL))
+
+    other_process = ParseCache(1024, redis_client=redis_client)
+    assert other_process.get("ckl", "abc") == parse_ckl(SAMPLE_CKL)
+    assert other_process.stats()["redis_hits"] == 1
+    assert other_process.get("ckl", "abc") is not None
+    assert other_process.stats()["redis_hits"] == 1
+
+
+def test_report_cache_normalizes_each_report_once(monkeypatch):
+    calls = []
+    original = delta_service.compact_report
+    monkeypatch.setattr(delta_service, "compact_report", lambda report: calls.append(1) or original(report))
+    cache = ReportCache(1024 * 1024)
+
+    first = compute_delta(BASELINE, POST, cache=cache)
+    again = compute_delta(dict(reversed(list(BASELINE.items()))), POST, cache=cache, engine="columnar")
+    keyed = compute_delta(BASELINE, POST, cache=cache, baseline_key="assessment:1:baseline")
+
+    assert len(calls) == 3
+    assert first.json() == again.json() == keyed.json()
+    assert digest_report(BASELINE) == digest_report(json.dumps(BASELINE, sort_keys=True, separators=(",", ":")))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 3, 3)
+
+
+def test_report_cache_persists_compact_form_to_redis():
+    redis_client = _FakeRedis()
+    compact = delta_service.compact_report(POST)
+    ReportCache(1024, redis_client=redis_client).put("assessment:7:post", compact)
+
+    other_process = ReportCache(1024, redis_client=redis_client)
+    assert other_process.get("assessment:7:post") == compact
+    assert other_process.stats()["redis_hits"] == 1
+
+    other_process.invalidate("assessment:7:post")
+    assert other_process.get("assessment:7:post") is None
+
+
+def test_export_cache_tee_caches_complete_payloads_only():
+    cache = ExportCache(max_bytes=10)
+
+    assert b"".join(cache.tee('"small"', iter([b"abc", b"def"]))) == b"abcdef"
+    assert cache.get('"small"') == b"abcdef"
+
+    assert b"".join(cache.tee('"large"', iter([b"abcdef", b"ghijkl"]))) == b"abcdefghijkl"
+    assert cache.get('"large"') is None
+
+    abandoned = cache.tee('"partial"', iter([b"abc", b"def"]))
+    next(abandoned)
+    abandoned.close()
+    assert cache.get('"partial"') is None
+
+
+def test_export_cache_skips_entries_over_the_per_entry_cap():
+    cache = ExportCache(max_bytes=100, max_entry_bytes=5)
+
+    assert b"".join(cache.tee('"tee"', iter([b"abc", b"def"]))) == b"abcdef"
+    cache.put('"put"', b"abcdef")
+    cache.put('"fits"', b"abcde")
+
+    assert cache.get('"tee"') is None
+    assert cache.get('"put"') is None
+    assert cache.get('"fits"') == b"abcde"
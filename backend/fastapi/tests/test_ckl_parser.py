@@ -1,7 +1,10 @@
 """Tests for CKL parser."""
 
+import io
+import tracemalloc
+
 from backend.fastapi.app.enums import FindingSeverity, FindingStatus
-from backend.fastapi.app.parsers.ckl_parser import CKLParserError, parse_ckl
+from backend.fastapi.app.parsers.ckl_parser import CKLParserError, iter_ckl, parse_ckl
 
 
 SAMPLE_CKL = """<?xml version='1.0' encoding='UTF-8'?>
@@ -45,3 +48,81 @@ def test_parse_ckl_invalid_severity():
         assert "Unsupported severity" in str(exc)
     else:  # pragma: no cover - ensures exception is raised
         raise AssertionError("CKLParserError was not raised")
+
+
+def test_iter_ckl_streams_file_like_objects():
+    payload = SAMPLE_CKL.replace("</VULN>", "</VULN>\n      " + _vuln("V-67890", "medium", "NotAFinding"), 1)
+    stream = io.BytesIO(payload.encode("utf-8"))
+
+    findings = iter_ckl(stream, asset_id=7, chunk_size=16)
+    first = next(findings)
+    assert first.rule_id == "V-12345"
+    assert stream.tell() < len(payload)
+
+    second = next(findings)
+    assert second.rule_id == "V-67890"
+    assert second.severity == FindingSeverity.CAT_II
+    assert second.status == FindingStatus.NOT_A_FINDING
+    assert second.asset_id == 7
+    assert list(findings) == []
+
+
+def test_iter_ckl_invalid_xml():
+    try:
+        list(iter_ckl(io.BytesIO(b"<CHECKLIST><VULN>"), chunk_size=4))
+    except CKLParserError as exc:
+        assert "Invalid CKL XML" in str(exc)
+    else:  # pragma: no cover - ensures exception is raised
+        raise AssertionError("CKLParserError was not raised")
+
+
+class _SyntheticCKL(io.RawIOBase):
+    """Readable stream producing a CKL document of roughly ``size`` bytes on demand."""
+
+    def __init__(self, size: int) -> None:
+        details = f"<FINDING_DETAILS>{'x' * 4000}</FINDING_DETAILS></VULN>"
+        self._vuln = _vuln("V-12345", "medium", "Open").replace("</VULN>", details).encode("utf-8")
+        self._remaining = size // len(self._vuln)
+        self._buffer = b"<CHECKLIST><STIGS><iSTIG>"
+        self._closed_document = False
+        self.vuln_count = self._remaining
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while len(self._buffer) < size and not self._closed_document:
+            if self._remaining:
+                batch = min(self._remaining, 64)
+                self._buffer += self._vuln * batch
+                self._remaining -= batch
+            else:
+                self._buffer += b"</iSTIG></STIGS></CHECKLIST>"
+                self._closed_document = True
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def test_iter_ckl_memory_is_bounded_by_chunk_size():
+    chunk_size = 1024 * 1024
+    stream = _SyntheticCKL(200 * 1024 * 1024)
+
+    tracemalloc.start()
+    try:
+        parsed = sum(1 for _ in iter_ckl(stream, chunk_size=chunk_size))
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert parsed == stream.vuln_count
+    assert peak < 16 * chunk_size
+
+
+def _vuln(rule_id: str, severity: str, status: str) -> str:
+    return (
+        "<VULN>"
+        f"<STIG_DATA><VULN_ATTRIBUTE>Rule_ID</VULN_ATTRIBUTE><ATTRIBUTE_DATA>{rule_id}</ATTRIBUTE_DATA></STIG_DATA>"
+        f"<STIG_DATA><VULN_ATTRIBUTE>Severity</VULN_ATTRIBUTE><ATTRIBUTE_DATA>{severity}</ATTRIBUTE_DATA></STIG_DATA>"
+        f"<STATUS>{status}</STATUS>"
+        "</VULN>"
+    )
@@ -0,0 +1,66 @@
+"""Tests for the CKLB parser and exporter."""
+
+import io
+import json
+
+import pytest
+
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.parsers.ckl_parser import parse_ckl
+from backend.fastapi.app.parsers.cklb_parser import CKLBParserError, iter_cklb, parse_cklb
+from backend.fastapi.app.schemas import FindingBase
+from backend.fastapi.app.services.export_service import generate_ckl, generate_cklb
+
+
+def _cklb(rules: list) -> str:
+    return json.dumps(
+        {
+            "title": "web01",
+            "target_data": {"target_type": "Computing", "host_name": "web01"},
+            "stigs": [{"stig_name": "RHEL 8", "rules": rules}],
+            "cklb_version": "1.0",
+        }
+    )
+
+
+def test_parse_cklb_maps_vocabulary():
+    payload = _cklb(
+        [
+            {"rule_id": "SV-1r1_rule", "severity": "high", "status": "open", "comments": " fix "},
+            {"rule_id": "SV-2r1_rule", "severity": "medium", "status": "not_a_finding", "finding_details": "ok"},
+            {"group_id": "V-3", "severity": "low", "status": "not_applicable"},
+            {"rule_id": "SV-4r1_rule", "severity": "low", "status": "not_reviewed"},
+        ]
+    )
+
+    findings = list(iter_cklb(io.BytesIO(payload.encode()), asset_id=4, chunk_size=32))
+
+    assert [(f.rule_id, f.severity, f.status, f.comments) for f in findings] == [
+        ("SV-1r1_rule", FindingSeverity.CAT_I, FindingStatus.OPEN, "fix"),
+        ("SV-2r1_rule", FindingSeverity.CAT_II, FindingStatus.NOT_A_FINDING, "ok"),
+        ("V-3", FindingSeverity.CAT_III, FindingStatus.NOT_APPLICABLE, None),
+        ("SV-4r1_rule", FindingSeverity.CAT_III, FindingStatus.REVIEW_REQUIRED, None),
+    ]
+    assert {(f.host, f.asset_id) for f in findings} == {("web01", 4)}
+
+
+def test_parse_cklb_rejects_bad_payloads():
+    with pytest.raises(CKLBParserError, match="Unsupported severity"):
+        parse_cklb(_cklb([{"rule_id": "SV-1", "severity": "critical", "status": "open"}]))
+    with pytest.raises(CKLBParserError, match="Invalid CKLB"):
+        parse_cklb('{"stigs": [{"rules": [')
+
+
+def test_cklb_export_round_trips_like_ckl():
+    findings = [
+        FindingBase(rule_id=f"SV-{index}", severity=severity, status=status, comments=f"note {index}", asset_id=1)
+        for index, (severity, status) in enumerate(zip(list(FindingSeverity) * 2, list(FindingStatus) * 2))
+    ]
+
+    from_cklb = parse_cklb(generate_cklb(findings, asset_name="web01"))
+    from_ckl = parse_ckl(generate_ckl(findings, asset_name="web01"))
+
+    expected = [(f.rule_id, f.severity, f.status, f.comments) for f in findings]
+    assert [(f.rule_id, f.severity, f.status, f.comments) for f in from_cklb] == expected
+    assert [(f.rule_id, f.severity, f.status, f.comments) for f in from_ckl] == expected
+    assert generate_cklb(findings, asset_name="web01") == generate_cklb(findings, asset_name="web01")
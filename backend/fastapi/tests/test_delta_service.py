@@ -1,7 +1,13 @@
 """Tests for delta computation service."""
 
+import json
+import random
+
+import pytest
+
 from backend.fastapi.app.enums import FindingSeverity, FindingStatus
-from backend.fastapi.app.services.delta_service import compute_delta
+from backend.fastapi.app.services.delta_engine import RuleVocabulary, compute_delta_summary, encode_report
+from backend.fastapi.app.services.delta_service import compute_delta, stream_delta
 
 
 BASELINE = {
@@ -46,3 +52,55 @@ def test_compute_delta_generates_summary():
     new_control = next(item for item in report.findings if item.rule_id == "V-54321")
     assert new_control.before_status is None
     assert new_control.after_status == FindingStatus.REVIEW_REQUIRED
+
+
+def _random_report(rng, rules: int) -> dict:
+    statuses = ["failed", "passed", "skipped", "not_applicable"]
+    controls = [
+        {
+            "id": f"V-{rng.randrange(rules * 2)}",
+            "impact": rng.choice([None, 0.0, 0.3, 0.5, 0.9]),
+            "results": [{"status": rng.choice(statuses)}],
+        }
+        for _ in range(rules)
+    ]
+    return {"profiles": [{"name": "random", "controls": controls}]}
+
+
+def test_columnar_engine_matches_python_engine():
+    rng = random.Random(13)
+    cases = [(BASELINE, POST), ({"profiles": []}, POST), (BASELINE, {"profiles": []})]
+    cases += [(_random_report(rng, 300), _random_report(rng, 300)) for _ in range(5)]
+
+    for baseline, post in cases:
+        expected = compute_delta(baseline, post)
+        actual = compute_delta(baseline, post, engine="columnar")
+        assert actual.json() == expected.json()
+
+
+def test_columnar_summary_reuses_encoded_reports():
+    vocabulary = RuleVocabulary()
+    baseline = encode_report(BASELINE, vocabulary)
+    post = encode_report(POST, vocabulary)
+
+    assert compute_delta_summary(baseline, post) == compute_delta(BASELINE, POST).summary
+    with pytest.raises(ValueError, match="same RuleVocabulary"):
+        compute_delta_summary(baseline, encode_report(POST))
+
+
+@pytest.mark.parametrize("engine", ["python", "columnar"])
+def test_stream_delta_emits_ndjson_rows_then_summary(engine):
+    rng = random.Random(5)
+    baseline, post = _random_report(rng, 200), _random_report(rng, 200)
+    expected = compute_delta(baseline, post)
+
+    chunks = list(stream_delta(baseline, post, engine=engine, flush_bytes=512))
+    lines = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+
+    assert len(chunks) > 1
+    assert lines[-1] == {"summary": json.loads(expected.summary.json())}
+    assert lines[:-1] == [json.loads(finding.json()) for finding in expected.findings]
+
+    changed = [json.loads(line) for line in b"".join(stream_delta(baseline, post, changed_only=True)).splitlines()]
+    assert [row["rule_id"] for row in changed[:-1]] == [f.rule_id for f in expected.findings if f.changed]
+    assert changed[-1] == lines[-1]
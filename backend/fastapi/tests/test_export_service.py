@@ -0,0 +1,184 @@
+"""Tests for CKL export and export versioning."""
+
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.models import Assessment, Asset, Profile
+from backend.fastapi.app.parsers.ckl_parser import ParsedFinding, parse_ckl
+from backend.fastapi.app.schemas import FindingBase
+from backend.fastapi.app import database
+from backend.fastapi.app.services.export_service import (
+    ExportRow,
+    ExportVersion,
+    export_etag,
+    findings_version,
+    generate_ckl,
+    iter_export_rows,
+    stream_assessment_ckl,
+    stream_ckl,
+)
+from backend.fastapi.app.services.persistence_service import upsert_findings
+
+
+def _findings(count):
+    return [
+        FindingBase(
+            rule_id=f"SV-{index}r1_rule",
+            severity=list(FindingSeverity)[index % 4],
+            status=list(FindingStatus)[index % 4],
+            comments=f"note {index}" if index % 3 else None,
+            asset_id=1,
+        )
+        for index in range(count)
+    ]
+
+
+def test_stream_ckl_escapes_text():
+    findings = [
+        FindingBase(
+            rule_id="SV-1<&>",
+            severity=FindingSeverity.CAT_I,
+            status=FindingStatus.OPEN,
+            comments='a < b && "c" > d',
+            asset_id=1,
+        )
+    ]
+
+    payload = generate_ckl(findings, asset_name="web&01 <prod>")
+    root = ET.fromstring(payload.encode("utf-8"))
+
+    assert root.findtext("ASSET/ASSET_NAME") == "web&01 <prod>"
+    vuln = root.find("STIGS/iSTIG/VULN")
+    assert vuln.findtext("COMMENTS") == 'a < b && "c" > d'
+    assert [data.findtext("ATTRIBUTE_DATA") for data in vuln.findall("STIG_DATA")] == ["SV-1<&>", "SV-1<&>", "high"]
+
+
+def test_stream_ckl_flushes_in_chunks_and_round_trips():
+    findings = _findings(500)
+
+    chunks = list(stream_ckl(iter(findings), asset_name="web01", flush_bytes=4096))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 4096 + 1024 for chunk in chunks)
+    payload = b"".join(chunks).decode("utf-8")
+    assert payload == generate_ckl(findings, asset_name="web01")
+    parsed = parse_ckl(payload)
+    assert [(f.rule_id, f.severity, f.status, f.comments) for f in parsed] == [
+        (f.rule_id, f.severity, f.status, f.comments) for f in findings
+    ]
+
+
+def test_stream_ckl_without_findings_is_a_valid_checklist():
+    root = ET.fromstring(b"".join(stream_ckl([], asset_name="empty")))
+
+    assert root.tag == "CHECKLIST"
+    assert root.find("STIGS/iSTIG") is not None
+    assert root.findall("STIGS/iSTIG/VULN") == []
+
+
+def test_export_etag_tracks_format_asset_and_findings_version():
+    version = ExportVersion(asset_id=3, asset_name="web01", assessment_id=7, findings_version=12)
+
+    etag = export_etag("ckl", version)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert export_etag("ckl", ExportVersion(*version)) == etag
+    assert len(
+        {
+            etag,
+            export_etag("cklb", version),
+            export_etag("ckl", version._replace(asset_name="web02")),
+            export_etag("ckl", version._replace(assessment_id=8)),
+            export_etag("ckl", version._replace(findings_version=13)),
+        }
+    ) == 5
+
+
+def _parsed(rule_id, status=FindingStatus.OPEN, comments=None):
+    return ParsedFinding(rule_id=rule_id, severity=FindingSeverity.CAT_II, status=status, comments=comments, asset_id=None)
+
+
+def _seed_assessment(session):
+    asset = Asset(hostname="web01")
+    profile = Profile(name="RHEL 9 STIG", framework="DISA STIG")
+    session.add_all([asset, profile])
+    session.flush()
+    assessment = Assessment(asset_id=asset.id, profile_id=profile.id)
+    session.add(assessment)
+    session.flush()
+    return assessment
+
+
+def test_findings_version_counts_writes_to_an_assessment(pg_session):
+    assessment = _seed_assessment(pg_session)
+
+    def upsert(*findings):
+        upsert_findings(pg_session, findings, assessment_id=assessment.id, asset_id=assessment.asset_id)
+        return findings_version(pg_session, assessment.id).findings_version
+
+    assert findings_version(pg_session, assessment.id) == (assessment.asset_id, "web01", assessment.id, 0)
+    assert upsert(_parsed("V-1"), _parsed("V-2")) == 1
+    assert upsert(_parsed("V-1"), _parsed("V-2")) == 1
+    assert upsert(_parsed("V-1", comments="re-checked")) == 2
+    assert upsert(_parsed("V-2", FindingStatus.NOT_A_FINDING)) == 3
+    assert findings_version(pg_session, assessment.id + 1) is None
+
+
+def test_assessment_ckl_streams_rows_in_rule_order_from_its_own_session(pg_session, monkeypatch):
+    assessment = _seed_assessment(pg_session)
+    upsert_findings(
+        pg_session,
+        [_parsed("V-3"), _parsed("V-1", comments="a & b"), _parsed("V-2", FindingStatus.NOT_A_FINDING)],
+        assessment_id=assessment.id,
+        asset_id=assessment.asset_id,
+    )
+    sessions = []
+
+    @contextmanager
+    def get_db():
+        sessions.append(pg_session)
+        yield pg_session
+
+    monkeypatch.setattr(database, "get_db", get_db)
+
+    assert list(iter_export_rows(pg_session, assessment.id)) == [
+        ExportRow("V-1", FindingSeverity.CAT_II, FindingStatus.OPEN, "a & b"),
+        ExportRow("V-2", FindingSeverity.CAT_II, FindingStatus.NOT_A_FINDING, None),
+        ExportRow("V-3", FindingSeverity.CAT_II, FindingStatus.OPEN, None),
+    ]
+    chunks = stream_assessment_ckl(assessment.id, "web01")
+    assert sessions == []
+    payload = b"".join(chunks)
+    assert len(sessions) == 1
+    assert payload.decode("utf-8") == generate_ckl(iter_export_rows(pg_session, assessment.id), "web01")
+
+
+def test_findings_version_grows_when_overlapping_transactions_commit_out_of_order(pg_engine):
+    with Session(pg_engine) as session:
+        assessment = _seed_assessment(session)
+        assessment_id, asset_id = assessment.id, assessment.asset_id
+        upsert_findings(session, [_parsed("V-1"), _parsed("V-2")], assessment_id=assessment_id, asset_id=asset_id)
+        session.commit()
+
+    def rewrite(session, rule_id):
+        upsert_findings(
+            session, [_parsed(rule_id, FindingStatus.NOT_A_FINDING)], assessment_id=assessment_id, asset_id=asset_id
+        )
+        session.commit()
+
+    def current():
+        with Session(pg_engine) as session:
+            return findings_version(session, assessment_id).findings_version
+
+    # The older transaction's writes carry an earlier now() than the newer one's.
+    with Session(pg_engine) as older, Session(pg_engine) as newer:
+        older.execute(text("SELECT now()"))
+        rewrite(newer, "V-1")
+        after_newer = current()
+        rewrite(older, "V-2")
+
+    assert (after_newer, current()) == (2, 3)
@@ -0,0 +1,99 @@
+"""Tests for keyset-paginated findings queries."""
+
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.services.finding_query_service import (
+    CursorError,
+    FindingFilters,
+    decode_cursor,
+    encode_cursor,
+    list_findings,
+)
+
+
+class _Row(namedtuple("_Row", "id assessment_id asset_id rule_id severity status comments updated_at waived")):
+    @property
+    def _mapping(self):
+        return self._asdict()
+
+
+class _Result(list):
+    def all(self):
+        return list(self)
+
+
+class _RecordingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return _Result(self.rows)
+
+
+def _rows(count, start=1):
+    updated = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    return [
+        _Row(index, 7, 3, f"SV-{index}", FindingSeverity.CAT_II, FindingStatus.OPEN, None, updated, index % 2 == 0)
+        for index in range(start, start + count)
+    ]
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trips_per_order():
+    updated = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    row = _Row(42, 1, 1, "SV-1", FindingSeverity.CAT_I, FindingStatus.OPEN, None, updated, False)
+
+    assert decode_cursor("id", encode_cursor("id", row)) == (42,)
+    assert decode_cursor("updated_at", encode_cursor("updated_at", row)) == (updated, 42)
+    with pytest.raises(CursorError, match="order=id"):
+        decode_cursor("updated_at", encode_cursor("id", row))
+    with pytest.raises(CursorError, match="Malformed"):
+        decode_cursor("id", "not-a-cursor")
+
+
+def test_list_findings_fetches_one_extra_row_to_detect_next_page():
+    session = _RecordingSession(_rows(3))
+
+    page = list_findings(session, FindingFilters(), limit=2)
+
+    assert [item.id for item in page.items] == [1, 2]
+    assert [item.waived for item in page.items] == [False, True]
+    assert decode_cursor("id", page.next_cursor) == (2,)
+    assert "LIMIT" in _sql(session.statements[0])
+
+    last = list_findings(_RecordingSession(_rows(1, start=3)), FindingFilters(), limit=2, cursor=page.next_cursor)
+    assert last.next_cursor is None
+
+
+def test_list_findings_applies_filters_and_keyset():
+    session = _RecordingSession([])
+    filters = FindingFilters(
+        asset_id=3,
+        assessment_id=7,
+        severities=[FindingSeverity.CAT_I],
+        statuses=[FindingStatus.OPEN, FindingStatus.REVIEW_REQUIRED],
+        rule_prefix="SV-10_",
+        waived=False,
+    )
+    cursor = encode_cursor("updated_at", _rows(1)[0])
+
+    page = list_findings(session, filters, order="updated_at", cursor=cursor)
+
+    sql = _sql(session.statements[0])
+    assert page.items == [] and page.next_cursor is None
+    assert "findings.asset_id = " in sql and "findings.assessment_id = " in sql
+    assert "findings.severity IN" in sql and "findings.status IN" in sql
+    assert "LIKE" in sql and "ESCAPE '/'" in sql
+    assert "LEFT OUTER JOIN waivers" in sql and "waivers.id IS NULL" in sql
+    assert "(findings.updated_at, findings.id) >" in sql
+    assert "ORDER BY findings.updated_at, findings.id" in sql
@@ -0,0 +1,105 @@
+"""Tests for the findings export endpoint."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.fastapi.app.api import findings
+from backend.fastapi.app.database import get_session
+from backend.fastapi.app.dependencies import UserContext, get_current_user
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.services.cache_service import ExportCache
+from backend.fastapi.app.services.export_service import ExportRow, ExportVersion, stream_ckl
+
+
+class _Session:
+    """Stands in for a Session; reads go through the stubbed export service calls."""
+
+    def __init__(self):
+        self.version = ExportVersion(asset_id=3, asset_name="web01", assessment_id=7, findings_version=1)
+        self.rows = [ExportRow("V-1", FindingSeverity.CAT_I, FindingStatus.OPEN, "telnet enabled")]
+        self.loads = 0
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = _Session()
+
+    def findings_version(db, assessment_id):
+        assert db is session
+        return session.version if assessment_id == session.version.assessment_id else None
+
+    def iter_export_rows(db, assessment_id):
+        assert db is session
+        session.loads += 1
+        return iter(session.rows)
+
+    def stream_assessment_ckl(assessment_id, asset_name):
+        session.loads += 1
+        return stream_ckl(session.rows, asset_name)
+
+    cache = ExportCache(1024 * 1024)
+    monkeypatch.setattr(findings, "findings_version", findings_version)
+    monkeypatch.setattr(findings, "iter_export_rows", iter_export_rows)
+    monkeypatch.setattr(findings, "stream_assessment_ckl", stream_assessment_ckl)
+    monkeypatch.setattr(findings, "get_export_cache", lambda: cache)
+    return session
+
+
+@pytest.fixture
+def client(session):
+    app = FastAPI()
+    app.include_router(findings.router, prefix="/findings")
+    app.dependency_overrides[get_current_user] = lambda: UserContext(subject="tester")
+    app.dependency_overrides[get_session] = lambda: session
+    return TestClient(app)
+
+
+def _export(client, fmt="ckl", **headers):
+    return client.get(f"/findings/export?format={fmt}&assessment_id=7", headers=headers)
+
+
+@pytest.mark.parametrize("fmt", ["ckl", "cklb"])
+def test_repeat_download_is_served_from_the_export_cache(client, session, fmt):
+    first = _export(client, fmt)
+    second = _export(client, fmt)
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert b"V-1" in first.content
+    assert second.content == first.content
+    assert session.loads == 1
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["{etag}", "*", "W/{etag}", '"stale", W/{etag}', ' "stale" ,{etag} '],
+)
+def test_matching_if_none_match_is_not_modified(client, session, if_none_match):
+    etag = _export(client).headers["ETag"]
+
+    response = _export(client, **{"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert session.loads == 1
+
+
+def test_new_findings_version_gets_a_new_etag(client, session):
+    stale = _export(client).headers["ETag"]
+    session.version = session.version._replace(findings_version=2)
+    session.rows = [session.rows[0]._replace(status=FindingStatus.NOT_A_FINDING)]
+
+    response = _export(client, **{"If-None-Match": stale})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != stale
+    assert b"NotAFinding" in response.content
+    assert session.loads == 2
+
+
+def test_export_of_unknown_assessment_is_not_found(client):
+    response = client.get("/findings/export?assessment_id=8")
+
+    assert response.status_code == 404
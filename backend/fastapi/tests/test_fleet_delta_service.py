@@ -0,0 +1,58 @@
+"""Tests for fleet-wide delta aggregation."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.fastapi.app.enums import FindingSeverity
+from backend.fastapi.app.services import fleet_delta_service
+from backend.fastapi.app.services.delta_service import compute_delta
+from backend.fastapi.app.services.fleet_delta_service import FleetPair, compute_fleet_delta
+
+
+def _report(**statuses: str) -> dict:
+    impacts = {"V_1": 0.9, "V_2": 0.5, "V_3": 0.3}
+    controls = [
+        {"id": rule.replace("_", "-"), "impact": impacts[rule], "results": [{"status": status}]}
+        for rule, status in statuses.items()
+    ]
+    return {"profiles": [{"name": "fleet", "controls": controls}]}
+
+
+BASELINE = _report(V_1="passed", V_2="passed", V_3="failed")
+POSTS = {
+    1: _report(V_1="failed", V_2="passed", V_3="passed"),
+    2: _report(V_1="failed", V_2="failed", V_3="failed"),
+    3: _report(V_1="passed", V_2="passed", V_3="passed"),
+}
+
+
+def test_compute_fleet_delta_aggregates_regressions_per_rule(monkeypatch):
+    calls = []
+    original = fleet_delta_service.compact_report
+    monkeypatch.setattr(fleet_delta_service, "compact_report", lambda report: calls.append(1) or original(report))
+
+    pairs = [FleetPair(asset_id=asset_id, baseline=BASELINE, post=post) for asset_id, post in POSTS.items()]
+    report = compute_fleet_delta(pairs)
+
+    assert len(calls) == 1 + len(POSTS)
+    assert report.comparisons == 3
+    assert [(item.rule_id, item.severity, item.host_count, item.asset_ids) for item in report.regressions] == [
+        ("V-1", FindingSeverity.CAT_I, 2, [1, 2]),
+        ("V-2", FindingSeverity.CAT_II, 1, [2]),
+    ]
+
+    expected = [compute_delta(BASELINE, post).summary for post in POSTS.values()]
+    assert report.summary.total == sum(summary.total for summary in expected)
+    assert report.summary.regressed == 3
+    assert report.summary.improved == 2
+    assert report.summary.by_severity["CAT_I"] == {"improved": 0, "regressed": 2, "unchanged": 1}
+
+
+def test_compute_fleet_delta_runs_on_executor_and_caps_asset_lists():
+    pairs = [FleetPair(asset_id=asset_id, baseline=BASELINE, post=POSTS[2]) for asset_id in range(20)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = compute_fleet_delta(pairs, executor=executor, max_assets_per_rule=5)
+
+    assert [(item.rule_id, item.host_count) for item in report.regressions] == [("V-1", 20), ("V-2", 20)]
+    assert report.regressions[0].asset_ids == [0, 1, 2, 3, 4]
+    assert compute_fleet_delta([]).regressions == []
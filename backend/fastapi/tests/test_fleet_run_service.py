@@ -0,0 +1,250 @@
+"""Tests for fleet assessment runs."""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+import redis
+from celery import Celery
+from celery.exceptions import SoftTimeLimitExceeded
+from sqlalchemy.exc import OperationalError
+
+from backend.fastapi.app.enums import AssessmentStatus
+from backend.fastapi.app.models import Assessment, Asset, Profile
+from backend.fastapi.app.services.fleet_run_service import (
+    _SETTLE_MEMBER,
+    FINISH_TASK,
+    MEMBER_TASK,
+    FleetMember,
+    SubnetRateLimited,
+    SubnetRateLimiter,
+    create_fleet_run,
+    execute_fleet_member,
+    finish_fleet_run,
+    fleet_run_signature,
+    fleet_run_status,
+    plan_lanes,
+    subnet_of,
+)
+
+
+class _Pipeline:
+    def __init__(self, counters, fail=False):
+        self._counters = counters
+        self._fail = fail
+        self._keys = []
+
+    def incr(self, key):
+        self._keys.append(key)
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        if self._fail:
+            raise redis.ConnectionError("redis is down")
+        (key,) = self._keys
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return [self._counters[key], True]
+
+
+class _Redis:
+    def __init__(self, fail=False):
+        self.counters = {}
+        self._fail = fail
+
+    def pipeline(self):
+        return _Pipeline(self.counters, self._fail)
+
+
+class _Session:
+    def __init__(self, log, failing=()):
+        self._log = log
+        self._failing = failing
+
+    def execute(self, statement, params=None):
+        name = " ".join(statement.text.split()[:2])
+        if name in self._failing:
+            raise OperationalError(name, params, Exception("server closed the connection"))
+        self._log.append((name, params))
+
+    def get(self, model, assessment_id):
+        return SimpleNamespace(profile_id=11, status=AssessmentStatus.DRAFT)
+
+
+class _Store:
+    def update(self, session, assessment_id, **changes):
+        return True
+
+
+def _scope(log, failing=()):
+    @contextmanager
+    def session_scope():
+        yield _Session(log, failing)
+
+    return session_scope
+
+
+def _member(assessment_id, subnet):
+    return FleetMember(assessment_id=assessment_id, target={"host": f"h{assessment_id}"}, subnet=subnet)
+
+
+def test_subnet_of_groups_addresses():
+    assert subnet_of("10.1.2.3") == "10.1.2.0/24"
+    assert subnet_of("10.1.2.3", prefix=16) == "10.1.0.0/16"
+    assert subnet_of("2001:db8::1") == "2001:db8::/64"
+    assert subnet_of("web-1.example.com") is None
+    assert subnet_of(None) is None
+
+
+def test_plan_lanes_bounds_concurrency_and_interleaves_subnets():
+    members = [_member(index, "a") for index in range(4)] + [_member(index, "b") for index in range(4, 6)]
+
+    lanes = plan_lanes(members, 2)
+
+    assert len(lanes) == 2
+    assert [[member.subnet for member in lane] for lane in lanes] == [["a", "a", "a"], ["b", "b", "a"]]
+    assert sorted(member.assessment_id for lane in lanes for member in lane) == list(range(6))
+    assert len(plan_lanes(members[:1], 50)) == 1
+
+
+def test_fleet_run_signature_is_a_chord_of_sequential_lanes():
+    app = Celery("test")
+    fleet_run = SimpleNamespace(id=9, max_concurrency=2, subnet_rate_per_minute=30)
+    members = [_member(index, None) for index in range(5)]
+
+    signature = fleet_run_signature(fleet_run, members, app=app)
+
+    lanes = signature.tasks
+    assert len(lanes) == 2
+    tasks = [task for lane in lanes for task in lane.tasks]
+    assert {task.task for task in tasks} == {MEMBER_TASK}
+    assert all(task.immutable for task in tasks)
+    assert sorted(task.args[1] for task in tasks) == list(range(5))
+    assert tasks[0].kwargs == {"subnet": None, "rate_per_minute": 30}
+    assert signature.body.task == FINISH_TASK
+    assert signature.body.args == (9,)
+    (errback,) = signature.body.options["link_error"]
+    assert (errback.task, errback.args, errback.immutable) == (FINISH_TASK, (9,), True)
+
+
+def test_subnet_rate_limiter_uses_fixed_windows():
+    now = [125.0]
+    limiter = SubnetRateLimiter(_Redis(), window_seconds=60, clock=lambda: now[0])
+
+    assert [limiter.acquire("10.0.0.0/24", 2) for _ in range(3)] == [0.0, 0.0, 55.0]
+    assert limiter.acquire("10.0.1.0/24", 2) == 0.0
+    now[0] = 180.0
+    assert limiter.acquire("10.0.0.0/24", 2) == 0.0
+
+
+def test_subnet_rate_limiter_waits_when_redis_is_unavailable():
+    limiter = SubnetRateLimiter(_Redis(fail=True), unavailable_retry_seconds=7)
+
+    assert limiter.acquire("10.0.0.0/24", 2) == 7.0
+
+
+def test_rate_limited_member_does_not_start():
+    limiter = SubnetRateLimiter(_Redis(), clock=lambda: 0.0)
+    log = []
+    limiter.acquire("10.0.0.0/24", 1)
+
+    with pytest.raises(SubnetRateLimited) as excinfo:
+        execute_fleet_member(
+            1, 2, {}, subnet="10.0.0.0/24", rate_per_minute=1, limiter=limiter, session_scope=_scope(log)
+        )
+
+    assert excinfo.value.retry_after == 60.0
+    assert log == []
+
+
+def test_failed_member_is_counted_not_raised():
+    log = []
+
+    def runner(profile, **target):
+        raise RuntimeError("connection refused")
+
+    status = execute_fleet_member(1, 2, {"host": "h2"}, session_scope=_scope(log), runner=runner, store=_Store())
+
+    assert status is AssessmentStatus.FAILED
+    assert log[0] == ("UPDATE fleet_runs", {"fleet_run_id": 1})
+    assert log[-1] == ("WITH settled", {"fleet_run_id": 1, "assessment_id": 2, "status": "FAILED"})
+
+
+def test_member_that_cannot_start_is_settled_as_failed():
+    log = []
+
+    def runner(profile, **target):  # pragma: no cover - must not be reached
+        raise AssertionError("member ran without being started")
+
+    status = execute_fleet_member(
+        1, 2, {"host": "h2"}, session_scope=_scope(log, failing={"UPDATE fleet_runs"}), runner=runner, store=_Store()
+    )
+
+    assert status is AssessmentStatus.FAILED
+    assert log == [("WITH settled", {"fleet_run_id": 1, "assessment_id": 2, "status": "FAILED"})]
+
+
+def test_soft_time_limit_fails_the_member_not_the_lane():
+    log = []
+
+    def runner(profile, **target):
+        raise SoftTimeLimitExceeded()
+
+    status = execute_fleet_member(1, 2, {"host": "h2"}, session_scope=_scope(log), runner=runner, store=_Store())
+
+    assert status is AssessmentStatus.FAILED
+    assert log[-1] == ("WITH settled", {"fleet_run_id": 1, "assessment_id": 2, "status": "FAILED"})
+
+
+def test_unrecorded_outcome_does_not_break_the_lane():
+    log = []
+
+    status = execute_fleet_member(
+        1,
+        2,
+        {"host": "h2"},
+        session_scope=_scope(log, failing={"WITH settled"}),
+        runner=lambda profile, **target: {"profiles": []},
+        store=_Store(),
+    )
+
+    assert status is AssessmentStatus.COMPLETED
+    assert log == [("UPDATE fleet_runs", {"fleet_run_id": 1})]
+
+
+def test_finish_fails_members_that_never_reported(pg_session):
+    profile = Profile(name="RHEL 9 STIG", framework="DISA STIG")
+    assets = [Asset(hostname="web-1"), Asset(hostname="web-2")]
+    pg_session.add_all([profile, *assets])
+    pg_session.flush()
+    fleet_run, members = create_fleet_run(
+        pg_session,
+        profile_id=profile.id,
+        assets=assets,
+        connection={},
+        max_concurrency=2,
+        subnet_rate_per_minute=None,
+    )
+    settled, abandoned = (member.assessment_id for member in members)
+    pg_session.execute(
+        _SETTLE_MEMBER, {"fleet_run_id": fleet_run.id, "assessment_id": settled, "status": "COMPLETED"}
+    )
+
+    @contextmanager
+    def session_scope():
+        yield pg_session
+
+    finish_fleet_run(fleet_run.id, session_scope=session_scope)
+    finish_fleet_run(fleet_run.id, session_scope=session_scope)
+    pg_session.expire_all()
+
+    progress = fleet_run_status(pg_session, fleet_run.id)
+    assert (progress.status, progress.completed, progress.failed, progress.pending) == (
+        AssessmentStatus.COMPLETED,
+        1,
+        1,
+        0,
+    )
+    assert pg_session.get(Assessment, abandoned).status is AssessmentStatus.FAILED
+    assert pg_session.get(Assessment, settled).status is AssessmentStatus.DRAFT
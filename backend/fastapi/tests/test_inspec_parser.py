@@ -0,0 +1,141 @@
+"""Tests for the InSpec JSON parser."""
+
+import io
+import json
+
+import pytest
+
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.parsers.inspec_parser import InSpecParserError, iter_inspec, parse_inspec
+from backend.fastapi.app.parsers.streaming import iter_json
+
+REPORT = {
+    "platform": {"name": "redhat", "release": "8.9", "target_id": "web01"},
+    "profiles": [
+        {
+            "name": "rhel8-stig",
+            "attributes": [{"name": "banner", "options": {"value": "} ] { ["}}],
+            "controls": [
+                {
+                    "id": "SV-230221",
+                    "impact": 0.7,
+                    "code": "control 'SV-230221' do\n  describe \"]\" do end\nend",
+                    "results": [
+                        {"status": "passed", "code_desc": "release"},
+                        {"status": "failed", "code_desc": "patch", "message": "expected 8.9 to be >= 9"},
+                    ],
+                },
+                {"id": "SV-230222", "impact": 0.5, "results": [{"status": "passed"}]},
+                {"id": "SV-230223", "impact": 0.0, "results": [{"status": "skipped"}]},
+            ],
+        },
+        {"name": "empty", "controls": []},
+    ],
+    "statistics": {"duration": 12.5},
+    "version": "5.22.3",
+}
+
+
+def test_parse_inspec_normalizes_controls():
+    findings = parse_inspec(REPORT, asset_id=6)
+
+    assert [finding.rule_id for finding in findings] == ["SV-230221", "SV-230222", "SV-230223"]
+    first = findings[0]
+    assert first.severity == FindingSeverity.CAT_I
+    assert first.status == FindingStatus.OPEN
+    assert first.comments == "expected 8.9 to be >= 9"
+    assert first.host == "web01"
+    assert first.asset_id == 6
+    assert findings[1].status == FindingStatus.NOT_A_FINDING
+    assert findings[2].severity == FindingSeverity.INFO
+    assert findings[2].status == FindingStatus.REVIEW_REQUIRED
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_iter_inspec_streams_raw_reports(chunk_size):
+    stream = io.BytesIO(json.dumps(REPORT).encode("utf-8"))
+    assert list(iter_inspec(stream, asset_id=6, chunk_size=chunk_size)) == parse_inspec(REPORT, asset_id=6)
+
+
+def test_iter_inspec_rejects_truncated_reports():
+    payload = json.dumps(REPORT)[:-40]
+    with pytest.raises(InSpecParserError, match="Invalid InSpec JSON"):
+        list(iter_inspec(payload))
+
+
+@pytest.mark.parametrize(
+    "report, message",
+    [
+        ({"profiles": [{"controls": [{"id": "SV-1", "results": "failed"}]}]}, "results of control 'SV-1'"),
+        ({"profiles": [{"controls": [{"id": "SV-1", "results": ["failed"]}]}]}, "results of control 'SV-1'"),
+        ({"platform": "web01", "profiles": []}, "platform must be a JSON object"),
+        ({"profiles": [{"controls": [{"id": "SV-1", "impact": "high"}]}]}, "impact must be a number"),
+        ({"profiles": [{"controls": [{"id": 7}]}]}, "control id must be a string"),
+    ],
+)
+@pytest.mark.parametrize("raw", [False, True])
+def test_iter_inspec_rejects_mistyped_reports(report, message, raw):
+    with pytest.raises(InSpecParserError, match=message):
+        parse_inspec(json.dumps(report) if raw else report)
+
+
+@pytest.mark.parametrize("raw", [False, True])
+def test_iter_inspec_treats_null_collections_as_empty(raw):
+    report = {"platform": None, "profiles": [{"controls": [{"id": "SV-1", "results": None}]}, {"controls": None}]}
+
+    (finding,) = parse_inspec(json.dumps(report) if raw else report)
+
+    assert (finding.status, finding.host) == (FindingStatus.REVIEW_REQUIRED, None)
+
+
+class _CountingChunks(io.BytesIO):
+    def __init__(self, payload):
+        super().__init__(payload)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_malformed_values_fail_without_buffering_the_rest_of_the_upload():
+    control = {"id": "SV-1", "impact": 0.5, "results": [{"status": "passed"}]}
+    padding = json.dumps([control] * 20_000)
+    payload = ('{"profiles": [{"controls": [{"id": "SV-0", "impact": 0.5 0.7}, ' + padding[1:] + "}]}").encode()
+    stream = _CountingChunks(payload)
+
+    with pytest.raises(InSpecParserError, match="Invalid InSpec JSON"):
+        list(iter_inspec(stream, chunk_size=1024))
+
+    assert stream.reads * 1024 < len(payload) / 10
+
+
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+def test_values_cut_at_any_chunk_edge_still_decode(chunk_size, ensure_ascii):
+    report = {
+        "platform": {"target_id": "db01"},
+        "profiles": [
+            {
+                "controls": [
+                    {"id": "SV-é", "results": [{"status": "failed", "message": "😀 \"quoted\" \\ path"}]},
+                    {"id": "SV-2", "impact": -2.5e-07, "tags": {"flag": True, "big": 12345678901234567890}},
+                ]
+            }
+        ],
+    }
+    payload = json.dumps(report, ensure_ascii=ensure_ascii).encode("utf-8")
+
+    findings = list(iter_inspec(io.BytesIO(payload), chunk_size=chunk_size))
+
+    assert findings == parse_inspec(report)
+    assert findings[1].severity == FindingSeverity.INFO
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 16))
+def test_numbers_cut_inside_their_exponent_are_not_decoded_early(chunk_size):
+    payload = b'{"x": -2.5e-07, "items": [[{}, 3.25e+2, 12345678901234567890]]}'
+
+    values = [value for _path, value in iter_json(io.BytesIO(payload), [("x",), ("items", "*")], chunk_size=chunk_size)]
+
+    assert values == [-2.5e-07, [{}, 325.0, 12345678901234567890]]
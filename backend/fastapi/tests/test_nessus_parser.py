@@ -0,0 +1,116 @@
+"""Tests for the Nessus parser."""
+
+import io
+import subprocess
+import sys
+
+import pytest
+
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.parsers.base import RULE_ID_MAX_LENGTH
+from backend.fastapi.app.parsers.nessus_parser import NessusParserError, iter_nessus, parse_nessus
+
+SAMPLE_CSV = (
+    "﻿Plugin ID,CVE,CVSS v2.0 Base Score,Risk,Host,Protocol,Port,Name,Synopsis,Plugin Output\r\n"
+    '19506,,,None,10.0.0.5,tcp,0,Nessus Scan Information,Scan info,"line one\r\nline two"\r\n'
+    "97833,CVE-2017-0144,9.3,Critical,10.0.0.5,tcp,445,MS17-010,SMB is vulnerable,\r\n"
+    "57608,,5.0,Medium,10.0.0.6,tcp,445,SMB Signing not required,Signing is not required,\r\n"
+)
+
+SAMPLE_NESSUS = """<?xml version="1.0" ?>
+<NessusClientData_v2 xmlns:cm="http://www.nessus.org/cm">
+  <Report name="scan">
+    <ReportHost name="web01">
+      <HostProperties><tag name="host-ip">10.0.0.7</tag></HostProperties>
+      <ReportItem port="443" severity="3" pluginID="42873" pluginName="SSL Medium Strength Cipher Suites">
+        <synopsis>Medium strength ciphers are supported.</synopsis>
+      </ReportItem>
+      <ReportItem port="0" severity="0" pluginID="21157" pluginName="Unix Compliance Checks">
+        <cm:compliance-check-id>a1b2c3</cm:compliance-check-id>
+        <cm:compliance-check-name>1.1.1 Ensure mounting of cramfs is disabled</cm:compliance-check-name>
+        <cm:compliance-result>FAILED</cm:compliance-result>
+      </ReportItem>
+    </ReportHost>
+    <ReportHost name="db01">
+      <ReportItem port="22" severity="1" pluginID="70658" pluginName="SSH CBC Mode Ciphers"/>
+    </ReportHost>
+  </Report>
+</NessusClientData_v2>
+"""
+
+
+def test_parse_nessus_csv_rows():
+    findings = parse_nessus(io.BytesIO(SAMPLE_CSV.encode("utf-8")))
+
+    assert [finding.rule_id for finding in findings] == [
+        "19506@10.0.0.5",
+        "97833:tcp/445@10.0.0.5",
+        "57608:tcp/445@10.0.0.6",
+    ]
+    assert findings[0].severity == FindingSeverity.INFO
+    assert findings[0].status == FindingStatus.NOT_A_FINDING
+    assert findings[1].severity == FindingSeverity.CAT_I
+    assert findings[1].status == FindingStatus.OPEN
+    assert findings[1].comments == "SMB is vulnerable"
+    assert findings[2].host == "10.0.0.6"
+
+
+def test_iter_nessus_csv_streams_in_small_chunks():
+    chunked = list(iter_nessus(io.BytesIO(SAMPLE_CSV.encode("utf-8")), asset_id=2, chunk_size=7))
+    assert chunked == parse_nessus(SAMPLE_CSV, asset_id=2)
+
+
+def test_parse_nessus_xml_report_items():
+    findings = parse_nessus(SAMPLE_NESSUS.encode("utf-8"), asset_id=1)
+
+    assert [(finding.rule_id, finding.host) for finding in findings] == [
+        ("42873:tcp/443@web01", "web01"),
+        ("a1b2c3@web01", "web01"),
+        ("70658:tcp/22@db01", "db01"),
+    ]
+    assert findings[0].severity == FindingSeverity.CAT_I
+    assert findings[0].comments == "Medium strength ciphers are supported."
+    assert findings[1].status == FindingStatus.OPEN
+    assert findings[1].comments == "1.1.1 Ensure mounting of cramfs is disabled"
+    assert findings[2].severity == FindingSeverity.CAT_III
+    assert findings[2].comments == "SSH CBC Mode Ciphers"
+
+
+def test_parse_nessus_rejects_unknown_risk():
+    with pytest.raises(NessusParserError, match="Unsupported risk"):
+        parse_nessus(SAMPLE_CSV.replace("Critical", "Severe"))
+
+
+def test_one_plugin_on_several_ports_and_hosts_gets_distinct_rule_ids():
+    places = [("tcp", 443, "10.0.0.5"), ("tcp", 8443, "10.0.0.5"), ("udp", 443, "10.0.0.5"), ("tcp", 443, "10.0.0.6")]
+    payload = "Plugin ID,Protocol,Port,Host,Risk,Synopsis\r\n" + "".join(
+        f"51192,{protocol},{port},{host},Medium,Untrusted certificate\r\n" for protocol, port, host in places
+    )
+
+    rule_ids = [finding.rule_id for finding in parse_nessus(payload)]
+
+    assert rule_ids == [f"51192:{protocol}/{port}@{host}" for protocol, port, host in places]
+
+
+def test_long_rule_keys_are_shortened_without_colliding():
+    hosts = ["a" * 200 + ".example.mil", "a" * 200 + ".example.com"]
+    payload = "Plugin ID,Port,Host,Risk,Synopsis\r\n" + "".join(f"10863,443,{host},Low,Cert\r\n" for host in hosts)
+
+    rule_ids = [finding.rule_id for finding in parse_nessus(payload)]
+
+    assert all(len(rule_id) == RULE_ID_MAX_LENGTH for rule_id in rule_ids)
+    assert rule_ids[0] != rule_ids[1]
+
+
+def test_importing_the_parser_leaves_the_csv_field_size_limit_alone():
+    probe = "import csv, backend.fastapi.app.parsers.nessus_parser; print(csv.field_size_limit())"
+
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+
+    assert int(output) == 128 * 1024
+
+
+def test_csv_fields_above_the_default_limit_parse():
+    payload = "Plugin ID,Risk,Synopsis,Plugin Output\r\n" + f"1,None,Big,{'x' * 256 * 1024}\r\n"
+
+    assert [finding.rule_id for finding in parse_nessus(payload)] == ["1"]
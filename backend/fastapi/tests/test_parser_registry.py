@@ -0,0 +1,74 @@
+"""Tests for format detection and the lazy parser registry."""
+
+import io
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from backend.fastapi.app.enums import FindingStatus
+from backend.fastapi.app.parsers import UnsupportedFormatError, detect_format, get_parser, iter_findings
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+@pytest.mark.parametrize(
+    ("head", "expected"),
+    [
+        ('<?xml version="1.0"?>\n<CHECKLIST><ASSET/>', "ckl"),
+        ('<?xml version="1.0"?><NessusClientData_v2><Report>', "nessus"),
+        ('<Benchmark xmlns="http://checklists.nist.gov/xccdf/1.2">', "xccdf"),
+        ('<arf:asset-report-collection xmlns:arf="urn:oasis">', "xccdf"),
+        ('"Plugin ID","CVE","Risk","Host"\n"1","","High","web01"\n', "nessus_csv"),
+        ('{"platform": {"name": "ubuntu"}, "profiles": []}', "inspec"),
+        ('{"title": "x", "cklb_version": "1.0", "stigs": []}', "cklb"),
+        ('{"Findings": [{"SchemaVersion": "2018-10-08"}]}', "asff"),
+    ],
+)
+def test_detect_format(head, expected):
+    assert detect_format(head.encode()) == expected
+    assert detect_format("\ufeff" + head) == expected
+
+
+def test_detect_format_falls_back_to_extension_and_rejects_unknown():
+    assert detect_format(b"<root/>", "host.ckl") == "ckl"
+    with pytest.raises(UnsupportedFormatError):
+        detect_format(b"plain text", "notes.txt")
+    with pytest.raises(UnsupportedFormatError):
+        get_parser("docx")
+
+
+def test_iter_findings_detects_and_parses():
+    payload = io.BytesIO(
+        b'<?xml version="1.0"?><CHECKLIST><ASSET><HOST_NAME>web01</HOST_NAME></ASSET><STIGS><iSTIG>'
+        b"<VULN><STIG_DATA><VULN_ATTRIBUTE>Rule_ID</VULN_ATTRIBUTE><ATTRIBUTE_DATA>SV-1</ATTRIBUTE_DATA></STIG_DATA>"
+        b"<STIG_DATA><VULN_ATTRIBUTE>Severity</VULN_ATTRIBUTE><ATTRIBUTE_DATA>high</ATTRIBUTE_DATA></STIG_DATA>"
+        b"<STATUS>Open</STATUS></VULN></iSTIG></STIGS></CHECKLIST>"
+    )
+    fmt, findings = iter_findings(payload, asset_id=3)
+    findings = list(findings)
+
+    assert fmt == "ckl"
+    assert [(f.rule_id, f.status, f.host, f.asset_id) for f in findings] == [("SV-1", FindingStatus.OPEN, "web01", 3)]
+
+
+def test_parser_modules_are_imported_on_demand():
+    script = textwrap.dedent(
+        """
+        import sys
+        from backend.fastapi.app.parsers import get_parser
+        prefix = "backend.fastapi.app.parsers."
+        before = {name for name in sys.modules if name.startswith(prefix)}
+        get_parser("inspec")
+        after = {name for name in sys.modules if name.startswith(prefix)}
+        print(sorted(before), sorted(after - before))
+        """
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=_REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert "ckl_parser" not in output and "xccdf_parser" not in output and "nessus_parser" not in output
+    assert output.strip().endswith("['backend.fastapi.app.parsers.inspec_parser']")
@@ -0,0 +1,90 @@
+"""Tests for bulk findings persistence."""
+
+from sqlalchemy import select
+
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.models import Assessment, Asset, Finding, Profile
+from backend.fastapi.app.parsers.ckl_parser import ParsedFinding
+from backend.fastapi.app.services.persistence_service import _LOCK_FINDINGS, upsert_findings
+
+
+class _Result:
+    def __init__(self, flags):
+        self._flags = flags
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._flags
+
+
+class _RecordingSession:
+    """Stands in for a Session, answering each batch with canned RETURNING flags."""
+
+    def __init__(self, *responses):
+        self.batches = []
+        self.locks = []
+        self._responses = list(responses)
+
+    def execute(self, statement, params):
+        if statement is _LOCK_FINDINGS:
+            self.locks.append(params["rule_ids"])
+            return None
+        self.batches.append(params)
+        return _Result(self._responses.pop(0))
+
+
+def _finding(rule_id, status=FindingStatus.OPEN):
+    return ParsedFinding(rule_id=rule_id, severity=FindingSeverity.CAT_II, status=status, comments=None, asset_id=None)
+
+
+def test_upsert_findings_batches_and_counts_rows():
+    findings = [_finding("V-1"), _finding("V-2"), _finding("V-3")]
+    session = _RecordingSession([True, False], [])
+
+    result = upsert_findings(session, iter(findings), assessment_id=5, asset_id=9, batch_size=2)
+
+    assert len(session.batches) == 2
+    assert session.locks == [["V-1", "V-2"], ["V-3"]]
+    assert session.batches[0]["rule_ids"] == ["V-1", "V-2"]
+    assert session.batches[0]["statuses"] == ["OPEN", "OPEN"]
+    assert session.batches[0]["assessment_id"] == 5
+    assert session.batches[1]["rule_ids"] == ["V-3"]
+    assert (result.inserted, result.updated, result.unchanged) == (1, 1, 1)
+    assert result.total == 3
+
+
+def test_upsert_findings_keeps_last_duplicate_in_batch():
+    findings = [_finding("V-1"), _finding("V-1", FindingStatus.NOT_A_FINDING)]
+    session = _RecordingSession([True])
+
+    result = upsert_findings(session, findings, assessment_id=1, asset_id=1)
+
+    assert session.batches[0]["rule_ids"] == ["V-1"]
+    assert session.batches[0]["statuses"] == ["NOT_A_FINDING"]
+    assert result.inserted == 1
+    assert result.unchanged == 0
+
+
+def test_repeated_rules_upsert_cleanly_in_postgres(pg_session):
+    asset = Asset(hostname="scanner-target")
+    profile = Profile(name="Nessus", framework="Nessus")
+    pg_session.add_all([asset, profile])
+    pg_session.flush()
+    assessment = Assessment(asset_id=asset.id, profile_id=profile.id)
+    pg_session.add(assessment)
+    pg_session.flush()
+    findings = [
+        _finding("V-1"),
+        _finding("V-2"),
+        _finding("V-1", FindingStatus.NOT_A_FINDING),
+        _finding("V-2"),
+        _finding("V-1", FindingStatus.NOT_APPLICABLE),
+    ]
+
+    result = upsert_findings(pg_session, findings, assessment_id=assessment.id, asset_id=asset.id, batch_size=3)
+
+    stored = dict(pg_session.execute(select(Finding.rule_id, Finding.status).order_by(Finding.rule_id)).all())
+    assert stored == {"V-1": FindingStatus.NOT_APPLICABLE, "V-2": FindingStatus.OPEN}
+    assert (result.inserted, result.updated, result.unchanged) == (2, 1, 1)
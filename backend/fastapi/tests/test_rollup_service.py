@@ -0,0 +1,233 @@
+"""Tests for finding rollups and posture summaries."""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from backend.fastapi.app.enums import AssessmentStatus, FindingSeverity, FindingStatus
+from backend.fastapi.app.models import Assessment, Asset, Finding, FindingRollup, Profile
+from backend.fastapi.app.parsers.ckl_parser import ParsedFinding
+from backend.fastapi.app.services.persistence_service import upsert_findings
+from backend.fastapi.app.services.rollup_service import posture_summary, reconcile_rollups
+from backend.fastapi.app.services.waiver_service import grant_waiver, revoke_waiver
+
+OPEN = ("CAT_II", "OPEN", False)
+
+
+class _RecordingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+        return self.rows
+
+
+def _parsed(rule_id, status=FindingStatus.OPEN, comments=None, severity=FindingSeverity.CAT_II):
+    return ParsedFinding(rule_id=rule_id, severity=severity, status=status, comments=comments, asset_id=None)
+
+
+def test_posture_summary_folds_rollup_rows_per_group():
+    session = _RecordingSession(
+        [
+            (3, FindingSeverity.CAT_I, FindingStatus.OPEN, False, 4),
+            (3, FindingSeverity.CAT_I, FindingStatus.OPEN, True, 1),
+            (3, FindingSeverity.CAT_II, FindingStatus.NOT_A_FINDING, False, 0),
+            (3, FindingSeverity.CAT_III, FindingStatus.NOT_A_FINDING, False, 2),
+            (8, FindingSeverity.CAT_II, FindingStatus.OPEN, False, 6),
+        ]
+    )
+
+    summary = posture_summary(session, group_by="asset")
+
+    first, second = summary.groups
+    assert (first.key, first.total, first.waived) == ("3", 7, 1)
+    assert first.by_severity == {"CAT_I": {"open": 5}, "CAT_III": {"not_a_finding": 2}}
+    assert (second.key, second.total, second.by_severity) == ("8", 6, {"CAT_II": {"open": 6}})
+
+
+def test_posture_summary_rejects_unknown_grouping():
+    with pytest.raises(ValueError, match="Unknown summary grouping"):
+        posture_summary(_RecordingSession([]), group_by="owner")
+
+
+def _seed_asset(session, hostname="web-1"):
+    asset = Asset(hostname=hostname)
+    profile = Profile(name=f"RHEL 9 STIG {hostname}", framework="DISA STIG")
+    session.add_all([asset, profile])
+    session.flush()
+    return asset, profile
+
+
+def _assessment(session, asset, profile, status=AssessmentStatus.COMPLETED):
+    assessment = Assessment(asset_id=asset.id, profile_id=profile.id, status=status)
+    session.add(assessment)
+    session.flush()
+    return assessment
+
+
+def test_latest_posture_ignores_unfinished_runs(pg_session):
+    asset, profile = _seed_asset(pg_session)
+    completed = _assessment(pg_session, asset, profile)
+    upsert_findings(pg_session, [_parsed("V-1"), _parsed("V-2")], assessment_id=completed.id, asset_id=asset.id)
+    for status in (AssessmentStatus.FAILED, AssessmentStatus.RUNNING, AssessmentStatus.DRAFT):
+        _assessment(pg_session, asset, profile, status)
+
+    (group,) = posture_summary(pg_session, group_by="asset").groups
+
+    assert (group.key, group.total) == (str(asset.id), 2)
+
+
+def _rollups(session, assessment_id):
+    rows = session.execute(
+        select(FindingRollup.severity, FindingRollup.status, FindingRollup.waived, FindingRollup.finding_count).where(
+            FindingRollup.assessment_id == assessment_id, FindingRollup.finding_count != 0
+        )
+    )
+    return {(severity.name, status.name, waived): count for severity, status, waived, count in rows}
+
+
+def _finding_id(session, assessment_id, rule_id):
+    return session.execute(
+        select(Finding.id).where(Finding.assessment_id == assessment_id, Finding.rule_id == rule_id)
+    ).scalar_one()
+
+
+@pytest.fixture
+def seeded(pg_session):
+    asset, profile = _seed_asset(pg_session)
+    assessment = _assessment(pg_session, asset, profile)
+    upsert_findings(
+        pg_session,
+        [_parsed("V-1"), _parsed("V-2"), _parsed("V-3", FindingStatus.NOT_A_FINDING)],
+        assessment_id=assessment.id,
+        asset_id=asset.id,
+    )
+    return pg_session, assessment
+
+
+def test_upsert_counts_inserted_findings(seeded):
+    session, assessment = seeded
+
+    assert _rollups(session, assessment.id) == {OPEN: 2, ("CAT_II", "NOT_A_FINDING", False): 1}
+
+
+def test_upsert_moves_updated_findings_between_rollups(seeded):
+    session, assessment = seeded
+
+    upsert_findings(
+        session,
+        [_parsed("V-1", FindingStatus.NOT_A_FINDING), _parsed("V-2", severity=FindingSeverity.CAT_I)],
+        assessment_id=assessment.id,
+        asset_id=assessment.asset_id,
+    )
+
+    assert _rollups(session, assessment.id) == {
+        ("CAT_II", "NOT_A_FINDING", False): 2,
+        ("CAT_I", "OPEN", False): 1,
+    }
+    assert reconcile_rollups(session, [assessment.id]) == 0
+
+
+def test_comment_only_update_leaves_rollups_alone(seeded):
+    session, assessment = seeded
+    before = session.execute(select(FindingRollup.updated_at).order_by(FindingRollup.status)).scalars().all()
+
+    result = upsert_findings(
+        session, [_parsed("V-1", comments="re-checked")], assessment_id=assessment.id, asset_id=assessment.asset_id
+    )
+
+    assert result.updated == 1
+    assert _rollups(session, assessment.id) == {OPEN: 2, ("CAT_II", "NOT_A_FINDING", False): 1}
+    assert session.execute(select(FindingRollup.updated_at).order_by(FindingRollup.status)).scalars().all() == before
+
+
+def test_waiving_and_unwaiving_move_the_finding_between_rollups(seeded):
+    session, assessment = seeded
+    finding_id = _finding_id(session, assessment.id, "V-1")
+
+    grant_waiver(session, finding_id, approved_by="isso")
+    assert _rollups(session, assessment.id) == {
+        OPEN: 1,
+        ("CAT_II", "OPEN", True): 1,
+        ("CAT_II", "NOT_A_FINDING", False): 1,
+    }
+
+    grant_waiver(session, finding_id, approved_by="isso", justification="compensating control")
+    upsert_findings(
+        session,
+        [_parsed("V-1", FindingStatus.NOT_A_FINDING)],
+        assessment_id=assessment.id,
+        asset_id=assessment.asset_id,
+    )
+    assert _rollups(session, assessment.id) == {
+        OPEN: 1,
+        ("CAT_II", "NOT_A_FINDING", True): 1,
+        ("CAT_II", "NOT_A_FINDING", False): 1,
+    }
+
+    assert revoke_waiver(session, finding_id)
+    assert not revoke_waiver(session, finding_id)
+    assert _rollups(session, assessment.id) == {OPEN: 1, ("CAT_II", "NOT_A_FINDING", False): 2}
+    assert reconcile_rollups(session, [assessment.id]) == 0
+
+
+def test_reconcile_repairs_drifted_rollups_of_requested_assessments(seeded):
+    session, assessment = seeded
+    other = _assessment(session, *_seed_asset(session, "web-2"))
+    upsert_findings(session, [_parsed("V-9")], assessment_id=other.id, asset_id=other.asset_id)
+    session.execute(update(FindingRollup).values(finding_count=FindingRollup.finding_count + 5))
+
+    assert reconcile_rollups(session, [assessment.id]) == 2
+    assert _rollups(session, assessment.id) == {OPEN: 2, ("CAT_II", "NOT_A_FINDING", False): 1}
+    assert _rollups(session, other.id) == {OPEN: 6}
+
+    assert reconcile_rollups(session) == 1
+    assert _rollups(session, other.id) == {OPEN: 1}
+
+
+def test_posture_summary_can_count_every_assessment(seeded):
+    session, assessment = seeded
+    rerun = _assessment(session, *_seed_asset(session, "web-2"))
+    rerun.asset_id = assessment.asset_id
+    rerun.profile_id = assessment.profile_id
+    session.flush()
+    upsert_findings(session, [_parsed("V-1")], assessment_id=rerun.id, asset_id=assessment.asset_id)
+
+    (latest,) = posture_summary(session, group_by="framework", framework="DISA STIG").groups
+    (every,) = posture_summary(session, group_by="framework", latest_only=False, framework="DISA STIG").groups
+
+    assert (latest.key, latest.total) == ("DISA STIG", 1)
+    assert (every.key, every.total) == ("DISA STIG", 4)
+    assert posture_summary(session, group_by="framework", framework="CIS").groups == []
+
+
+def test_concurrent_upserts_of_the_same_rows_keep_rollups_exact(pg_engine):
+    with Session(pg_engine) as session:
+        asset, profile = _seed_asset(session)
+        assessment = _assessment(session, asset, profile)
+        upsert_findings(session, [_parsed("V-1")], assessment_id=assessment.id, asset_id=asset.id)
+        session.commit()
+        assessment_id, asset_id = assessment.id, asset.id
+
+    def rewrite(status):
+        with Session(pg_engine) as other:
+            upsert_findings(other, [_parsed("V-1", status)], assessment_id=assessment_id, asset_id=asset_id)
+            other.commit()
+
+    with Session(pg_engine) as first:
+        rewritten = [_parsed("V-1", FindingStatus.NOT_A_FINDING)]
+        upsert_findings(first, rewritten, assessment_id=assessment_id, asset_id=asset_id)
+        second = threading.Thread(target=rewrite, args=(FindingStatus.NOT_APPLICABLE,))
+        second.start()
+        time.sleep(0.5)
+        first.commit()
+    second.join(timeout=10)
+
+    with Session(pg_engine) as session:
+        assert _rollups(session, assessment_id) == {("CAT_II", "NOT_APPLICABLE", False): 1}
+        assert reconcile_rollups(session, [assessment_id]) == 0
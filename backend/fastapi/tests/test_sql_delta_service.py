@@ -0,0 +1,124 @@
+"""Tests for the SQL-backed delta over persisted findings."""
+
+import pytest
+
+from backend.fastapi.app.enums import AssessmentStatus, FindingSeverity, FindingStatus
+from backend.fastapi.app.models import Assessment, Asset, Profile
+from backend.fastapi.app.parsers.base import ParsedFinding
+from backend.fastapi.app.services import sql_delta_service
+from backend.fastapi.app.services.delta_service import delta_from_compact
+from backend.fastapi.app.services.persistence_service import upsert_findings
+from backend.fastapi.app.services.sql_delta_service import compute_delta_sql, compute_delta_summary_sql, load_compact
+
+
+class _CannedSession:
+    """Stands in for a Session, answering by statement or by ``assessment_id``."""
+
+    def __init__(self, responses):
+        self.calls = []
+        self._responses = responses
+
+    def execute(self, statement, params):
+        self.calls.append((statement, params))
+        key = statement if statement in self._responses else params["assessment_id"]
+        return _Rows(self._responses[key])
+
+
+class _Rows(list):
+    def all(self):
+        return list(self)
+
+
+def test_compute_delta_sql_maps_rows_onto_delta_report():
+    session = _CannedSession(
+        {
+            sql_delta_service._DELTA_REPORT: [
+                (False, "V-1", "CAT_I", "OPEN", "NOT_A_FINDING", True, None, None, None),
+                (False, "V-3", "CAT_III", None, "REVIEW_REQUIRED", True, None, None, None),
+                (True, "V-1", "CAT_I", None, None, None, 1, 0, 0),
+                (True, "V-3", "CAT_III", None, None, None, 0, 0, 1),
+                (True, "V-4", "CAT_II", None, None, None, 0, 1, 0),
+            ],
+        }
+    )
+
+    report = compute_delta_sql(session, 1, 2, changed_only=True)
+
+    assert session.calls == [(sql_delta_service._DELTA_REPORT, {"baseline_id": 1, "post_id": 2, "changed_only": True})]
+    assert [(f.rule_id, f.severity, f.before_status, f.after_status) for f in report.findings] == [
+        ("V-1", FindingSeverity.CAT_I, FindingStatus.OPEN, FindingStatus.NOT_A_FINDING),
+        ("V-3", FindingSeverity.CAT_III, None, FindingStatus.REVIEW_REQUIRED),
+    ]
+    assert (report.summary.total, report.summary.improved, report.summary.regressed) == (3, 1, 1)
+    assert list(report.summary.by_severity) == ["CAT_I", "CAT_III", "CAT_II"]
+
+
+def test_load_compact_feeds_the_python_engines():
+    session = _CannedSession(
+        {
+            1: [("V-1", "CAT_I", "OPEN"), ("V-2", "CAT_II", "NOT_A_FINDING")],
+            2: [("V-1", "CAT_I", "NOT_A_FINDING"), ("V-2", "CAT_II", "OPEN")],
+        }
+    )
+
+    report = delta_from_compact(load_compact(session, 1), load_compact(session, 2))
+
+    assert (report.summary.improved, report.summary.regressed) == (1, 1)
+
+
+def test_status_ranking_covers_every_status():
+    for status in FindingStatus:
+        assert f"WHEN '{status.name}'" in sql_delta_service._RANK_CASES
+
+
+_BASELINE = [
+    ("V-010", FindingSeverity.CAT_II, FindingStatus.OPEN),  # improved
+    ("V-002", FindingSeverity.CAT_I, FindingStatus.NOT_A_FINDING),  # regressed
+    ("v-003", FindingSeverity.CAT_III, FindingStatus.OPEN),  # unchanged
+    ("V-004", FindingSeverity.CAT_II, FindingStatus.REVIEW_REQUIRED),  # removed
+    ("V-005", FindingSeverity.CAT_I, FindingStatus.NOT_APPLICABLE),  # improved by rank
+    ("Z-006", FindingSeverity.INFO, FindingStatus.OPEN),  # unchanged
+]
+_POST = [
+    ("V-010", FindingSeverity.CAT_II, FindingStatus.NOT_A_FINDING),
+    ("V-002", FindingSeverity.CAT_I, FindingStatus.OPEN),
+    ("v-003", FindingSeverity.CAT_III, FindingStatus.OPEN),
+    ("V-005", FindingSeverity.CAT_I, FindingStatus.NOT_A_FINDING),
+    ("Z-006", FindingSeverity.INFO, FindingStatus.OPEN),
+    ("V-007", FindingSeverity.CAT_III, FindingStatus.OPEN),  # new, regressed
+    ("V-008", FindingSeverity.CAT_II, FindingStatus.NOT_A_FINDING),  # new, improved
+    ("V-009", FindingSeverity.CAT_I, FindingStatus.REVIEW_REQUIRED),  # new, unchanged
+]
+
+
+def _persist(session, asset, profile, rows):
+    assessment = Assessment(asset_id=asset.id, profile_id=profile.id, status=AssessmentStatus.COMPLETED)
+    session.add(assessment)
+    session.flush()
+    upsert_findings(
+        session,
+        [ParsedFinding(rule_id=r, severity=sev, status=st, comments=None, asset_id=None) for r, sev, st in rows],
+        assessment_id=assessment.id,
+        asset_id=asset.id,
+    )
+    return assessment.id
+
+
+@pytest.mark.parametrize("changed_only", [False, True])
+def test_sql_delta_matches_the_python_engine_in_postgres(pg_session, changed_only):
+    asset, profile = Asset(hostname="web-1"), Profile(name="RHEL 9 STIG", framework="DISA STIG")
+    pg_session.add_all([asset, profile])
+    pg_session.flush()
+    baseline_id = _persist(pg_session, asset, profile, _BASELINE)
+    post_id = _persist(pg_session, asset, profile, _POST)
+
+    report = compute_delta_sql(pg_session, baseline_id, post_id, changed_only=changed_only)
+    expected = delta_from_compact(load_compact(pg_session, baseline_id), load_compact(pg_session, post_id))
+    if changed_only:
+        expected.findings = [finding for finding in expected.findings if finding.changed]
+
+    assert [finding.dict() for finding in report.findings] == [finding.dict() for finding in expected.findings]
+    assert report.summary.dict() == expected.summary.dict()
+    assert list(report.summary.by_severity) == list(expected.summary.by_severity)
+    assert compute_delta_summary_sql(pg_session, baseline_id, post_id).dict() == expected.summary.dict()
+    assert (expected.summary.improved, expected.summary.regressed, expected.summary.unchanged) == (3, 2, 4)
@@ -0,0 +1,185 @@
+"""Tests for asynchronous CKL ingestion jobs."""
+
+import gzip
+import io
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.fastapi.app.api import uploads
+from backend.fastapi.app.config import get_settings
+from backend.fastapi.app.dependencies import UserContext, get_current_user
+from backend.fastapi.app.services.upload_job_service import (
+    ACCEPTED_STATE,
+    ingest_spooled_ckl,
+    purge_results,
+    read_results,
+    results_path,
+    spool_upload,
+    upload_path,
+)
+from backend.fastapi.tests.test_ckl_parser import SAMPLE_CKL
+
+JOB_ID = "0" * 32
+
+
+class _AsyncResult:
+    """Stands in for ``celery.result.AsyncResult`` with a fixed state and payload."""
+
+    states = {}
+
+    def __init__(self, job_id, app=None):
+        self.state, self.result = self.states.get(job_id, ("PENDING", None))
+        self.info = self.result
+
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "upload_spool_dir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(uploads, "AsyncResult", _AsyncResult)
+    monkeypatch.setattr(_AsyncResult, "states", {})
+    app = FastAPI()
+    app.include_router(uploads.router, prefix="/uploads")
+    app.dependency_overrides[get_current_user] = lambda: UserContext(subject="tester")
+    return TestClient(app)
+
+
+def _backend_type():
+    # Celery keeps one result backend per thread and handlers run on the threadpool.
+    return type(uploads.celery_app.backend)
+
+
+def _upload(client):
+    return client.post("/uploads/ckl/jobs?asset_id=4", files={"file": ("a.ckl", SAMPLE_CKL.encode("utf-8"))})
+
+
+def test_accepted_job_is_spooled_recorded_and_queued(client, spool_dir, monkeypatch):
+    recorded, queued = [], []
+    monkeypatch.setattr(_backend_type(), "store_result", lambda backend, *args: recorded.append(args))
+    monkeypatch.setattr(uploads.ingest_ckl_task, "apply_async", lambda **kwargs: queued.append(kwargs))
+
+    response = _upload(client)
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["state"] == "PENDING"
+    assert upload_path(str(spool_dir), job_id).read_text(encoding="utf-8") == SAMPLE_CKL
+    assert recorded == [(job_id, None, ACCEPTED_STATE)]
+    assert queued == [{"args": (job_id, 4), "task_id": job_id}]
+
+
+def test_broker_outage_removes_the_spooled_upload(client, spool_dir, monkeypatch):
+    monkeypatch.setattr(_backend_type(), "store_result", lambda backend, *args: None)
+
+    def unavailable(**kwargs):
+        raise ConnectionError("broker is down")
+
+    monkeypatch.setattr(uploads.ingest_ckl_task, "apply_async", unavailable)
+
+    response = _upload(client)
+
+    assert response.status_code == 503
+    assert list(spool_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "state, payload, expected",
+    [
+        (ACCEPTED_STATE, None, {"state": "PENDING", "parsed": 0, "count": None, "error": None}),
+        ("PROGRESS", {"parsed": 500}, {"state": "PROGRESS", "parsed": 500, "count": None, "error": None}),
+        ("SUCCESS", {"count": 3}, {"state": "SUCCESS", "parsed": 3, "count": 3, "error": None}),
+        ("FAILURE", ValueError("bad checklist"), {"state": "FAILURE", "parsed": 0, "count": None, "error": "bad checklist"}),
+    ],
+)
+def test_job_status_reports_state_and_progress(client, state, payload, expected):
+    _AsyncResult.states[JOB_ID] = (state, payload)
+
+    response = client.get(f"/uploads/jobs/{JOB_ID}")
+
+    assert response.status_code == 200
+    assert response.json() == {"job_id": JOB_ID, **expected}
+
+
+@pytest.mark.parametrize("job_id", [JOB_ID, "../../etc/passwd", "not-a-job"])
+def test_unknown_jobs_are_not_found(client, job_id):
+    assert client.get(f"/uploads/jobs/{job_id}").status_code == 404
+    assert client.get(f"/uploads/jobs/{job_id}/result").status_code == 404
+
+
+def test_result_of_unfinished_or_failed_job_is_refused(client):
+    _AsyncResult.states[JOB_ID] = ("PROGRESS", {"parsed": 1})
+    running = client.get(f"/uploads/jobs/{JOB_ID}/result")
+    _AsyncResult.states[JOB_ID] = (ACCEPTED_STATE, None)
+    queued = client.get(f"/uploads/jobs/{JOB_ID}/result")
+    _AsyncResult.states[JOB_ID] = ("FAILURE", ValueError("bad checklist"))
+    failed = client.get(f"/uploads/jobs/{JOB_ID}/result")
+
+    assert (running.status_code, running.json()["detail"]) == (409, "Ingestion job is progress")
+    assert (queued.status_code, queued.json()["detail"]) == (409, "Ingestion job is pending")
+    assert (failed.status_code, failed.json()["detail"]) == (400, "bad checklist")
+
+
+def test_result_is_read_from_the_results_file(client, spool_dir):
+    spool_upload(io.BytesIO(SAMPLE_CKL.encode("utf-8")), str(spool_dir), JOB_ID, 16)
+    count = ingest_spooled_ckl(str(spool_dir), JOB_ID, asset_id=4)
+    _AsyncResult.states[JOB_ID] = ("SUCCESS", {"count": count})
+
+    response = client.get(f"/uploads/jobs/{JOB_ID}/result")
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert response.json()["findings"][0]["rule_id"] == "V-12345"
+    results_path(str(spool_dir), JOB_ID).unlink()
+    assert client.get(f"/uploads/jobs/{JOB_ID}/result").status_code == 404
+
+
+def test_ingestion_writes_findings_to_disk_and_reports_progress(tmp_path):
+    vuln = SAMPLE_CKL[SAMPLE_CKL.index("<VULN>") : SAMPLE_CKL.index("</VULN>") + len("</VULN>")]
+    payload = SAMPLE_CKL.replace(vuln, "".join(vuln.replace("V-12345", f"V-{n}") for n in range(5)))
+    upload_path(str(tmp_path), JOB_ID).write_text(payload, encoding="utf-8")
+    progress = []
+
+    count = ingest_spooled_ckl(str(tmp_path), JOB_ID, on_progress=progress.append, progress_interval=2)
+
+    assert count == 5
+    assert progress == [2, 4]
+    assert [item["rule_id"] for item in read_results(str(tmp_path), JOB_ID)] == [f"V-{n}" for n in range(5)]
+    assert not upload_path(str(tmp_path), JOB_ID).exists()
+
+
+def test_failed_ingestion_leaves_no_files(tmp_path):
+    upload_path(str(tmp_path), JOB_ID).write_text("<CHECKLIST><VULN>", encoding="utf-8")
+
+    with pytest.raises(Exception):
+        ingest_spooled_ckl(str(tmp_path), JOB_ID)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_purge_removes_only_expired_results(tmp_path):
+    for job_id, age in (("a" * 32, 100), ("b" * 32, 10)):
+        path = results_path(str(tmp_path), job_id)
+        with gzip.open(path, "wt") as out:
+            out.write("{}\n")
+        os.utime(path, (1000 - age, 1000 - age))
+
+    assert purge_results(str(tmp_path), 50, now=1000) == 1
+    assert [path.name for path in tmp_path.iterdir()] == [f"{'b' * 32}.findings.ndjson.gz"]
+
+
+def test_purge_removes_stale_spooled_uploads_and_partial_results(tmp_path):
+    stale = [upload_path(str(tmp_path), "a" * 32), tmp_path / f"{'b' * 32}.findings.ndjson.gz.part"]
+    fresh = upload_path(str(tmp_path), "c" * 32)
+    for path, age in [(path, 100) for path in stale] + [(fresh, 10)]:
+        path.write_bytes(SAMPLE_CKL.encode("utf-8"))
+        os.utime(path, (1000 - age, 1000 - age))
+
+    assert purge_results(str(tmp_path), 50, now=1000) == 2
+    assert [path.name for path in tmp_path.iterdir()] == [fresh.name]
@@ -0,0 +1,125 @@
+"""Tests for the upload endpoints."""
+
+import asyncio
+import json
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+
+from backend.fastapi.app.api import uploads
+from backend.fastapi.app.config import get_settings
+from backend.fastapi.app.dependencies import UserContext, get_current_user
+from backend.fastapi.app.services.cache_service import ParseCache
+
+BOUNDARY = "aegis-test-boundary"
+CHUNK = 64 * 1024
+
+
+def _multipart_ckl(vulns: int, details_size: int):
+    """Yield a multipart CKL upload piece by piece, never materializing the document."""
+
+    details = b"x" * CHUNK
+    yield (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="big.ckl"\r\n'
+        "Content-Type: application/xml\r\n\r\n"
+        "<CHECKLIST><STIGS><iSTIG>"
+    ).encode("utf-8")
+    for index in range(vulns):
+        yield (
+            "<VULN>"
+            f"<STIG_DATA><VULN_ATTRIBUTE>Rule_ID</VULN_ATTRIBUTE><ATTRIBUTE_DATA>V-{index:05d}</ATTRIBUTE_DATA></STIG_DATA>"
+            "<STIG_DATA><VULN_ATTRIBUTE>Severity</VULN_ATTRIBUTE><ATTRIBUTE_DATA>medium</ATTRIBUTE_DATA></STIG_DATA>"
+            "<STATUS>Open</STATUS><FINDING_DETAILS>"
+        ).encode("utf-8")
+        for _ in range(details_size // CHUNK):
+            yield details
+        yield b"</FINDING_DETAILS></VULN>"
+    yield f"</iSTIG></STIGS></CHECKLIST>\r\n--{BOUNDARY}--\r\n".encode("utf-8")
+
+
+def _post(app, path, chunks):
+    """Drive ``app`` over ASGI with a request body streamed from ``chunks``.
+
+    The test client reads the whole request body into memory up front, which
+    would hide what the endpoint itself holds on to.
+    """
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": b"asset_id=3",
+        "root_path": "",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode("ascii"))],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    pending = iter(chunks)
+    finished = False
+    response = {"body": b""}
+
+    async def receive():
+        nonlocal finished
+        if finished:
+            return {"type": "http.disconnect"}
+        chunk = next(pending, None)
+        if chunk is None:
+            finished = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    asyncio.run(app(scope, receive, send))
+    return response["status"], json.loads(response["body"])
+
+
+@pytest.fixture
+def app(monkeypatch):
+    cache = ParseCache(16 * 1024 * 1024)
+    monkeypatch.setattr(uploads, "get_parse_cache", lambda: cache)
+    application = FastAPI()
+    application.include_router(uploads.router, prefix="/uploads")
+    application.dependency_overrides[get_current_user] = lambda: UserContext(subject="tester")
+    return application
+
+
+def test_upload_ckl_does_not_hold_the_checklist_in_memory(app, monkeypatch):
+    monkeypatch.setattr(get_settings(), "upload_chunk_size", CHUNK)
+    vulns, details_size = 64, 2 * CHUNK
+
+    tracemalloc.start()
+    try:
+        status, body = _post(app, "/uploads/ckl", _multipart_ckl(vulns, details_size))
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert status == 200
+    assert body["count"] == vulns
+    assert body["findings"][0] == {
+        "rule_id": "V-00000",
+        "severity": "CAT_II",
+        "status": "open",
+        "comments": None,
+        "asset_id": 3,
+    }
+    assert peak < (vulns * details_size) // 4
+
+
+def test_upload_ckl_serves_repeat_uploads_from_the_parse_cache(app):
+    first = _post(app, "/uploads/ckl", _multipart_ckl(3, CHUNK))
+    second = _post(app, "/uploads/ckl", _multipart_ckl(3, CHUNK))
+
+    assert first == second
+    assert uploads.get_parse_cache().stats()["hits"] == 1
@@ -0,0 +1,81 @@
+"""Tests for the XCCDF/ARF parser."""
+
+import io
+
+import pytest
+
+from backend.fastapi.app.enums import FindingSeverity, FindingStatus
+from backend.fastapi.app.parsers.xccdf_parser import XCCDFParserError, iter_xccdf, parse_xccdf
+
+
+def _test_result(target: str, results: dict) -> str:
+    rule_results = "".join(
+        f'<rule-result idref="xccdf_mil.disa.stig_rule_{rule}" severity="{severity}">'
+        f"<result>{result}</result><message>{rule} checked</message></rule-result>"
+        for rule, (severity, result) in results.items()
+    )
+    return (
+        f'<TestResult id="xccdf_mil.disa.stig_testresult_{target}">'
+        f"<target>{target}</target><target-address>10.0.0.{len(target)}</target-address>"
+        f"{rule_results}</TestResult>"
+    )
+
+
+def _arf(*test_results: str) -> str:
+    reports = "".join(
+        f'<arf:report id="xccdf{index}"><arf:content>{result}</arf:content></arf:report>'
+        for index, result in enumerate(test_results)
+    )
+    oval = "".join(f'<definition definition_id="oval:{index}" result="true"/>' for index in range(50))
+    return (
+        '<arf:asset-report-collection xmlns:arf="http://scap.nist.gov/schema/asset-reporting-format/1.1">'
+        '<arf:reports>'
+        f'<arf:report id="oval0"><arf:content><oval_results><results><system><definitions>{oval}'
+        "</definitions></system></results></oval_results></arf:content></arf:report>"
+        f"{reports}</arf:reports></arf:asset-report-collection>"
+    ).replace("<TestResult", '<TestResult xmlns="http://checklists.nist.gov/xccdf/1.2"')
+
+
+SAMPLE_ARF = _arf(
+    _test_result(
+        "web01",
+        {
+            "SV-1r1_rule": ("high", "fail"),
+            "SV-2r1_rule": ("medium", "pass"),
+            "SV-3r1_rule": ("low", "notapplicable"),
+            "SV-4r1_rule": ("medium", "notselected"),
+            "SV-5r1_rule": ("unknown", "error"),
+        },
+    ),
+    _test_result("db01", {"SV-1r1_rule": ("high", "pass")}),
+)
+
+
+def test_parse_xccdf_maps_first_test_result():
+    findings = parse_xccdf(SAMPLE_ARF, asset_id=3)
+
+    assert [finding.rule_id for finding in findings] == ["SV-1r1_rule", "SV-2r1_rule", "SV-3r1_rule", "SV-5r1_rule"]
+    assert findings[0].severity == FindingSeverity.CAT_I
+    assert findings[0].status == FindingStatus.OPEN
+    assert findings[0].comments == "SV-1r1_rule checked"
+    assert findings[0].host == "web01"
+    assert findings[0].asset_id == 3
+    assert findings[1].status == FindingStatus.NOT_A_FINDING
+    assert findings[2].status == FindingStatus.NOT_APPLICABLE
+    assert findings[3].severity == FindingSeverity.CAT_III
+    assert findings[3].status == FindingStatus.REVIEW_REQUIRED
+
+
+def test_iter_xccdf_selects_test_result_for_target():
+    stream = io.BytesIO(SAMPLE_ARF.encode("utf-8"))
+
+    findings = list(iter_xccdf(stream, target="10.0.0.4", chunk_size=64))
+
+    assert len(findings) == 1
+    assert findings[0].host == "db01"
+    assert findings[0].status == FindingStatus.NOT_A_FINDING
+
+
+def test_parse_xccdf_rejects_unknown_severity():
+    with pytest.raises(XCCDFParserError, match="Unsupported severity"):
+        parse_xccdf(SAMPLE_ARF.replace('severity="high"', 'severity="critical"'))